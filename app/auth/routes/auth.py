@@ -3,34 +3,51 @@ import traceback
 from typing import Annotated, Optional
 
 import jwt
-from fastapi import HTTPException, status
+import redis
+from fastapi import HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.params import Depends
 from fastapi.routing import APIRouter
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.auth.models.dtos import ChangePasswordDTO, UserWithModulesDTO
 from app.auth.models.oauth import OauthTokenRequest
-from app.auth.models.token import Token
+from app.auth.models.token import LogoutRequest, RefreshTokenRequest, Token
+from app.auth.services.auth_service import AuthService
 from app.core.dependencies import (
     AuthServiceDep,
     CurrentUserDep,
     GetModulesWithUseCaseDep,
     GoogleAuthServiceDep,
     MicrosoftAuthServiceDep,
+    ValidTokenDep,
+    decode_access_token,
 )
 from app.core.exceptions import (
     get_bad_request_exception,
     get_credentials_exception,
     get_internal_server_error_exception,
+    get_service_unavailable_exception,
 )
 from app.core.models.user import DbUser
-from app.core.security.jwt_service import create_access_token
+from app.core.security.encryption_service import PasswordHasherBusyError
+from app.core.security.jwt_service import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    create_access_token,
+)
+from app.core.security.refresh_tokens import (
+    RefreshTokenReuseError,
+    refresh_token_store,
+)
+from app.core.security.revocation import revocation_store
+from app.core.security.security import oauth2_scheme
+from app.core.security.token_cache import token_cache, token_digest
 
 auth_router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
 @auth_router.post("/login")
-def login(
+async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     auth_service: AuthServiceDep,
 ) -> Token:
@@ -41,8 +58,15 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = auth_service.authenticate_user(form_data.username, form_data.password)
-    return validate_and_create_token(user)
+    try:
+        user = await auth_service.authenticate_user(
+            form_data.username, form_data.password
+        )
+    except PasswordHasherBusyError:
+        raise get_service_unavailable_exception(
+            "Hay demasiados inicios de sesión en curso, intente nuevamente"
+        )
+    return await run_in_threadpool(validate_and_create_token, user, auth_service)
 
 
 @auth_router.post("/login/google")
@@ -61,7 +85,7 @@ def oauth_google_login(
 
         user = auth_service.authenticate_google_user(google_user_info)
 
-        return validate_and_create_token(user)
+        return validate_and_create_token(user, auth_service)
 
     except HTTPException as e:
         raise e
@@ -91,7 +115,7 @@ def oauth_microsoft_login(
 
         user = auth_service.authenticate_microsoft_user(microsoft_user_info)
 
-        return validate_and_create_token(user)
+        return validate_and_create_token(user, auth_service)
 
     except HTTPException as e:
         raise e
@@ -106,15 +130,16 @@ def oauth_microsoft_login(
 
 
 @auth_router.get("/me")
-def me(
+async def me(
     current_user: CurrentUserDep,
+    payload: ValidTokenDep,
     get_user_with_modules_use_case: GetModulesWithUseCaseDep,
 ) -> UserWithModulesDTO:
     if current_user.id is None:
         raise get_credentials_exception()
 
     try:
-        return get_user_with_modules_use_case.invoke(current_user)
+        return await get_user_with_modules_use_case.invoke(current_user, payload)
 
     except Exception as e:
         logging.error(str(e))
@@ -123,22 +148,88 @@ def me(
         )
 
 
+@auth_router.post("/refresh")
+def refresh_token(data: RefreshTokenRequest, auth_service: AuthServiceDep) -> Token:
+    try:
+        grant = refresh_token_store.consume(data.refresh_token)
+    except RefreshTokenReuseError as e:
+        logging.warning(f"Refresh token reutilizado, se revoca la familia {e}")
+        raise get_credentials_exception("Refresh token invalido")
+    except redis.RedisError as e:
+        logging.error(f"Error al rotar el refresh token: {e}")
+        raise get_internal_server_error_exception(
+            "No fue posible renovar la sesión, inicie sesión nuevamente"
+        )
+
+    if grant is None:
+        raise get_credentials_exception("Refresh token invalido o expirado")
+
+    user = auth_service.authenticate_refresh_token_subject(grant.subject)
+    return validate_and_create_token(user, auth_service, refresh_family=grant.family)
+
+
+@auth_router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    data: LogoutRequest | None = None,
+):
+    payload = decode_access_token(token)
+    try:
+        if payload.get("jti") is not None:
+            revocation_store.revoke(payload["jti"], expires_at=payload["exp"])
+        if data is not None and data.refresh_token:
+            refresh_token_store.revoke(data.refresh_token)
+    except redis.RedisError as e:
+        logging.error(f"Error al revocar la sesión: {e}")
+        raise get_internal_server_error_exception(
+            "No fue posible cerrar la sesión, intente nuevamente"
+        )
+
+    token_cache.revoke(token_digest(token), payload)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
 @auth_router.post("/change-password")
-def change_password(data: ChangePasswordDTO, auth_service: AuthServiceDep) -> Token:
+async def change_password(
+    data: ChangePasswordDTO, auth_service: AuthServiceDep
+) -> Token:
     if not data or not data.token or not data.password:
         raise get_bad_request_exception("Todos los campos son obligatorios")
 
-    user = auth_service.change_password(data.token, data.password)
-    return validate_and_create_token(user)
+    try:
+        user = await auth_service.change_password(data.token, data.password)
+    except PasswordHasherBusyError:
+        raise get_service_unavailable_exception(
+            "No fue posible cambiar la contraseña en este momento, intente nuevamente"
+        )
+    return await run_in_threadpool(validate_and_create_token, user, auth_service)
 
 
-def validate_and_create_token(user: Optional[DbUser]) -> Token:
+def validate_and_create_token(
+    user: Optional[DbUser],
+    auth_service: AuthService,
+    refresh_family: str | None = None,
+) -> Token:
     if user is None:
         raise get_credentials_exception("Credenciales de autenticacion invalidas")
 
     if not user.active:
         raise get_credentials_exception("El usuario se encuentra inactivo")
 
-    token = create_access_token(data={"sub": user.email})
+    claims = auth_service.get_permission_claims(user)
+    token = create_access_token(data={"sub": user.email, **claims})
 
-    return Token(access_token=token, token_type="bearer")
+    refresh_token = None
+    try:
+        refresh_token = refresh_token_store.issue(user.email, family=refresh_family)
+    except redis.RedisError as e:
+        # Sin Redis se entrega solo el access token; el usuario volverá a
+        # iniciar sesión cuando expire.
+        logging.error(f"No se pudo emitir el refresh token: {e}")
+
+    return Token(
+        access_token=token,
+        token_type="bearer",
+        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        refresh_token=refresh_token,
+    )
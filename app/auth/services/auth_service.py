@@ -1,17 +1,36 @@
 import traceback
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
 
 from app.auth.models.oauth import GoogleUserInfo, MicrosoftUserInfo
+from app.core.cache.permission_cache import PermissionCache
 from app.core.models.user import DbUser
+from app.core.repositories.role_repository import RoleRepository
 from app.core.repositories.user_repository import UserRepository
-from app.core.security.encryption_service import encrypt, verify
+from app.core.security.encryption_service import (
+    PasswordHasherBusyError,
+    encrypt_async,
+    needs_rehash,
+    verify_async,
+)
 
 
 class AuthService:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        role_repository: RoleRepository | None = None,
+        permission_cache: PermissionCache | None = None,
+    ):
         self.user_repository = user_repository
+        self.role_repository = role_repository
+        self.permission_cache = permission_cache
 
-    def authenticate_user(self, username: str, password: str) -> DbUser | None:
-        user = self.user_repository.get_user_by_email(username)
+    async def authenticate_user(self, username: str, password: str) -> DbUser | None:
+        # Las consultas usan la sesión síncrona en el threadpool; bcrypt se
+        # espera desde el event loop sin ocupar un hilo
+        user = await run_in_threadpool(self.user_repository.get_user_by_email, username)
         if not user or not user.active:
             return None
 
@@ -24,9 +43,20 @@ class AuthService:
         if user.must_change_password:
             return None
 
-        if verify(password, user.password):
-            return user
-        return None
+        if not await verify_async(password, user.password):
+            return None
+
+        if needs_rehash(user.password) and user.id is not None:
+            try:
+                hashed_password = await encrypt_async(password)
+            except PasswordHasherBusyError:
+                # Se reintentará en el próximo login
+                return user
+            await run_in_threadpool(
+                self.user_repository.rehash_password, user.id, hashed_password
+            )
+
+        return user
 
     def authenticate_google_user(
         self, google_user_info: GoogleUserInfo
@@ -52,6 +82,32 @@ class AuthService:
             print(traceback.format_exc())
             return None
 
+    def authenticate_refresh_token_subject(self, email: str) -> DbUser | None:
+        """
+        Revalida al dueño de un refresh token: debe seguir existiendo y activo.
+        """
+        return self._authenticate_with_email(email)
+
+    def get_permission_claims(self, user: DbUser) -> dict[str, Any]:
+        """
+        Claims `roles` y `pv` (versión de permisos) para el access token. Si no
+        hay caché de permisos disponible el token se emite sin ellos.
+        """
+        if self.role_repository is None or self.permission_cache is None:
+            return {}
+        if user.id is None:
+            return {}
+
+        # La versión se lee antes que los roles: si cambian en medio, el token
+        # queda con una versión vieja y se ignoran sus claims.
+        version = self.permission_cache.version()
+        if version is None:
+            return {}
+
+        roles = self.role_repository.get_roles_by_user_id(user.id)
+        role_ids = sorted({role.id for role in roles if role.id is not None})
+        return {"roles": role_ids, "pv": version}
+
     def _authenticate_with_email(self, email: str) -> DbUser | None:
         if not email:
             return None
@@ -62,23 +118,36 @@ class AuthService:
 
         return user
 
-    def change_password(
+    async def change_password(
         self, change_password_uuid: str, password: str
     ) -> DbUser | None:
         try:
-            user = self.user_repository.get_user_by_change_password_uuid(
-                change_password_uuid
+            user = await run_in_threadpool(
+                self.user_repository.get_user_by_change_password_uuid,
+                change_password_uuid,
             )
 
             if not user or not user.id:
                 return None
 
-            hashed_password = encrypt(password)
+            hashed_password = await encrypt_async(password)
+
+            await run_in_threadpool(
+                self.user_repository.update_password, user.id, hashed_password
+            )
 
-            self.user_repository.update_password(user.id, hashed_password)
+            # Se acaba de calcular el hash; verificarlo de nuevo con bcrypt
+            # solo duplicaría el costo.
+            user = await run_in_threadpool(self.user_repository.get_user_by_id, user.id)
+            if not user or not user.active or user.external_login:
+                return None
+            if user.must_change_password:
+                return None
 
-            return self.authenticate_user(user.email, password)
+            return user
 
+        except PasswordHasherBusyError:
+            raise
         except Exception:
             print(traceback.format_exc())
             return None
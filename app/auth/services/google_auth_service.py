@@ -1,27 +1,37 @@
 import traceback
 
-from google.auth.transport import requests
-from google.oauth2 import id_token
+import jwt
 
 from app.auth.models.oauth import GoogleUserInfo
+from app.auth.services.jwks_cache import JwksCache
 from app.core.exceptions import get_credentials_exception
 
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+
 
 class GoogleAuthService:
-    def __init__(self, client_id: str):
+    """
+    Valida ID tokens de Google con las llaves de `jwks`, que se descargan y
+    renuevan según su `Cache-Control`; la validación en cada login es solo
+    criptografía local.
+    """
+
+    def __init__(self, client_id: str, jwks: JwksCache):
         self.client_id = client_id
+        self.jwks = jwks
 
     def _validate_token(self, token: str) -> dict | None:
         try:
-            id_info = id_token.verify_oauth2_token(
-                token, requests.Request(), self.client_id
+            header = jwt.get_unverified_header(token)
+            signing_key = self.jwks.get_signing_key(header.get("kid"))
+            return jwt.decode(
+                token,
+                signing_key.key,
+                algorithms=["RS256"],
+                audience=self.client_id,
+                issuer=GOOGLE_ISSUERS,
             )
-
-            if id_info["aud"] != self.client_id:
-                raise get_credentials_exception("Token de google inválido")
-
-            return id_info
-        except ValueError:
+        except jwt.PyJWTError:
             print(traceback.format_exc())
             raise get_credentials_exception("Token de google inválido")
 
@@ -0,0 +1,175 @@
+import logging
+import re
+import threading
+import time
+
+import httpx
+from jwt import PyJWK, PyJWKSet
+from jwt.exceptions import PyJWKClientError
+
+from app.core.metrics.registry import registry
+
+JWKS_REFRESHES = registry.counter(
+    "jwks_refreshes_total",
+    "Descargas de llaves de firma por proveedor, motivo y resultado",
+    labels=("provider", "reason", "result"),
+)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+def parse_max_age(cache_control: str | None) -> int | None:
+    if not cache_control:
+        return None
+    match = _MAX_AGE.search(cache_control)
+    return int(match.group(1)) if match else None
+
+
+class JwksCache:
+    """
+    Llaves públicas de un proveedor OAuth (JWKS) en memoria por el tiempo que
+    indica su `Cache-Control: max-age`.
+
+    Pasado `refresh_ratio` de ese tiempo la siguiente petición dispara una
+    descarga en segundo plano y sigue usando las llaves actuales; solo se
+    descarga en línea si ya expiraron o si llega un `kid` desconocido (como
+    mucho una vez cada `min_refresh_interval`). Si la descarga falla se siguen
+    usando las llaves que ya se tenían.
+
+    `start` las descarga al iniciar la app en un hilo aparte y, con
+    `refresh_interval`, las renueva periódicamente para que el login nunca
+    tenga que esperar una descarga.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        provider: str,
+        client: httpx.Client | None = None,
+        default_max_age: int = 3600,
+        refresh_ratio: float = 0.8,
+        min_refresh_interval: float = 30,
+        refresh_interval: float | None = None,
+    ):
+        self.url = url
+        self.provider = provider
+        self.client = client or httpx.Client(timeout=5)
+        self.default_max_age = default_max_age
+        self.refresh_ratio = refresh_ratio
+        self.min_refresh_interval = min_refresh_interval
+        self.refresh_interval = refresh_interval
+        self._keys: dict[str, PyJWK] = {}
+        self._attempted_at = float("-inf")
+        self._refresh_at = 0.0
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._background_lock = threading.Lock()
+        self._refreshing = False
+        self._refresher: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def get_signing_key(self, kid: str | None) -> PyJWK:
+        now = time.monotonic()
+        if now >= self._expires_at:
+            self.refresh("expired")
+        elif now >= self._refresh_at:
+            self._refresh_in_background()
+
+        key = self._keys.get(kid or "")
+        if key is None and time.monotonic() - self._attempted_at >= (
+            self.min_refresh_interval
+        ):
+            # Rotación de llaves antes de que expire la caché
+            self.refresh("unknown_kid")
+            key = self._keys.get(kid or "")
+
+        if key is None:
+            raise PyJWKClientError(f"No se encontró la llave de firma {kid}")
+        return key
+
+    def start(self) -> None:
+        with self._background_lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(
+                target=self._run_refresher,
+                name=f"jwks-refresher-{self.provider}",
+                daemon=True,
+            )
+            self._refresher.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stopped.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout)
+
+    def _run_refresher(self) -> None:
+        reason = "prefetch"
+        while True:
+            try:
+                self.refresh(reason)
+            except Exception as e:
+                logging.warning(
+                    f"No se pudieron descargar las llaves de {self.provider}: {e}"
+                )
+            if self.refresh_interval is None:
+                return
+            if self._stopped.wait(self.refresh_interval):
+                return
+            reason = "interval"
+
+    def refresh(self, reason: str = "manual") -> None:
+        with self._lock:
+            # Otro hilo pudo haberlas descargado mientras se esperaba el lock
+            if reason == "expired" and time.monotonic() < self._expires_at:
+                return
+            self._fetch(reason)
+
+    def _fetch(self, reason: str) -> None:
+        self._attempted_at = time.monotonic()
+        try:
+            response = self.client.get(self.url)
+            response.raise_for_status()
+            key_set = PyJWKSet.from_dict(response.json())
+        except Exception as e:
+            JWKS_REFRESHES.inc(self.provider, reason, "error")
+            if not self._keys:
+                raise
+            logging.warning(
+                f"No se pudieron renovar las llaves de {self.provider}, "
+                f"se usan las anteriores: {e}"
+            )
+            retry_at = time.monotonic() + self.min_refresh_interval
+            self._refresh_at = retry_at
+            self._expires_at = max(self._expires_at, retry_at)
+            return
+
+        max_age = parse_max_age(response.headers.get("cache-control"))
+        if max_age is None:
+            max_age = self.default_max_age
+
+        now = time.monotonic()
+        self._keys = {key.key_id: key for key in key_set.keys if key.key_id}
+        self._refresh_at = now + max_age * self.refresh_ratio
+        self._expires_at = now + max_age
+        JWKS_REFRESHES.inc(self.provider, reason, "ok")
+
+    def _refresh_in_background(self) -> None:
+        with self._background_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run() -> None:
+            try:
+                self.refresh("background")
+            except Exception as e:
+                logging.warning(
+                    f"Falló la renovación de llaves de {self.provider}: {e}"
+                )
+            finally:
+                self._refreshing = False
+
+        threading.Thread(
+            target=run, name=f"jwks-refresh-{self.provider}", daemon=True
+        ).start()
@@ -1,20 +1,22 @@
-from jwt import PyJWKClient, decode
+from jwt import decode, get_unverified_header
 
 from app.auth.models.oauth import MicrosoftUserInfo
+from app.auth.services.jwks_cache import JwksCache
+
+
+def get_microsoft_jwks_url(tenant_id: str) -> str:
+    return f"https://login.microsoftonline.com/{tenant_id}/discovery/v2.0/keys"
 
 
 class MicrosoftAuthService:
-    def __init__(self, client_id: str, tenant_id: str):
+    def __init__(self, client_id: str, tenant_id: str, jwks: JwksCache):
         self.client_id = client_id
         self.tenant_id = tenant_id
-        self.jwks_url = (
-            f"https://login.microsoftonline.com/{tenant_id}/discovery/v2.0/keys"
-        )
         self.issuer = f"https://login.microsoftonline.com/{tenant_id}/v2.0"
-        self.jwk_client = PyJWKClient(self.jwks_url)
+        self.jwks = jwks
 
     def get_user_info(self, token: str) -> MicrosoftUserInfo:
-        signing_key = self.jwk_client.get_signing_key_from_jwt(token)
+        signing_key = self.jwks.get_signing_key(get_unverified_header(token).get("kid"))
         # Decodifica y valida
         payload = decode(
             token,
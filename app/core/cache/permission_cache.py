@@ -0,0 +1,150 @@
+import json
+import logging
+from collections.abc import Callable, Iterable
+
+import redis
+import redis.asyncio
+from pydantic import BaseModel
+
+from app.core.cache.ttl_cache import TTLCache
+from app.core.database.redis import get_async_redis_client, get_redis_client
+from app.core.metrics.registry import registry
+from app.core.models.module import ModuleBase
+from app.core.models.role import RoleBase
+from app.core.settings import settings
+
+PERMISSIONS_VERSION_KEY = "permissions:version"
+PERMISSIONS_CHANNEL = "permissions:changed"
+USER_ROLES_KEY = "permissions:{version}:user:{user_id}"
+SNAPSHOT_KEY = "permissions:{version}:roles:{role_ids}"
+
+PERMISSION_CACHE_LOOKUPS = registry.counter(
+    "permission_cache_lookups_total",
+    "Búsquedas de snapshots de permisos por resultado (local, redis, miss)",
+    labels=("result",),
+)
+
+
+class PermissionSnapshot(BaseModel):
+    """
+    Roles y módulos precalculados para un conjunto de roles.
+    """
+
+    roles: list[RoleBase]
+    modules: list[ModuleBase]
+
+
+def role_set_key(role_ids: Iterable[int]) -> str:
+    return ",".join(str(role_id) for role_id in sorted(set(role_ids)))
+
+
+class PermissionCache:
+    """
+    Snapshots de permisos por conjunto de roles, versionados con un contador
+    global en Redis.
+
+    Todas las claves incluyen la versión vigente, así que invalidar es solo
+    incrementar el contador (`bump`) cuando cambian las asignaciones de roles o
+    módulos; las claves viejas expiran solas. Como un snapshot de una versión
+    nunca cambia, cada worker lo guarda en su LRU sin necesidad de invalidarlo.
+    Si Redis no está disponible, `get_version` devuelve None y se consulta la
+    base de datos.
+    """
+
+    def __init__(
+        self,
+        ttl: int,
+        max_entries: int,
+        redis_factory: Callable[[], redis.Redis] = get_redis_client,
+        async_redis_factory: Callable[[], redis.asyncio.Redis] = get_async_redis_client,
+    ):
+        self.ttl = ttl
+        self.local = TTLCache[str, PermissionSnapshot](max_entries=max_entries, ttl=ttl)
+        self.redis_factory = redis_factory
+        self.async_redis_factory = async_redis_factory
+
+    def version(self) -> int | None:
+        try:
+            return int(self.redis_factory().get(PERMISSIONS_VERSION_KEY) or 0)
+        except redis.RedisError as e:
+            logging.warning(f"No se pudo leer la versión de permisos: {e}")
+            return None
+
+    async def get_version(self) -> int | None:
+        try:
+            value = await self.async_redis_factory().get(PERMISSIONS_VERSION_KEY)
+        except redis.RedisError as e:
+            logging.warning(f"No se pudo leer la versión de permisos: {e}")
+            return None
+        return int(value or 0)
+
+    def bump(self) -> None:
+        try:
+            client = self.redis_factory()
+            version = client.incr(PERMISSIONS_VERSION_KEY)
+            client.publish(PERMISSIONS_CHANNEL, version)
+        except redis.RedisError as e:
+            # Sin el incremento los snapshots viejos viven hasta su TTL
+            logging.error(f"No se pudo invalidar la caché de permisos: {e}")
+
+    async def get_user_role_ids(self, version: int, user_id: int) -> list[int] | None:
+        key = USER_ROLES_KEY.format(version=version, user_id=user_id)
+        try:
+            cached = await self.async_redis_factory().get(key)
+        except redis.RedisError as e:
+            logging.warning(f"No se pudo leer la caché de permisos: {e}")
+            return None
+        return None if cached is None else json.loads(cached)
+
+    async def set_user_role_ids(
+        self, version: int, user_id: int, role_ids: list[int]
+    ) -> None:
+        key = USER_ROLES_KEY.format(version=version, user_id=user_id)
+        try:
+            await self.async_redis_factory().set(
+                key, json.dumps(sorted(set(role_ids))), ex=self.ttl
+            )
+        except redis.RedisError as e:
+            logging.warning(f"No se pudo escribir la caché de permisos: {e}")
+
+    async def get_snapshot(
+        self, version: int, role_ids: list[int]
+    ) -> PermissionSnapshot | None:
+        key = SNAPSHOT_KEY.format(version=version, role_ids=role_set_key(role_ids))
+        snapshot = self.local.get(key)
+        if snapshot is not None:
+            PERMISSION_CACHE_LOOKUPS.inc("local")
+            return snapshot
+
+        try:
+            cached = await self.async_redis_factory().get(key)
+        except redis.RedisError as e:
+            logging.warning(f"No se pudo leer la caché de permisos: {e}")
+            cached = None
+
+        if cached is None:
+            PERMISSION_CACHE_LOOKUPS.inc("miss")
+            return None
+
+        PERMISSION_CACHE_LOOKUPS.inc("redis")
+        snapshot = PermissionSnapshot.model_validate_json(cached)
+        self.local.set(key, snapshot)
+        return snapshot
+
+    async def set_snapshot(
+        self, version: int, role_ids: list[int], snapshot: PermissionSnapshot
+    ) -> None:
+        key = SNAPSHOT_KEY.format(version=version, role_ids=role_set_key(role_ids))
+        self.local.set(key, snapshot)
+        try:
+            await self.async_redis_factory().set(
+                key, snapshot.model_dump_json(), ex=self.ttl
+            )
+        except redis.RedisError as e:
+            logging.warning(f"No se pudo escribir la caché de permisos: {e}")
+
+
+permission_cache = PermissionCache(
+    ttl=settings.permission_cache_ttl,
+    max_entries=settings.permission_cache_max_entries,
+)
@@ -0,0 +1,203 @@
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Callable
+
+import redis
+import redis.asyncio
+
+from app.core.cache.ttl_cache import TTLCache
+from app.core.database.redis import get_async_redis_client, get_redis_client
+from app.core.metrics.registry import registry
+from app.core.models.user import DbUser, UserBase
+from app.core.settings import settings
+
+USER_CACHE_KEY = "user-cache:{email}"
+USER_CACHE_GENERATION_KEY = "user-cache:{email}:generation"
+USER_CACHE_CHANNEL = "user-cache:invalidate"
+
+USER_CACHE_LOOKUPS = registry.counter(
+    "user_cache_lookups_total",
+    "Búsquedas en la caché de usuarios por resultado (local, redis, miss)",
+    labels=("result",),
+)
+
+
+class UserCache:
+    """
+    Caché de usuarios por email en dos niveles: un LRU local con TTL corto y
+    Redis. Guarda `UserBase`, nunca la contraseña.
+
+    Las invalidaciones borran la entrada de Redis, incrementan su generación y
+    se publican en `USER_CACHE_CHANNEL` para que cada worker la saque de su LRU.
+    `load` solo guarda el usuario leído si la generación no cambió mientras se
+    consultaba la base de datos. Si Redis no
+    está disponible, la caché se degrada a consultar la base de datos y el TTL
+    local acota cuánto puede durar un dato desactualizado.
+    """
+
+    def __init__(
+        self,
+        local_ttl: float,
+        redis_ttl: int,
+        max_entries: int,
+        redis_factory: Callable[[], redis.Redis] = get_redis_client,
+        async_redis_factory: Callable[[], redis.asyncio.Redis] = get_async_redis_client,
+    ):
+        self.redis_ttl = redis_ttl
+        self.local = TTLCache[str, UserBase](max_entries=max_entries, ttl=local_ttl)
+        self.redis_factory = redis_factory
+        self.async_redis_factory = async_redis_factory
+        self._listener: threading.Thread | None = None
+        self._listener_lock = threading.Lock()
+
+    async def get(self, email: str) -> UserBase | None:
+        self.start_listener()
+        user = self.local.get(email)
+        if user is not None:
+            USER_CACHE_LOOKUPS.inc("local")
+            return user
+
+        try:
+            cached = await self.async_redis_factory().get(
+                USER_CACHE_KEY.format(email=email)
+            )
+        except redis.RedisError as e:
+            logging.warning(f"No se pudo leer la caché de usuarios: {e}")
+            cached = None
+
+        if cached is None:
+            USER_CACHE_LOOKUPS.inc("miss")
+            return None
+
+        USER_CACHE_LOOKUPS.inc("redis")
+        user = UserBase.model_validate_json(cached)
+        self.local.set(email, user)
+        return user
+
+    async def load(
+        self, email: str, loader: Callable[[str], Awaitable[DbUser | None]]
+    ) -> UserBase | None:
+        """
+        Lee el usuario con `loader` y lo guarda en caché, salvo que una
+        invalidación concurrente haya cambiado la generación de la entrada: el
+        usuario leído podría ser anterior al cambio.
+        """
+        generation_key = USER_CACHE_GENERATION_KEY.format(email=email)
+        try:
+            generation = await self.async_redis_factory().get(generation_key)
+            redis_available = True
+        except redis.RedisError as e:
+            # Sin Redis solo queda el LRU local, acotado por su TTL
+            logging.warning(f"No se pudo leer la caché de usuarios: {e}")
+            generation, redis_available = None, False
+
+        db_user = await loader(email)
+        if db_user is None:
+            return None
+
+        user = UserBase.map_from_db(db_user)
+        if redis_available and not await self._set_if_generation(
+            user, generation_key, generation
+        ):
+            return user
+
+        self.local.set(email, user)
+        return user
+
+    async def _set_if_generation(
+        self, user: UserBase, generation_key: str, generation: str | None
+    ) -> bool:
+        try:
+            async with self.async_redis_factory().pipeline() as pipeline:
+                # WATCH: si `invalidate` incrementa la generación antes del
+                # EXEC, la transacción no se aplica
+                await pipeline.watch(generation_key)
+                if await pipeline.get(generation_key) != generation:
+                    return False
+                pipeline.multi()
+                pipeline.set(
+                    USER_CACHE_KEY.format(email=user.email),
+                    user.model_dump_json(),
+                    ex=self.redis_ttl,
+                )
+                await pipeline.execute()
+        except redis.WatchError:
+            return False
+        except redis.RedisError as e:
+            logging.warning(f"No se pudo escribir la caché de usuarios: {e}")
+        return True
+
+    async def set(self, db_user: DbUser) -> UserBase:
+        user = UserBase.map_from_db(db_user)
+        self.local.set(user.email, user)
+        try:
+            await self.async_redis_factory().set(
+                USER_CACHE_KEY.format(email=user.email),
+                user.model_dump_json(),
+                ex=self.redis_ttl,
+            )
+        except redis.RedisError as e:
+            logging.warning(f"No se pudo escribir la caché de usuarios: {e}")
+        return user
+
+    def invalidate(self, *emails: str | None) -> None:
+        emails_to_invalidate = {email for email in emails if email}
+        for email in emails_to_invalidate:
+            self.local.delete(email)
+
+        if not emails_to_invalidate:
+            return
+
+        try:
+            client = self.redis_factory()
+            pipeline = client.pipeline(transaction=False)
+            for email in emails_to_invalidate:
+                generation_key = USER_CACHE_GENERATION_KEY.format(email=email)
+                pipeline.incr(generation_key)
+                pipeline.expire(generation_key, self.redis_ttl)
+                pipeline.delete(USER_CACHE_KEY.format(email=email))
+                pipeline.publish(USER_CACHE_CHANNEL, email)
+            pipeline.execute()
+        except redis.RedisError as e:
+            logging.warning(f"No se pudo invalidar la caché de usuarios: {e}")
+
+    def start_listener(self) -> None:
+        if self._listener is not None:
+            return
+
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="user-cache-invalidation", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self) -> None:
+        failing = False
+        while True:
+            try:
+                pubsub = self.redis_factory().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(USER_CACHE_CHANNEL)
+                if failing:
+                    # Pudo haber invalidaciones mientras no se escuchaba el canal
+                    self.local.clear()
+                    failing = False
+
+                for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.local.delete(message["data"])
+            except redis.RedisError as e:
+                if not failing:
+                    logging.warning(
+                        f"Se perdió el canal de invalidación de usuarios: {e}"
+                    )
+                failing = True
+                time.sleep(1)
+
+
+user_cache = UserCache(
+    local_ttl=settings.user_cache_local_ttl,
+    redis_ttl=settings.user_cache_redis_ttl,
+    max_entries=settings.user_cache_max_entries,
+)
@@ -0,0 +1,339 @@
+from functools import cached_property
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.auth.services.auth_service import AuthService
+from app.auth.services.google_auth_service import GoogleAuthService
+from app.auth.services.jwks_cache import JwksCache
+from app.auth.services.microsoft_auth_service import (
+    MicrosoftAuthService,
+    get_microsoft_jwks_url,
+)
+from app.core.cache.permission_cache import PermissionCache, permission_cache
+from app.core.cache.user_cache import UserCache, user_cache
+from app.core.database.repositories.location_repository_impl import (
+    LocationRepositoryImpl,
+)
+from app.core.database.repositories.module_repository_impl import (
+    AsyncModuleRepositoryImpl,
+    ModuleRepositoryImpl,
+)
+from app.core.database.repositories.module_role_repository_impl import (
+    AsyncModuleRoleRepositoryImpl,
+    ModuleRoleRepositoryImpl,
+)
+from app.core.database.repositories.role_repository_impl import (
+    AsyncRoleRepositoryImpl,
+    RoleRepositoryImpl,
+)
+from app.core.database.repositories.user_repository_impl import (
+    AsyncUserRepositoryImpl,
+    UserRepositoryImpl,
+)
+from app.core.database.repositories.user_role_repository_impl import (
+    UserRoleRepositoryImpl,
+)
+from app.core.database.unit_of_work import UnitOfWork
+from app.core.email.outbox import EmailOutbox, email_outbox
+from app.core.email.services.email_service import EmailService
+from app.core.email.services.outbox_worker import EmailOutboxWorker
+from app.core.email.services.smtp_sender import SmtpSender
+from app.core.email.templates import EmailTemplates
+from app.core.settings import EmailSettings, Settings
+from app.geo.services.geo_info_service import GeoInfoService
+from app.iam.services.module_role_service import ModuleRoleService
+from app.iam.services.module_service import AsyncModuleService, ModuleService
+from app.iam.services.role_service import AsyncRoleService, RoleService
+from app.iam.services.user_role_service import UserRoleService
+from app.iam.services.user_service import AsyncUserService, UserService
+from app.iam.usecases.create_role import CreateRoleUseCase
+from app.iam.usecases.create_user import CreateUserUseCase
+from app.iam.usecases.get_roles_with_modules import GetRolesWithModulesUseCase
+from app.iam.usecases.get_user_with_modules import GetUserWithModulesUseCase
+from app.iam.usecases.get_users_with_roles import GetUsersWithRolesUseCase
+from app.iam.usecases.import_users import ImportUsersUseCase
+from app.iam.usecases.update_role import UpdateRoleUseCase
+from app.iam.usecases.update_user import UpdateUserUseCase
+
+
+class AppContainer:
+    """
+    Servicios sin estado por petición: se construyen una vez al iniciar la app
+    y se comparten entre todas las peticiones.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        email_settings: EmailSettings,
+        user_cache: UserCache = user_cache,
+        permission_cache: PermissionCache = permission_cache,
+        email_outbox: EmailOutbox = email_outbox,
+    ):
+        self.settings = settings
+        self.email_settings = email_settings
+        self.user_cache = user_cache
+        self.permission_cache = permission_cache
+        self.email_outbox = email_outbox
+        self.email_service = EmailService(email_outbox)
+        self.email_worker: EmailOutboxWorker | None = None
+        self.google_auth_service = GoogleAuthService(
+            client_id=settings.google_client_id,
+            jwks=JwksCache(settings.google_certs_url, provider="google"),
+        )
+        self.microsoft_auth_service = MicrosoftAuthService(
+            client_id=settings.ms_client_id,
+            tenant_id=settings.ms_tenant_id,
+            jwks=JwksCache(
+                settings.ms_jwks_url or get_microsoft_jwks_url(settings.ms_tenant_id),
+                provider="microsoft",
+                refresh_interval=settings.ms_jwks_refresh_interval,
+            ),
+        )
+        self.geo_info_service = GeoInfoService(
+            base_url=settings.geo_info_service_url,
+            api_key=settings.geo_info_service_api_key,
+        )
+
+    def start(self) -> None:
+        # Descarga las llaves de los proveedores OAuth en segundo plano para
+        # que el primer login no espere la descarga
+        if self.settings.google_client_id:
+            self.google_auth_service.jwks.start()
+        if self.settings.ms_tenant_id:
+            self.microsoft_auth_service.jwks.start()
+
+        if self.settings.email_outbox_worker_enabled:
+            self.email_worker = self._build_email_worker()
+            self.email_worker.start()
+
+    async def stop(self) -> None:
+        self.google_auth_service.jwks.stop()
+        self.microsoft_auth_service.jwks.stop()
+        if self.email_worker is not None:
+            await self.email_worker.stop()
+
+    async def drain_email_outbox(self) -> int:
+        """
+        Envía los correos pendientes en una sola llamada, para despliegues sin
+        procesos persistentes (Vercel) donde el worker en segundo plano no
+        sobrevive entre invocaciones. Usa su propia conexión SMTP, que se
+        cierra al terminar, para no compartirla con el worker.
+        """
+        worker = self._build_email_worker()
+        try:
+            return await worker.drain(self.settings.email_outbox_drain_max_batches)
+        finally:
+            await worker.sender.close()
+
+    def _build_email_worker(self) -> EmailOutboxWorker:
+        return EmailOutboxWorker(
+            self.email_outbox,
+            SmtpSender(self.email_settings, self.settings.smtp_idle_timeout),
+            EmailTemplates(self.email_settings.TEMPLATE_FOLDER),
+            batch_size=self.settings.email_outbox_batch_size,
+            max_attempts=self.settings.email_outbox_max_attempts,
+            retry_backoff=self.settings.email_outbox_retry_backoff,
+            poll_interval=self.settings.email_outbox_poll_interval,
+        )
+
+
+class RequestContainer:
+    """
+    Repositorios, servicios y casos de uso sobre la `Session` de una petición.
+    Cada objeto se construye solo si la ruta lo usa.
+    """
+
+    def __init__(self, session: Session, app_container: AppContainer):
+        self.session = session
+        self.app_container = app_container
+
+    @cached_property
+    def unit_of_work(self) -> UnitOfWork:
+        # Compartida por todos los repositorios de la petición
+        return UnitOfWork(self.session)
+
+    # --- Repositories
+
+    @cached_property
+    def user_repository(self) -> UserRepositoryImpl:
+        return UserRepositoryImpl(
+            self.session,
+            user_cache=self.app_container.user_cache,
+            unit_of_work=self.unit_of_work,
+        )
+
+    @cached_property
+    def module_repository(self) -> ModuleRepositoryImpl:
+        return ModuleRepositoryImpl(self.session)
+
+    @cached_property
+    def role_repository(self) -> RoleRepositoryImpl:
+        return RoleRepositoryImpl(
+            self.session,
+            permission_cache=self.app_container.permission_cache,
+            unit_of_work=self.unit_of_work,
+        )
+
+    @cached_property
+    def user_role_repository(self) -> UserRoleRepositoryImpl:
+        return UserRoleRepositoryImpl(
+            self.session,
+            permission_cache=self.app_container.permission_cache,
+            unit_of_work=self.unit_of_work,
+        )
+
+    @cached_property
+    def module_role_repository(self) -> ModuleRoleRepositoryImpl:
+        return ModuleRoleRepositoryImpl(
+            self.session,
+            permission_cache=self.app_container.permission_cache,
+            unit_of_work=self.unit_of_work,
+        )
+
+    @cached_property
+    def location_repository(self) -> LocationRepositoryImpl:
+        return LocationRepositoryImpl(self.session, unit_of_work=self.unit_of_work)
+
+    # --- Services
+
+    @cached_property
+    def auth_service(self) -> AuthService:
+        return AuthService(
+            user_repository=self.user_repository,
+            role_repository=self.role_repository,
+            permission_cache=self.app_container.permission_cache,
+        )
+
+    @cached_property
+    def user_service(self) -> UserService:
+        return UserService(user_repository=self.user_repository)
+
+    @cached_property
+    def module_service(self) -> ModuleService:
+        return ModuleService(
+            module_repository=self.module_repository,
+            module_role_repository=self.module_role_repository,
+        )
+
+    @cached_property
+    def role_service(self) -> RoleService:
+        return RoleService(role_repository=self.role_repository)
+
+    @cached_property
+    def user_role_service(self) -> UserRoleService:
+        return UserRoleService(user_role_repository=self.user_role_repository)
+
+    @cached_property
+    def module_role_service(self) -> ModuleRoleService:
+        return ModuleRoleService(module_role_repository=self.module_role_repository)
+
+    # --- Usecases
+
+    @cached_property
+    def create_user_use_case(self) -> CreateUserUseCase:
+        return CreateUserUseCase(
+            self.user_service,
+            self.role_service,
+            self.user_role_service,
+            self.unit_of_work,
+        )
+
+    @cached_property
+    def update_user_use_case(self) -> UpdateUserUseCase:
+        return UpdateUserUseCase(
+            self.user_service,
+            self.role_service,
+            self.user_role_service,
+            self.unit_of_work,
+        )
+
+    @cached_property
+    def import_users_use_case(self) -> ImportUsersUseCase:
+        return ImportUsersUseCase(self.user_service, self.role_service)
+
+    @cached_property
+    def create_role_use_case(self) -> CreateRoleUseCase:
+        return CreateRoleUseCase(
+            self.role_service,
+            self.module_service,
+            self.module_role_service,
+            self.unit_of_work,
+        )
+
+    @cached_property
+    def update_role_use_case(self) -> UpdateRoleUseCase:
+        return UpdateRoleUseCase(
+            self.role_service,
+            self.module_service,
+            self.module_role_service,
+            self.unit_of_work,
+        )
+
+
+class ReadContainer:
+    """
+    Equivalente de `RequestContainer` para las rutas de solo lectura sobre la
+    `AsyncSession` (réplicas cuando las hay, salvo `get_primary_read_container`).
+    """
+
+    def __init__(self, session: AsyncSession, app_container: AppContainer):
+        self.session = session
+        self.app_container = app_container
+
+    # --- Repositories
+
+    @cached_property
+    def user_repository(self) -> AsyncUserRepositoryImpl:
+        return AsyncUserRepositoryImpl(self.session)
+
+    @cached_property
+    def module_repository(self) -> AsyncModuleRepositoryImpl:
+        return AsyncModuleRepositoryImpl(self.session)
+
+    @cached_property
+    def role_repository(self) -> AsyncRoleRepositoryImpl:
+        return AsyncRoleRepositoryImpl(self.session)
+
+    @cached_property
+    def module_role_repository(self) -> AsyncModuleRoleRepositoryImpl:
+        return AsyncModuleRoleRepositoryImpl(self.session)
+
+    # --- Services
+
+    @cached_property
+    def user_service(self) -> AsyncUserService:
+        return AsyncUserService(user_repository=self.user_repository)
+
+    @cached_property
+    def module_service(self) -> AsyncModuleService:
+        return AsyncModuleService(
+            module_repository=self.module_repository,
+            module_role_repository=self.module_role_repository,
+        )
+
+    @cached_property
+    def role_service(self) -> AsyncRoleService:
+        return AsyncRoleService(role_repository=self.role_repository)
+
+    # --- Usecases
+
+    @cached_property
+    def get_user_with_modules_use_case(self) -> GetUserWithModulesUseCase:
+        # Los snapshots se guardan bajo la versión de permisos vigente: deben
+        # construirse desde el primario (ver `get_primary_read_container`)
+        return GetUserWithModulesUseCase(
+            self.user_service,
+            self.module_service,
+            self.role_service,
+            permission_cache=self.app_container.permission_cache,
+        )
+
+    @cached_property
+    def get_users_with_roles_use_case(self) -> GetUsersWithRolesUseCase:
+        return GetUsersWithRolesUseCase(self.user_service)
+
+    @cached_property
+    def get_roles_with_modules_use_case(self) -> GetRolesWithModulesUseCase:
+        return GetRolesWithModulesUseCase(self.role_service, self.module_service)
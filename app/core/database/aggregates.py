@@ -0,0 +1,19 @@
+from itertools import chain
+
+from sqlalchemy import func
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def json_objects_agg(dialect: str, columns: dict[str, ColumnElement]) -> ColumnElement:
+    """
+    Agrega las filas del grupo en un arreglo JSON de objetos con las claves de
+    `columns`. Sin filas SQLite devuelve `[]`; MySQL y PostgreSQL, NULL.
+    """
+    pairs = list(chain.from_iterable(columns.items()))
+    if dialect == "mysql":
+        return func.json_arrayagg(func.json_object(*pairs))
+    if dialect == "sqlite":
+        return func.json_group_array(func.json_object(*pairs))
+    if dialect == "postgresql":
+        return func.json_agg(func.json_build_object(*pairs))
+    raise NotImplementedError(f"agregación JSON no soportada para {dialect}")
@@ -0,0 +1,48 @@
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlmodel import Session, SQLModel
+
+# Limita los parámetros por sentencia (SQLite admite 32766 por consulta)
+CHUNK_SIZE = 500
+
+
+def chunks(items: Sequence[Any], size: int = CHUNK_SIZE) -> Iterator[list[Any]]:
+    for start in range(0, len(items), size):
+        yield list(items[start : start + size])
+
+
+def upsert(
+    session: Session,
+    model: type[SQLModel],
+    rows: list[dict[str, Any]],
+    keys: tuple[str, ...],
+    update: tuple[str, ...],
+) -> None:
+    """
+    Inserta `rows` en lotes; si ya existe una fila con las mismas `keys`
+    (restricción única) actualiza sus columnas `update` con el valor nuevo.
+    Una sentencia por lote: `ON DUPLICATE KEY UPDATE` en MySQL y
+    `ON CONFLICT DO UPDATE` en SQLite y PostgreSQL.
+    """
+    dialect = session.get_bind().dialect.name
+    table = model.__table__  # type: ignore
+
+    for chunk in chunks(rows):
+        if dialect == "mysql":
+            statement = mysql.insert(table).values(chunk)
+            statement = statement.on_duplicate_key_update(
+                {column: statement.inserted[column] for column in update}
+            )
+        elif dialect in ("sqlite", "postgresql"):
+            dialect_module = sqlite if dialect == "sqlite" else postgresql
+            statement = dialect_module.insert(table).values(chunk)
+            statement = statement.on_conflict_do_update(
+                index_elements=list(keys),
+                set_={column: statement.excluded[column] for column in update},
+            )
+        else:
+            raise NotImplementedError(f"upsert no soportado para {dialect}")
+
+        session.exec(statement)  # type: ignore
@@ -1,12 +1,59 @@
-from typing import Annotated, Generator
+from functools import lru_cache, partial
+from typing import Annotated, AsyncGenerator, Generator
 
 from fastapi import Depends
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.database.instrumentation import instrument_engine
+from app.core.database.pool import engine_options, observe_pool
+from app.core.database.replicas import DB_READ_ROUTING, PRIMARY_TARGET, ReplicaSet
 from app.core.settings import settings
 
-engine = create_engine(settings.db_url)
+# Driver asíncrono equivalente a cada driver síncrono soportado
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+engine = instrument_engine(create_engine(settings.db_url, **engine_options(settings)))
+observe_pool(engine, "sync")
+
+
+def get_async_db_url(db_url: str) -> str:
+    url = make_url(db_url)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def _create_async_engine(db_url: str, name: str) -> AsyncEngine:
+    async_engine = create_async_engine(
+        get_async_db_url(db_url), **engine_options(settings, is_async=True)
+    )
+    instrument_engine(async_engine.sync_engine)
+    observe_pool(async_engine.sync_engine, name)
+    return async_engine
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    # Se crea al primer uso para no exigir el driver asíncrono a quien solo
+    # necesita el engine síncrono (scripts, herramientas).
+    return _create_async_engine(settings.db_url, "async")
+
+
+replica_set = ReplicaSet(
+    [
+        partial(_create_async_engine, replica_url, f"replica-{index}")
+        for index, replica_url in enumerate(settings.db_replica_urls)
+    ],
+    cooldown=settings.db_replica_cooldown,
+)
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -17,4 +64,28 @@ def get_session() -> Generator[Session, None, None]:
         session.close()
 
 
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Sesión de solo lectura: usa una réplica si hay alguna configurada y sana.
+    Las escrituras y las lecturas posteriores a una escritura deben usar
+    `get_session` para ir siempre al primario.
+    """
+    replica = replica_set.choose()
+    if replica is None:
+        target, read_engine = PRIMARY_TARGET, get_async_engine()
+    else:
+        target, read_engine = replica
+
+    DB_READ_ROUTING.inc(target)
+    async with AsyncSession(read_engine, expire_on_commit=False) as session:
+        yield session
+
+
 SessionDep = Annotated[Session, Depends(get_session)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
@@ -0,0 +1,101 @@
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics.registry import registry
+
+DB_QUERY_DURATION = registry.histogram(
+    "db_query_duration_seconds",
+    "Duración de las sentencias SQL por tipo de operación",
+    labels=("operation",),
+)
+DB_QUERY_ERRORS = registry.counter(
+    "db_query_errors_total",
+    "Sentencias SQL que terminaron en error",
+    labels=("operation",),
+)
+
+_QUERY_START_KEY = "query_start_time"
+
+
+@dataclass
+class QueryStats:
+    """
+    Sentencias ejecutadas durante una petición.
+    """
+
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        self.statements[statement] += 1
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        return [
+            (statement, times)
+            for statement, times in self.statements.most_common()
+            if times >= threshold
+        ]
+
+
+# El objeto se comparte por referencia, así que las sentencias ejecutadas en el
+# threadpool (endpoints y dependencias síncronas) también quedan registradas.
+_current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_query_stats.reset(token)
+
+
+def _operation_of(statement: str) -> str:
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    if verb in {"SELECT", "INSERT", "UPDATE", "DELETE"}:
+        return verb
+    return "OTHER"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info[_QUERY_START_KEY].pop()
+    DB_QUERY_DURATION.observe(elapsed, _operation_of(statement))
+
+    stats = _current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_QUERY_START_KEY):
+        connection.info[_QUERY_START_KEY].pop()
+    DB_QUERY_ERRORS.inc(_operation_of(exception_context.statement or ""))
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """
+    Registra la duración de cada sentencia SQL ejecutada por el engine.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    return engine
@@ -0,0 +1,55 @@
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import select
+from sqlmodel import SQLModel, or_
+
+from app.core.list_query import ListQuery
+
+
+def list_statement(
+    model: type[SQLModel],
+    query: ListQuery,
+    columns: Sequence[str],
+    search_columns: Sequence[str] = (),
+) -> Any:
+    """
+    `SELECT` de solo `columns` con los filtros y la página de `query`.
+    """
+    # `select` de SQLAlchemy: con una sola columna el de SQLModel devolvería
+    # escalares en lugar de filas
+    statement = select(*[getattr(model, column) for column in columns])
+    return apply_list_query(statement, model, query, search_columns)
+
+
+def apply_list_query(
+    statement: Any,
+    model: type[SQLModel],
+    query: ListQuery,
+    search_columns: Sequence[str] = (),
+) -> Any:
+    """
+    Aplica a `statement` los filtros de `query` y la página ordenada por id:
+    `id > after_id` usa la clave primaria, así que el costo depende del
+    tamaño de la página y no de la posición en la tabla.
+    """
+    table: Any = model
+    if query.after_id is not None:
+        statement = statement.where(table.id > query.after_id)
+    if query.active is not None:
+        statement = statement.where(table.active == query.active)
+    if query.created_from is not None:
+        statement = statement.where(table.creation_date >= query.created_from)
+    if query.created_to is not None:
+        statement = statement.where(table.creation_date < query.created_to)
+    if query.search and search_columns:
+        statement = statement.where(
+            or_(
+                *[
+                    getattr(table, column).contains(query.search, autoescape=True)
+                    for column in search_columns
+                ]
+            )
+        )
+
+    return statement.order_by(table.id).limit(query.limit)
@@ -0,0 +1,42 @@
+-- Restricciones únicas sobre las tablas de enlace de roles (MySQL).
+-- Las sincronizaciones masivas usan INSERT ... ON DUPLICATE KEY UPDATE y
+-- necesitan que cada par exista una sola vez.
+
+-- users_roles: se conserva el registro de menor id de cada par, activo si
+-- alguno de los duplicados lo estaba.
+UPDATE users_roles AS ur
+JOIN (
+    SELECT MIN(id) AS id, MAX(active) AS active
+    FROM users_roles
+    GROUP BY user_id, role_id
+    HAVING COUNT(*) > 1
+) AS keep ON keep.id = ur.id
+SET ur.active = keep.active;
+
+DELETE ur FROM users_roles AS ur
+JOIN users_roles AS keep
+    ON keep.user_id = ur.user_id
+    AND keep.role_id = ur.role_id
+    AND keep.id < ur.id;
+
+ALTER TABLE users_roles
+    ADD CONSTRAINT uq_users_roles_user_role UNIQUE (user_id, role_id);
+
+-- modules_roles
+UPDATE modules_roles AS mr
+JOIN (
+    SELECT MIN(id) AS id, MAX(active) AS active
+    FROM modules_roles
+    GROUP BY role_id, module_id
+    HAVING COUNT(*) > 1
+) AS keep ON keep.id = mr.id
+SET mr.active = keep.active;
+
+DELETE mr FROM modules_roles AS mr
+JOIN modules_roles AS keep
+    ON keep.role_id = mr.role_id
+    AND keep.module_id = mr.module_id
+    AND keep.id < mr.id;
+
+ALTER TABLE modules_roles
+    ADD CONSTRAINT uq_modules_roles_role_module UNIQUE (role_id, module_id);
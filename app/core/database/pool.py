@@ -0,0 +1,111 @@
+import time
+import weakref
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+from app.core.metrics.registry import registry
+from app.core.settings import Settings
+
+POOL_MODE_NULL = "null"
+
+DB_POOL_CHECKOUT_DURATION = registry.histogram(
+    "db_pool_checkout_duration_seconds",
+    "Tiempo para obtener una conexión del pool (espera, pre-ping y conexión)",
+    labels=("engine",),
+)
+DB_POOL_CHECKOUT_TIMEOUTS = registry.counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts que superaron DB_POOL_TIMEOUT",
+    labels=("engine",),
+)
+DB_POOL_CONNECTIONS = registry.gauge(
+    "db_pool_connections",
+    "Conexiones del pool por estado (in_use, idle, overflow)",
+    labels=("engine", "state"),
+)
+
+
+class _CheckoutTimingMixin:
+    # `observe_pool` lo reemplaza por el nombre del engine (p. ej. "replica-0")
+    metrics_label = "unknown"
+
+    def recreate(self) -> Any:
+        # `engine.dispose()` crea un pool nuevo: conserva la etiqueta
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics_label = self.metrics_label
+        return pool
+
+    def connect(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super().connect()  # type: ignore[misc]
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc(self.metrics_label)
+            raise
+        finally:
+            DB_POOL_CHECKOUT_DURATION.observe(
+                time.perf_counter() - start, self.metrics_label
+            )
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def engine_options(settings: Settings, is_async: bool = False) -> dict[str, Any]:
+    """
+    Argumentos de `create_engine` para el pool según la configuración.
+
+    En modo `null` no se mantienen conexiones entre peticiones, para entornos
+    serverless (Vercel) o cuando hay un pooler externo (ProxySQL, RDS Proxy).
+    """
+    if make_url(settings.db_url).get_backend_name() == "sqlite":
+        return {}
+
+    if settings.db_pool_mode == POOL_MODE_NULL:
+        return {"poolclass": NullPool}
+
+    return {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool
+        if is_async
+        else InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_pool_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def observe_pool(engine: Engine, name: str) -> None:
+    """
+    Expone las conexiones en uso, libres y de overflow del pool del engine y
+    etiqueta con `name` sus tiempos de checkout, para distinguir el primario de
+    cada réplica.
+    """
+    pool = engine.pool
+    if isinstance(pool, _CheckoutTimingMixin):
+        pool.metrics_label = name
+    if not isinstance(pool, QueuePool):
+        return
+
+    pool_ref: weakref.ref[Pool] = weakref.ref(pool)
+
+    def connections() -> dict[tuple[str, ...], float]:
+        current = pool_ref()
+        if not isinstance(current, QueuePool):
+            return {}
+        return {
+            (name, "in_use"): current.checkedout(),
+            (name, "idle"): current.checkedin(),
+            (name, "overflow"): max(current.overflow(), 0),
+        }
+
+    DB_POOL_CONNECTIONS.set_function(connections)
@@ -1,7 +1,69 @@
+import time
+from functools import lru_cache
+
 import redis
+import redis.asyncio
 
+from app.core.metrics.registry import registry
 from app.core.settings import settings
 
+REDIS_COMMAND_DURATION = registry.histogram(
+    "redis_command_duration_seconds",
+    "Duración de los comandos de Redis",
+    labels=("command", "outcome"),
+)
+
+
+class InstrumentedRedis(redis.Redis):
+    def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = super().execute_command(*args, **options)
+            outcome = "ok"
+            return result
+        finally:
+            command = str(args[0]).upper() if args else "UNKNOWN"
+            REDIS_COMMAND_DURATION.observe(
+                time.perf_counter() - start, command, outcome
+            )
+
+
+class InstrumentedAsyncRedis(redis.asyncio.Redis):
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await super().execute_command(*args, **options)
+            outcome = "ok"
+            return result
+        finally:
+            command = str(args[0]).upper() if args else "UNKNOWN"
+            REDIS_COMMAND_DURATION.observe(
+                time.perf_counter() - start, command, outcome
+            )
+
+
+@lru_cache(maxsize=1)
+def get_redis_client() -> redis.Redis:
+    # Un solo cliente por proceso para reutilizar su pool de conexiones
+    # en lugar de abrir una conexión nueva en cada petición.
+    return InstrumentedRedis.from_url(
+        settings.redis_url,
+        decode_responses=True,
+        socket_timeout=settings.redis_socket_timeout,
+        socket_connect_timeout=settings.redis_socket_connect_timeout,
+    )
+
 
-def get_redis_client():
-    return redis.from_url(settings.redis_url, decode_responses=True)
+@lru_cache(maxsize=1)
+def get_async_redis_client() -> redis.asyncio.Redis:
+    """
+    Cliente para las rutas `async`, para no bloquear el event loop.
+    """
+    return InstrumentedAsyncRedis.from_url(
+        settings.redis_url,
+        decode_responses=True,
+        socket_timeout=settings.redis_socket_timeout,
+        socket_connect_timeout=settings.redis_socket_connect_timeout,
+    )
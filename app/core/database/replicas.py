@@ -0,0 +1,95 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from itertools import count
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.metrics.registry import registry
+
+DB_READ_ROUTING = registry.counter(
+    "db_read_routing_total",
+    "Sesiones de lectura por destino (réplica o primario)",
+    labels=("target",),
+)
+DB_REPLICA_HEALTHY = registry.gauge(
+    "db_replica_healthy",
+    "1 si la réplica está disponible para lecturas, 0 si está en enfriamiento",
+    labels=("replica",),
+)
+
+PRIMARY_TARGET = "primary"
+
+
+class ReplicaSet:
+    """
+    Réplicas de lectura seleccionadas en round-robin.
+
+    Una réplica con errores de conexión queda fuera de la rotación durante
+    `cooldown` segundos; si no hay réplicas sanas las lecturas van al primario.
+    """
+
+    def __init__(
+        self,
+        engine_factories: list[Callable[[], AsyncEngine]],
+        cooldown: float = 30.0,
+    ):
+        self.cooldown = cooldown
+        self._engine_factories = engine_factories
+        self._engines: dict[int, AsyncEngine] = {}
+        self._unhealthy_until: dict[int, float] = {}
+        self._counter = count()
+        self._lock = threading.Lock()
+        DB_REPLICA_HEALTHY.set_function(self._health)
+
+    def __len__(self) -> int:
+        return len(self._engine_factories)
+
+    def choose(self) -> tuple[str, AsyncEngine] | None:
+        if not self._engine_factories:
+            return None
+
+        now = time.monotonic()
+        start = next(self._counter)
+        for offset in range(len(self._engine_factories)):
+            index = (start + offset) % len(self._engine_factories)
+            if self._unhealthy_until.get(index, 0.0) <= now:
+                return f"replica-{index}", self._engine(index)
+
+        return None
+
+    def mark_unhealthy(self, index: int) -> None:
+        if self._unhealthy_until.get(index, 0.0) <= time.monotonic():
+            logging.warning(
+                "Réplica %d fuera de rotación por %.0f s", index, self.cooldown
+            )
+        self._unhealthy_until[index] = time.monotonic() + self.cooldown
+
+    def _engine(self, index: int) -> AsyncEngine:
+        engine = self._engines.get(index)
+        if engine is None:
+            with self._lock:
+                engine = self._engines.get(index)
+                if engine is None:
+                    engine = self._engine_factories[index]()
+                    self._watch(index, engine)
+                    self._engines[index] = engine
+        return engine
+
+    def _watch(self, index: int, engine: AsyncEngine) -> None:
+        def handle_error(exception_context) -> None:
+            if exception_context.is_disconnect or isinstance(
+                exception_context.sqlalchemy_exception, exc.OperationalError
+            ):
+                self.mark_unhealthy(index)
+
+        event.listen(engine.sync_engine, "handle_error", handle_error)
+
+    def _health(self) -> dict[tuple[str, ...], float]:
+        now = time.monotonic()
+        return {
+            (str(index),): float(self._unhealthy_until.get(index, 0.0) <= now)
+            for index in range(len(self._engine_factories))
+        }
@@ -1,18 +1,19 @@
 from sqlmodel import Session, select
 
+from app.core.database.unit_of_work import UnitOfWork
 from app.core.models.locations import DbLocation, LocationUpdate
 from app.core.repositories.location_repository import LocationRepository
 
 
 class LocationRepositoryImpl(LocationRepository):
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, unit_of_work: UnitOfWork | None = None):
         self.session = session
+        self.unit_of_work = unit_of_work or UnitOfWork(session)
 
     def create_location(self, location: DbLocation) -> DbLocation:
         db_location = DbLocation.model_validate(location)
         self.session.add(db_location)
-        self.session.commit()
-        self.session.refresh(db_location)
+        self.unit_of_work.save(db_location)
         return db_location
 
     def get_location_by_id(self, location_id: int) -> DbLocation | None:
@@ -37,8 +38,7 @@ class LocationRepositoryImpl(LocationRepository):
             for key, value in update_data.items():
                 setattr(db_location, key, value)
             self.session.add(db_location)
-            self.session.commit()
-            self.session.refresh(db_location)
+            self.unit_of_work.save(db_location)
         return db_location
 
     def delete_location(self, location_id: int) -> DbLocation | None:
@@ -46,6 +46,5 @@ class LocationRepositoryImpl(LocationRepository):
         if db_location:
             db_location.active = False
             self.session.add(db_location)
-            self.session.commit()
-            self.session.refresh(db_location)
+            self.unit_of_work.save(db_location)
         return db_location
@@ -1,8 +1,19 @@
+from typing import Sequence
+
+from sqlalchemy import Row
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.database.list_statement import list_statement
+from app.core.list_query import ListQuery
 from app.core.models.module import DbModule
 from app.core.models.module_role import DbModuleRole
-from app.core.repositories.module_repository import ModuleRepository
+from app.core.repositories.module_repository import (
+    AsyncModuleRepository,
+    ModuleRepository,
+)
+
+MODULE_SEARCH_COLUMNS = ("name", "description", "path")
 
 
 class ModuleRepositoryImpl(ModuleRepository):
@@ -14,11 +25,11 @@ class ModuleRepositoryImpl(ModuleRepository):
             return []
 
         modules_roles_statement = select(DbModuleRole).where(
-            DbModuleRole.role_id.in_(role_ids)  # type: ignore
+            DbModuleRole.role_id.in_(role_ids),  # type: ignore
+            DbModuleRole.active == True,  # noqa: E712
         )
 
         modules_roles = self.session.exec(modules_roles_statement)
-        print(modules_roles)
         modules_ids = [mr.module_id for mr in modules_roles]
 
         statement = (
@@ -51,3 +62,54 @@ class ModuleRepositoryImpl(ModuleRepository):
     def get_module_by_id(self, module_id: int) -> DbModule | None:
         statement = select(DbModule).where(DbModule.id == module_id)
         return self.session.exec(statement).first()
+
+
+class AsyncModuleRepositoryImpl(AsyncModuleRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_modules_by_role_ids(self, role_ids: list[int]) -> list[DbModule]:
+        if not role_ids:
+            return []
+
+        modules_roles = await self.session.exec(
+            select(DbModuleRole).where(
+                DbModuleRole.role_id.in_(role_ids),  # type: ignore
+                DbModuleRole.active == True,  # noqa: E712
+            )
+        )
+        modules_ids = [mr.module_id for mr in modules_roles.all()]
+
+        statement = (
+            select(DbModule)
+            .where(DbModule.id.in_(modules_ids))  # type: ignore
+            .distinct()
+        )
+        results = await self.session.exec(statement)
+        return list(results.all())
+
+    async def get_modules_by_ids(self, module_ids: list[int]) -> list[DbModule]:
+        if not module_ids:
+            return []
+
+        statement = select(DbModule).where(DbModule.id.in_(module_ids))  # type: ignore
+        results = await self.session.exec(statement)
+        return list(results.all())
+
+    async def get_all_modules(self) -> list[DbModule]:
+        results = await self.session.exec(select(DbModule))
+        return list(results.all())
+
+    async def get_all_modules_by_active(self, active: bool) -> list[DbModule]:
+        statement = select(DbModule).where(DbModule.active == active)
+        results = await self.session.exec(statement)
+        return list(results.all())
+
+    async def list_modules(self, query: ListQuery, columns: list[str]) -> Sequence[Row]:
+        statement = list_statement(DbModule, query, columns, MODULE_SEARCH_COLUMNS)
+        results = await self.session.exec(statement)  # type: ignore
+        return results.all()
+
+    async def get_module_by_id(self, module_id: int) -> DbModule | None:
+        statement = select(DbModule).where(DbModule.id == module_id)
+        return (await self.session.exec(statement)).first()
@@ -1,21 +1,38 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.cache.permission_cache import PermissionCache
+from app.core.database.bulk import chunks, upsert
+from app.core.database.unit_of_work import UnitOfWork
 from app.core.models.module_role import DbModuleRole
-from app.core.repositories.module_role_repository import ModuleRoleRepository
+from app.core.repositories.module_role_repository import (
+    AsyncModuleRoleRepository,
+    ModuleRoleRepository,
+)
 
 
 class ModuleRoleRepositoryImpl(ModuleRoleRepository):
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        permission_cache: PermissionCache | None = None,
+        unit_of_work: UnitOfWork | None = None,
+    ):
         self.session = session
+        self.permission_cache = permission_cache
+        self.unit_of_work = unit_of_work or UnitOfWork(session)
+
+    def _invalidate_permissions(self) -> None:
+        if self.permission_cache is not None:
+            self.unit_of_work.after_commit(self.permission_cache.bump, "permissions")
 
     def assign_modules_to_role(self, role_id: int, module_ids: list[int]) -> None:
-        new_module_roles = [
-            DbModuleRole(role_id=role_id, module_id=module_id)
-            for module_id in module_ids
-        ]
+        if not module_ids:
+            return
 
-        self.session.add_all(new_module_roles)
-        self.session.commit()
+        with self.unit_of_work:
+            self._upsert_active({role_id: module_ids})
+            self._invalidate_permissions()
 
     def get_module_ids_map_by_role_ids(
         self, role_ids: list[int]
@@ -36,28 +53,96 @@ class ModuleRoleRepositoryImpl(ModuleRoleRepository):
         return result
 
     def sync_modules_for_role(self, role_id: int, module_ids: list[int]) -> None:
-        current_module_roles = self.session.exec(
-            select(DbModuleRole).where(DbModuleRole.role_id == role_id)
-        ).all()
-
-        current_modules_map = {mr.module_id: mr for mr in current_module_roles}
-        new_module_ids_set = set(module_ids)
-
-        # Deactivate module roles that are no longer assigned
-        for module_id, module_role in current_modules_map.items():
-            if module_id not in new_module_ids_set and module_role.active:
-                module_role.active = False
-                self.session.add(module_role)
-
-        # Activate existing module roles or create new ones
-        for module_id in new_module_ids_set:
-            module_role = current_modules_map.get(module_id)
-            if module_role:
-                if not module_role.active:
-                    module_role.active = True
-                    self.session.add(module_role)
-            else:
-                new_module_role = DbModuleRole(role_id=role_id, module_id=module_id)
-                self.session.add(new_module_role)
-
-        self.session.commit()
+        self.sync_roles_modules({role_id: module_ids})
+
+    def sync_roles_modules(self, modules_by_role: dict[int, list[int]]) -> None:
+        if not modules_by_role:
+            return
+
+        with self.unit_of_work:
+            # Se leen los pares activos como tuplas para escribir solo lo que cambia
+            active_pairs = self._get_active_pairs(list(modules_by_role))
+            missing = {
+                role_id: [
+                    module_id
+                    for module_id in module_ids
+                    if (role_id, module_id) not in active_pairs
+                ]
+                for role_id, module_ids in modules_by_role.items()
+            }
+            stale = {
+                role_id
+                for role_id, module_id in active_pairs
+                if module_id not in modules_by_role[role_id]
+            }
+
+            self._upsert_active(missing)
+
+            # Una desactivación por cada conjunto de módulos distinto
+            roles_by_modules: dict[frozenset[int], list[int]] = {}
+            for role_id in stale:
+                module_ids = frozenset(modules_by_role[role_id])
+                roles_by_modules.setdefault(module_ids, []).append(role_id)
+
+            for module_ids, role_ids in roles_by_modules.items():
+                for chunk in chunks(sorted(role_ids)):
+                    statement = update(DbModuleRole).where(
+                        DbModuleRole.role_id.in_(chunk),  # type: ignore
+                        DbModuleRole.active.is_(True),  # type: ignore
+                    )
+                    if module_ids:
+                        statement = statement.where(
+                            DbModuleRole.module_id.not_in(module_ids)  # type: ignore
+                        )
+                    self.session.exec(statement.values(active=False))
+
+            if stale or any(missing.values()):
+                self._invalidate_permissions()
+
+    def _get_active_pairs(self, role_ids: list[int]) -> set[tuple[int, int]]:
+        return {
+            (role_id, module_id)
+            for chunk in chunks(role_ids)
+            for role_id, module_id in self.session.exec(
+                select(DbModuleRole.role_id, DbModuleRole.module_id).where(
+                    DbModuleRole.role_id.in_(chunk),  # type: ignore
+                    DbModuleRole.active.is_(True),  # type: ignore
+                )
+            ).all()
+        }
+
+    def _upsert_active(self, modules_by_role: dict[int, list[int]]) -> None:
+        rows = [
+            {"role_id": role_id, "module_id": module_id, "active": True}
+            for role_id, module_ids in modules_by_role.items()
+            for module_id in dict.fromkeys(module_ids)
+        ]
+        upsert(
+            self.session,
+            DbModuleRole,
+            rows,
+            keys=("role_id", "module_id"),
+            update=("active",),
+        )
+
+
+class AsyncModuleRoleRepositoryImpl(AsyncModuleRoleRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_module_ids_map_by_role_ids(
+        self, role_ids: list[int]
+    ) -> dict[int, list[int]]:
+        if not role_ids:
+            return {}
+
+        statement = select(DbModuleRole).where(DbModuleRole.role_id.in_(role_ids))  # type: ignore
+        rows = await self.session.exec(statement)
+
+        result: dict[int, list[int]] = {}
+        for row in rows.all():
+            if hasattr(row, "active") and not getattr(row, "active"):
+                continue
+            result.setdefault(row.role_id, []).append(row.module_id)
+
+        return result
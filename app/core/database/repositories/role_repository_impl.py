@@ -1,20 +1,43 @@
 from datetime import datetime
 from typing import Optional, Sequence
 
+from sqlalchemy import Row
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.cache.permission_cache import PermissionCache
+from app.core.database.list_statement import list_statement
+from app.core.database.unit_of_work import UnitOfWork
+from app.core.list_query import ListQuery
 from app.core.models.role import DbRole, RoleCreate, RoleUpdate
 from app.core.models.user_role import DbUserRole
-from app.core.repositories.role_repository import RoleRepository
+from app.core.repositories.role_repository import AsyncRoleRepository, RoleRepository
+
+ROLE_SEARCH_COLUMNS = ("name", "description")
 
 
 class RoleRepositoryImpl(RoleRepository):
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        permission_cache: PermissionCache | None = None,
+        unit_of_work: UnitOfWork | None = None,
+    ):
         self.session = session
+        self.permission_cache = permission_cache
+        self.unit_of_work = unit_of_work or UnitOfWork(session)
+
+    def _invalidate_permissions(self) -> None:
+        # Los snapshots de permisos incluyen los datos de cada rol
+        if self.permission_cache is not None:
+            self.unit_of_work.after_commit(self.permission_cache.bump, "permissions")
 
     def get_roles_by_user_id(self, user_id: int) -> list[DbRole]:
         user_roles = self.session.exec(
-            select(DbUserRole).where(DbUserRole.user_id == user_id)
+            select(DbUserRole).where(
+                DbUserRole.user_id == user_id,
+                DbUserRole.active == True,  # noqa: E712
+            )
         ).all()
 
         if not user_roles:
@@ -46,8 +69,7 @@ class RoleRepositoryImpl(RoleRepository):
         db_role.creation_date = datetime.now()
         db_role.active = True
         self.session.add(db_role)
-        self.session.commit()
-        self.session.refresh(db_role)
+        self.unit_of_work.save(db_role)
         return db_role
 
     def update_role(self, role_id: int, role: RoleUpdate) -> Optional[DbRole]:
@@ -64,8 +86,8 @@ class RoleRepositoryImpl(RoleRepository):
 
         db_role.update_date = datetime.now()
         self.session.add(db_role)
-        self.session.commit()
-        self.session.refresh(db_role)
+        self.unit_of_work.save(db_role)
+        self._invalidate_permissions()
 
         return db_role
 
@@ -75,8 +97,8 @@ class RoleRepositoryImpl(RoleRepository):
         if role:
             role.active = False
             self.session.add(role)
-            self.session.commit()
-            self.session.refresh(role)
+            self.unit_of_work.save(role)
+            self._invalidate_permissions()
 
         return role
 
@@ -93,7 +115,10 @@ class RoleRepositoryImpl(RoleRepository):
 
         # Fetch all user-role relations for the provided user IDs
         user_roles = self.session.exec(
-            select(DbUserRole).where(DbUserRole.user_id.in_(user_ids))  # type: ignore
+            select(DbUserRole).where(
+                DbUserRole.user_id.in_(user_ids),  # type: ignore
+                DbUserRole.active == True,  # noqa: E712
+            )
         ).all()
 
         if not user_roles:
@@ -121,3 +146,71 @@ class RoleRepositoryImpl(RoleRepository):
             bucket.append(role)
 
         return result
+
+
+class AsyncRoleRepositoryImpl(AsyncRoleRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_roles_by_user_id(self, user_id: int) -> list[DbRole]:
+        user_roles = await self.session.exec(
+            select(DbUserRole).where(
+                DbUserRole.user_id == user_id,
+                DbUserRole.active == True,  # noqa: E712
+            )
+        )
+        role_ids = [user_role.role_id for user_role in user_roles.all()]
+        if not role_ids:
+            return []
+
+        roles = await self.session.exec(select(DbRole).where(DbRole.id.in_(role_ids)))  # type: ignore
+        return list(roles.all())
+
+    async def get_all_roles(self) -> list[DbRole]:
+        results = await self.session.exec(select(DbRole))
+        return list(results.all())
+
+    async def get_all_roles_by_active(self, active: bool) -> list[DbRole]:
+        results = await self.session.exec(select(DbRole).where(DbRole.active == active))
+        return list(results.all())
+
+    async def list_roles(self, query: ListQuery, columns: list[str]) -> Sequence[Row]:
+        statement = list_statement(DbRole, query, columns, ROLE_SEARCH_COLUMNS)
+        results = await self.session.exec(statement)  # type: ignore
+        return results.all()
+
+    async def get_role_by_id(self, role_id: int) -> Optional[DbRole]:
+        results = await self.session.exec(select(DbRole).where(DbRole.id == role_id))
+        return results.first()
+
+    async def get_roles_by_user_ids_map(
+        self, user_ids: list[int]
+    ) -> dict[int, list[DbRole]]:
+        if not user_ids:
+            return {}
+
+        user_roles = (
+            await self.session.exec(
+                select(DbUserRole).where(
+                    DbUserRole.user_id.in_(user_ids),  # type: ignore
+                    DbUserRole.active == True,  # noqa: E712
+                )
+            )
+        ).all()
+        role_ids = list({ur.role_id for ur in user_roles})
+        if not role_ids:
+            return {}
+
+        roles = await self.session.exec(select(DbRole).where(DbRole.id.in_(role_ids)))  # type: ignore
+        roles_by_id: dict[int, DbRole] = {
+            role.id: role for role in roles.all() if role.id is not None
+        }
+
+        result: dict[int, list[DbRole]] = {}
+        for ur in user_roles:
+            role = roles_by_id.get(ur.role_id)
+            if role is None:
+                continue
+            result.setdefault(ur.user_id, []).append(role)
+
+        return result
@@ -1,15 +1,47 @@
 from datetime import datetime
 from typing import Optional, Sequence
 
-from sqlmodel import Session, select
+from sqlalchemy import Row
+from sqlmodel import Session, insert, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.models.user import DbUser, UserCreateWithPassword, UserUpdate
-from app.core.repositories.user_repository import UserRepository
+from app.core.cache.user_cache import UserCache
+from app.core.database.aggregates import json_objects_agg
+from app.core.database.bulk import chunks
+from app.core.database.list_statement import apply_list_query, list_statement
+from app.core.database.unit_of_work import UnitOfWork
+from app.core.list_query import ListQuery
+from app.core.models.role import DbRole, RoleBase
+from app.core.models.user import (
+    DbUser,
+    UserBase,
+    UserCreateWithPassword,
+    UserUpdate,
+)
+from app.core.models.user_role import DbUserRole
+from app.core.repositories.user_repository import (
+    AsyncUserRepository,
+    UserRepository,
+)
+
+USER_SEARCH_COLUMNS = ("name", "email", "identification")
 
 
 class UserRepositoryImpl(UserRepository):
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        user_cache: UserCache | None = None,
+        unit_of_work: UnitOfWork | None = None,
+    ):
         self.session = session
+        self.user_cache = user_cache
+        self.unit_of_work = unit_of_work or UnitOfWork(session)
+
+    def _invalidate_cache(self, *emails: str | None) -> None:
+        if self.user_cache is not None:
+            user_cache = self.user_cache
+            self.unit_of_work.after_commit(lambda: user_cache.invalidate(*emails))
 
     def get_all_users(self) -> list[DbUser]:
         statement = select(DbUser)
@@ -45,8 +77,8 @@ class UserRepositoryImpl(UserRepository):
         if user:
             user.active = False
             self.session.add(user)
-            self.session.commit()
-            self.session.refresh(user)
+            self.unit_of_work.save(user)
+            self._invalidate_cache(user.email)
 
         return user
 
@@ -56,15 +88,84 @@ class UserRepositoryImpl(UserRepository):
         db_user.active = True
 
         self.session.add(db_user)
-        self.session.commit()
-        self.session.refresh(db_user)
+        self.unit_of_work.save(db_user)
         return db_user
 
+    def create_users(self, users: list[UserCreateWithPassword]) -> list[DbUser]:
+        if not users:
+            return []
+
+        now = datetime.now()
+        user_rows = [
+            DbUser.model_validate(user).model_dump(exclude={"id", "update_date"})
+            | {"creation_date": now, "active": True}
+            for user in users
+        ]
+        emails = [user.email for user in users]
+        with self.unit_of_work:
+            for chunk in chunks(user_rows):
+                self.session.exec(insert(DbUser).values(chunk))
+
+            # Los ids generados se leen por email: RETURNING no existe en MySQL
+            ids = {
+                email: user_id
+                for chunk in chunks(emails)
+                for email, user_id in self.session.exec(
+                    select(DbUser.email, DbUser.id).where(
+                        DbUser.email.in_(chunk)  # type: ignore
+                    )
+                ).all()
+            }
+
+            # Usuarios nuevos: no hay permisos en caché que invalidar
+            user_role_rows = [
+                {
+                    "user_id": ids[user.email],
+                    "role_id": role_id,
+                    "active": True,
+                    "creation_date": now,
+                }
+                for user in users
+                for role_id in dict.fromkeys(user.roles)
+            ]
+            for chunk in chunks(user_role_rows):
+                self.session.exec(insert(DbUserRole).values(chunk))
+
+        # Se cargan con una sola consulta (el commit expira las instancias)
+        created = {
+            db_user.email: db_user for db_user in self._get_users_by_emails(emails)
+        }
+        return [created[user.email] for user in users]
+
+    def _get_users_by_emails(self, emails: list[str]) -> list[DbUser]:
+        return [
+            db_user
+            for chunk in chunks(emails)
+            for db_user in self.session.exec(
+                select(DbUser).where(DbUser.email.in_(chunk))  # type: ignore
+            ).all()
+        ]
+
+    def get_users_by_emails_or_identifications(
+        self, emails: list[str], identifications: list[str]
+    ) -> list[DbUser]:
+        if not emails and not identifications:
+            return []
+
+        statement = select(DbUser).where(
+            or_(
+                DbUser.email.in_(emails),  # type: ignore
+                DbUser.identification.in_(identifications),  # type: ignore
+            )
+        )
+        return list(self.session.exec(statement).all())
+
     def update_user(self, user_id: int, user: UserUpdate) -> Optional[DbUser]:
         db_user = self.get_user_by_id(user_id)
         if not db_user:
             return None
 
+        previous_email = db_user.email
         user_data = user.model_dump(exclude_unset=True)
         for key, value in user_data.items():
             if key == "roles":
@@ -73,8 +174,8 @@ class UserRepositoryImpl(UserRepository):
 
         db_user.update_date = datetime.now()
         self.session.add(db_user)
-        self.session.commit()
-        self.session.refresh(db_user)
+        self.unit_of_work.save(db_user)
+        self._invalidate_cache(previous_email, db_user.email)
 
         return db_user
 
@@ -98,4 +199,85 @@ class UserRepositoryImpl(UserRepository):
             user.password = password
             user.must_change_password = False
             user.update_password_uuid = None
-            self.session.commit()
+            self.unit_of_work.save()
+            self._invalidate_cache(user.email)
+
+    def rehash_password(self, user_id: int, password: str) -> None:
+        user = self.get_user_by_id(user_id)
+
+        # `UserBase` en caché no incluye la contraseña: no hay que invalidar
+        if user:
+            user.password = password
+            self.session.add(user)
+            self.unit_of_work.save()
+
+
+class AsyncUserRepositoryImpl(AsyncUserRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_all_users(self) -> list[DbUser]:
+        results = await self.session.exec(select(DbUser))
+        return list(results.all())
+
+    async def get_all_users_by_active(self, active: bool) -> list[DbUser]:
+        if active is None:
+            return await self.get_all_users()
+
+        results = await self.session.exec(select(DbUser).where(DbUser.active == active))
+        return list(results.all())
+
+    async def get_user_by_id(self, user_id: int) -> Optional[DbUser]:
+        results = await self.session.exec(select(DbUser).where(DbUser.id == user_id))
+        return results.first()
+
+    async def get_user_by_email(self, email: str) -> Optional[DbUser]:
+        results = await self.session.exec(select(DbUser).where(DbUser.email == email))
+        return results.first()
+
+    async def get_users_with_roles(
+        self, query: ListQuery, role_id: int | None = None
+    ) -> Sequence[Row]:
+        dialect = self.session.get_bind().dialect.name
+
+        # Subconsulta correlacionada: usa el índice único (user_id, role_id)
+        # y solo se evalúa para las filas de la página
+        roles = (
+            select(
+                json_objects_agg(
+                    dialect,
+                    {field: getattr(DbRole, field) for field in RoleBase.model_fields},
+                )
+            )
+            .select_from(DbUserRole)
+            .join(DbRole, DbRole.id == DbUserRole.role_id)  # type: ignore
+            .where(
+                DbUserRole.user_id == DbUser.id,
+                DbUserRole.active.is_(True),  # type: ignore
+            )
+            .scalar_subquery()
+        )
+
+        statement = select(
+            *[getattr(DbUser, field) for field in UserBase.model_fields],
+            roles.label("roles"),
+        )
+        if role_id is not None:
+            statement = statement.where(
+                select(DbUserRole.id)
+                .where(
+                    DbUserRole.user_id == DbUser.id,
+                    DbUserRole.role_id == role_id,
+                    DbUserRole.active.is_(True),  # type: ignore
+                )
+                .exists()
+            )
+
+        statement = apply_list_query(statement, DbUser, query, USER_SEARCH_COLUMNS)
+        results = await self.session.exec(statement)  # type: ignore
+        return results.all()
+
+    async def list_users(self, query: ListQuery, columns: list[str]) -> Sequence[Row]:
+        statement = list_statement(DbUser, query, columns, USER_SEARCH_COLUMNS)
+        results = await self.session.exec(statement)  # type: ignore
+        return results.all()
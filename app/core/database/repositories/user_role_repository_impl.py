@@ -1,17 +1,29 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, update
 
+from app.core.cache.permission_cache import PermissionCache
+from app.core.database.bulk import chunks, upsert
+from app.core.database.unit_of_work import UnitOfWork
 from app.core.models.user_role import DbUserRole
 from app.core.repositories.user_role_repository import UserRoleRepository
 
 
 class UserRoleRepositoryImpl(UserRoleRepository):
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        permission_cache: PermissionCache | None = None,
+        unit_of_work: UnitOfWork | None = None,
+    ):
         self.session = session
+        self.permission_cache = permission_cache
+        self.unit_of_work = unit_of_work or UnitOfWork(session)
+
+    def _invalidate_permissions(self) -> None:
+        if self.permission_cache is not None:
+            self.unit_of_work.after_commit(self.permission_cache.bump, "permissions")
 
     def assign_role_to_user(self, user_id: int, role_id: int) -> None:
-        user_role = DbUserRole(user_id=user_id, role_id=role_id)
-        self.session.add(user_role)
-        self.session.commit()
+        self.assign_roles_to_user(user_id, [role_id])
 
     def remove_role_from_user(self, user_id: int, role_id: int) -> None:
         user_role = self.session.exec(
@@ -23,76 +35,105 @@ class UserRoleRepositoryImpl(UserRoleRepository):
         if user_role:
             user_role.active = False
             self.session.add(user_role)
-            self.session.commit()
+            self.unit_of_work.save()
+            self._invalidate_permissions()
 
     def assign_roles_to_user(self, user_id: int, role_ids: list[int]) -> None:
-        # Trae todos los user_roles existentes (activos o no)
-        user_roles = self.session.exec(
-            select(DbUserRole).where(
-                DbUserRole.user_id == user_id,
-                DbUserRole.role_id.in_(role_ids),  # type: ignore
-            )
-        ).all()
-
-        # IDs de roles ya existentes
-        existing_role_ids = [ur.role_id for ur in user_roles]
-
-        # Reactiva los roles inactivos
-        for ur in user_roles:
-            if not ur.active:
-                ur.active = True
-
-        # Crea los nuevos roles que no existan aún
-        new_user_roles = [
-            DbUserRole(user_id=user_id, role_id=role_id)
-            for role_id in role_ids
-            if role_id not in existing_role_ids
-        ]
+        if not role_ids:
+            return
 
-        # Guarda todo
-        self.session.add_all(new_user_roles)
-        self.session.commit()
+        # Crea los enlaces que faltan y reactiva los inactivos en una sentencia
+        with self.unit_of_work:
+            self._upsert_active({user_id: role_ids})
+            self._invalidate_permissions()
 
     def remove_all_roles_from_user(self, user_id: int) -> None:
-        user_roles = self.session.exec(
-            select(DbUserRole).where(DbUserRole.user_id == user_id)
-        ).all()
-
-        for user_role in user_roles:
-            user_role.active = False
-            self.session.add(user_role)
-
-        self.session.commit()
+        with self.unit_of_work:
+            self.session.exec(
+                update(DbUserRole)
+                .where(
+                    DbUserRole.user_id == user_id,  # type: ignore
+                    DbUserRole.active.is_(True),  # type: ignore
+                )
+                .values(active=False)
+            )
+            self._invalidate_permissions()
 
     def sync_user_roles(self, user_id: int, role_ids: list[int]) -> None:
         """
         Synchronizes the roles of a user with the given list of role IDs.
         Deactivates roles that are not in the list and activates/creates the ones that are.
         """
-        current_user_roles = self.session.exec(
-            select(DbUserRole).where(DbUserRole.user_id == user_id)
-        ).all()
-
-        current_roles_map = {ur.role_id: ur for ur in current_user_roles}
-        new_role_ids_set = set(role_ids)
-
-        # Deactivate roles that are no longer assigned
-        for role_id, user_role in current_roles_map.items():
-            if role_id not in new_role_ids_set and user_role.active:
-                user_role.active = False
-                self.session.add(user_role)
-
-        # Activate existing roles or create new ones
-        for role_id in new_role_ids_set:
-            user_role = current_roles_map.get(role_id)
-            if user_role:
-                # It exists, so activate it if it's inactive
-                if not user_role.active:
-                    user_role.active = True
-                    self.session.add(user_role)
-            else:
-                # It's a new role, create it
-                new_user_role = DbUserRole(user_id=user_id, role_id=role_id)
-                self.session.add(new_user_role)
-
-        self.session.commit()
+        self.sync_users_roles({user_id: role_ids})
+
+    def sync_users_roles(self, roles_by_user: dict[int, list[int]]) -> None:
+        if not roles_by_user:
+            return
+
+        with self.unit_of_work:
+            # Se leen los pares activos como tuplas, sin cargar entidades,
+            # para escribir solo lo que cambia
+            active_pairs = self._get_active_pairs(list(roles_by_user))
+            missing = {
+                user_id: [
+                    role_id
+                    for role_id in role_ids
+                    if (user_id, role_id) not in active_pairs
+                ]
+                for user_id, role_ids in roles_by_user.items()
+            }
+            stale = {
+                user_id
+                for user_id, role_id in active_pairs
+                if role_id not in roles_by_user[user_id]
+            }
+
+            self._upsert_active(missing)
+
+            # Una desactivación por cada conjunto de roles distinto: al
+            # reasignar los mismos roles a muchos usuarios es una sola
+            users_by_roles: dict[frozenset[int], list[int]] = {}
+            for user_id in stale:
+                role_ids = frozenset(roles_by_user[user_id])
+                users_by_roles.setdefault(role_ids, []).append(user_id)
+
+            for role_ids, user_ids in users_by_roles.items():
+                for chunk in chunks(sorted(user_ids)):
+                    statement = update(DbUserRole).where(
+                        DbUserRole.user_id.in_(chunk),  # type: ignore
+                        DbUserRole.active.is_(True),  # type: ignore
+                    )
+                    if role_ids:
+                        statement = statement.where(
+                            DbUserRole.role_id.not_in(role_ids)  # type: ignore
+                        )
+                    self.session.exec(statement.values(active=False))
+
+            if stale or any(missing.values()):
+                self._invalidate_permissions()
+
+    def _get_active_pairs(self, user_ids: list[int]) -> set[tuple[int, int]]:
+        return {
+            (user_id, role_id)
+            for chunk in chunks(user_ids)
+            for user_id, role_id in self.session.exec(
+                select(DbUserRole.user_id, DbUserRole.role_id).where(
+                    DbUserRole.user_id.in_(chunk),  # type: ignore
+                    DbUserRole.active.is_(True),  # type: ignore
+                )
+            ).all()
+        }
+
+    def _upsert_active(self, roles_by_user: dict[int, list[int]]) -> None:
+        rows = [
+            {"user_id": user_id, "role_id": role_id, "active": True}
+            for user_id, role_ids in roles_by_user.items()
+            for role_id in dict.fromkeys(role_ids)
+        ]
+        upsert(
+            self.session,
+            DbUserRole,
+            rows,
+            keys=("user_id", "role_id"),
+            update=("active",),
+        )
@@ -0,0 +1,79 @@
+from collections.abc import Callable, Hashable
+
+from sqlmodel import Session
+
+
+class UnitOfWork:
+    """
+    Transacción de un caso de uso sobre la `Session` de la petición.
+
+    Dentro de `with unit_of_work:` los repositorios solo hacen flush y el
+    commit ocurre una vez al salir del bloque (rollback si hubo una
+    excepción). Los bloques anidados se suman a la transacción exterior.
+    Fuera de un bloque cada escritura se confirma sola, como una transacción
+    de una sentencia.
+
+    Las invalidaciones de caché se registran con `after_commit` para que
+    corran una sola vez y solo si el commit se hizo.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._depth = 0
+        self._after_commit: dict[Hashable, Callable[[], None]] = {}
+
+    @property
+    def active(self) -> bool:
+        return self._depth > 0
+
+    def __enter__(self) -> "UnitOfWork":
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self._depth -= 1
+        if self._depth > 0:
+            return
+
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def save(self, *instances: object) -> None:
+        if self.active:
+            # El flush asigna los ids sin cerrar la transacción
+            self.session.flush()
+            return
+
+        self.commit()
+        for instance in instances:
+            self.session.refresh(instance)
+
+    def after_commit(
+        self, callback: Callable[[], None], key: Hashable | None = None
+    ) -> None:
+        """
+        Ejecuta `callback` tras el commit. Con la misma `key` solo se ejecuta
+        una vez por transacción.
+        """
+        if not self.active:
+            callback()
+            return
+        self._after_commit[key if key is not None else callback] = callback
+
+    def commit(self) -> None:
+        try:
+            self.session.commit()
+        except Exception:
+            self.rollback()
+            raise
+
+        callbacks = list(self._after_commit.values())
+        self._after_commit.clear()
+        for callback in callbacks:
+            callback()
+
+    def rollback(self) -> None:
+        self._after_commit.clear()
+        self.session.rollback()
@@ -1,49 +1,60 @@
+import time
 import traceback
 from typing import Annotated, Any
 
 import jwt
-from fastapi import Depends, HTTPException
-from fastapi_mail import ConnectionConfig
+from fastapi import Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from jwt import InvalidTokenError
 
 from app.auth.services.auth_service import AuthService
 from app.auth.services.google_auth_service import GoogleAuthService
 from app.auth.services.microsoft_auth_service import MicrosoftAuthService
-from app.core.database.connection import SessionDep
-from app.core.database.repositories.location_repository_impl import (
-    LocationRepositoryImpl,
+from app.core.cache.permission_cache import permission_cache
+from app.core.cache.user_cache import user_cache
+from app.core.container import AppContainer, ReadContainer, RequestContainer
+from app.core.database.connection import AsyncSessionDep, ReadSessionDep, SessionDep
+from app.core.email.services.email_service import EmailService
+from app.core.exceptions import get_credentials_exception, get_forbidden_exception
+from app.core.list_query import ListQuery
+from app.core.models.user import UserBase
+from app.core.repositories.location_repository import LocationRepository
+from app.core.repositories.module_repository import (
+    AsyncModuleRepository,
+    ModuleRepository,
 )
-from app.core.database.repositories.module_repository_impl import ModuleRepositoryImpl
-from app.core.database.repositories.module_role_repository_impl import (
-    ModuleRoleRepositoryImpl,
+from app.core.repositories.module_role_repository import (
+    AsyncModuleRoleRepository,
+    ModuleRoleRepository,
 )
-from app.core.database.repositories.role_repository_impl import RoleRepositoryImpl
-from app.core.database.repositories.user_repository_impl import UserRepositoryImpl
-from app.core.database.repositories.user_role_repository_impl import (
-    UserRoleRepositoryImpl,
+from app.core.repositories.role_repository import AsyncRoleRepository, RoleRepository
+from app.core.repositories.user_repository import (
+    AsyncUserRepository,
+    UserRepository,
 )
-from app.core.email.services.email_service import EmailService
-from app.core.exceptions import get_credentials_exception
-from app.core.models.user import DbUser
-from app.core.repositories.location_repository import LocationRepository
-from app.core.repositories.module_repository import ModuleRepository
-from app.core.repositories.module_role_repository import ModuleRoleRepository
-from app.core.repositories.role_repository import RoleRepository
-from app.core.repositories.user_repository import UserRepository
 from app.core.repositories.user_role_repository import UserRoleRepository
+from app.core.security.jwt_service import ACCESS_TOKEN_TYPE
+from app.core.security.module_index import MODULE_AUTHORIZATION_DECISIONS, module_index
+from app.core.security.revocation import revocation_store
 from app.core.security.security import oauth2_scheme
+from app.core.security.token_cache import (
+    JWT_DECODE_DURATION,
+    token_cache,
+    token_digest,
+)
 from app.core.settings import email_settings, settings
 from app.geo.services.geo_info_service import GeoInfoService
 from app.iam.services.module_role_service import ModuleRoleService
-from app.iam.services.module_service import ModuleService
-from app.iam.services.role_service import RoleService
+from app.iam.services.module_service import AsyncModuleService, ModuleService
+from app.iam.services.role_service import AsyncRoleService, RoleService
 from app.iam.services.user_role_service import UserRoleService
-from app.iam.services.user_service import UserService
+from app.iam.services.user_service import AsyncUserService, UserService
 from app.iam.usecases.create_role import CreateRoleUseCase
 from app.iam.usecases.create_user import CreateUserUseCase
 from app.iam.usecases.get_roles_with_modules import GetRolesWithModulesUseCase
 from app.iam.usecases.get_user_with_modules import GetUserWithModulesUseCase
 from app.iam.usecases.get_users_with_roles import GetUsersWithRolesUseCase
+from app.iam.usecases.import_users import ImportUsersUseCase
 from app.iam.usecases.update_role import UpdateRoleUseCase
 from app.iam.usecases.update_user import UpdateUserUseCase
 
@@ -52,31 +63,81 @@ ALGORITHM = settings.jwt_algorithm
 ACCESS_TOKEN_EXPIRE_DAYS = settings.jwt_expiration_time
 
 
+# --- Containers
+# Los servicios sin estado viven en `AppContainer`, construido una vez en el
+# `lifespan`; repositorios, servicios y casos de uso que dependen de la sesión
+# se construyen por petición en `RequestContainer` / `ReadContainer`. Los
+# proveedores son `async def`: FastAPI ejecuta las dependencias síncronas en el
+# threadpool, y estas solo devuelven un atributo del contenedor.
+
+
+async def get_app_container(request: Request) -> AppContainer:
+    container: AppContainer | None = getattr(request.app.state, "container", None)
+    if container is None:
+        # Sin `lifespan` (p. ej. un TestClient fuera de un bloque `with`)
+        container = AppContainer(settings, email_settings)
+        request.app.state.container = container
+    return container
+
+
+AppContainerDep = Annotated[AppContainer, Depends(get_app_container)]
+
+
+async def get_request_container(
+    session: SessionDep, app_container: AppContainerDep
+) -> RequestContainer:
+    return RequestContainer(session, app_container)
+
+
+async def get_read_container(
+    session: ReadSessionDep, app_container: AppContainerDep
+) -> ReadContainer:
+    return ReadContainer(session, app_container)
+
+
+async def get_primary_read_container(
+    session: AsyncSessionDep, app_container: AppContainerDep
+) -> ReadContainer:
+    # Para lecturas cuyo resultado se cachea: una réplica atrasada dejaría
+    # datos viejos en caché hasta la siguiente invalidación
+    return ReadContainer(session, app_container)
+
+
+RequestContainerDep = Annotated[RequestContainer, Depends(get_request_container)]
+ReadContainerDep = Annotated[ReadContainer, Depends(get_read_container)]
+PrimaryReadContainerDep = Annotated[ReadContainer, Depends(get_primary_read_container)]
+
 # --- Repositories
 
 
-def get_user_repository(session: SessionDep) -> UserRepository:
-    return UserRepositoryImpl(session=session)
+async def get_user_repository(container: RequestContainerDep) -> UserRepository:
+    return container.user_repository
 
 
-def get_module_repository(session: SessionDep) -> ModuleRepository:
-    return ModuleRepositoryImpl(session)
+async def get_module_repository(container: RequestContainerDep) -> ModuleRepository:
+    return container.module_repository
 
 
-def get_role_repository(session: SessionDep) -> RoleRepository:
-    return RoleRepositoryImpl(session)
+async def get_role_repository(container: RequestContainerDep) -> RoleRepository:
+    return container.role_repository
 
 
-def get_user_role_repository(session: SessionDep) -> UserRoleRepository:
-    return UserRoleRepositoryImpl(session=session)
+async def get_user_role_repository(
+    container: RequestContainerDep,
+) -> UserRoleRepository:
+    return container.user_role_repository
 
 
-def get_module_role_repository(session: SessionDep) -> ModuleRoleRepository:
-    return ModuleRoleRepositoryImpl(session)
+async def get_module_role_repository(
+    container: RequestContainerDep,
+) -> ModuleRoleRepository:
+    return container.module_role_repository
 
 
-def get_location_repository(session: SessionDep) -> LocationRepository:
-    return LocationRepositoryImpl(session)
+async def get_location_repository(
+    container: RequestContainerDep,
+) -> LocationRepository:
+    return container.location_repository
 
 
 UserRepoDep = Annotated[UserRepository, Depends(get_user_repository)]
@@ -86,59 +147,109 @@ UserRoleRepoDep = Annotated[UserRoleRepository, Depends(get_user_role_repository
 ModuleRoleRepoDep = Annotated[ModuleRoleRepository, Depends(get_module_role_repository)]
 LocationRepoDep = Annotated[LocationRepository, Depends(get_location_repository)]
 
+# --- Async repositories
+# Son de solo lectura y usan réplicas cuando las hay.
+
+
+async def get_async_user_repository(
+    container: ReadContainerDep,
+) -> AsyncUserRepository:
+    return container.user_repository
+
+
+async def get_async_module_repository(
+    container: ReadContainerDep,
+) -> AsyncModuleRepository:
+    return container.module_repository
+
+
+async def get_async_role_repository(
+    container: ReadContainerDep,
+) -> AsyncRoleRepository:
+    return container.role_repository
+
+
+async def get_async_module_role_repository(
+    container: ReadContainerDep,
+) -> AsyncModuleRoleRepository:
+    return container.module_role_repository
+
+
+async def get_primary_user_repository(
+    container: PrimaryReadContainerDep,
+) -> AsyncUserRepository:
+    return container.user_repository
+
+
+async def get_primary_role_repository(
+    container: PrimaryReadContainerDep,
+) -> AsyncRoleRepository:
+    return container.role_repository
+
+
+AsyncUserRepoDep = Annotated[AsyncUserRepository, Depends(get_async_user_repository)]
+AsyncModuleRepoDep = Annotated[
+    AsyncModuleRepository, Depends(get_async_module_repository)
+]
+AsyncRoleRepoDep = Annotated[AsyncRoleRepository, Depends(get_async_role_repository)]
+AsyncModuleRoleRepoDep = Annotated[
+    AsyncModuleRoleRepository, Depends(get_async_module_role_repository)
+]
+# Sobre la base primaria, para lecturas que se guardan en caché
+PrimaryUserRepoDep = Annotated[
+    AsyncUserRepository, Depends(get_primary_user_repository)
+]
+PrimaryRoleRepoDep = Annotated[
+    AsyncRoleRepository, Depends(get_primary_role_repository)
+]
+
 # --- Services
 
 
-def get_google_auth_service() -> GoogleAuthService:
-    return GoogleAuthService(client_id=settings.google_client_id)
+async def get_google_auth_service(
+    app_container: AppContainerDep,
+) -> GoogleAuthService:
+    return app_container.google_auth_service
 
 
-def get_microsoft_auth_service() -> MicrosoftAuthService:
-    return MicrosoftAuthService(
-        client_id=settings.ms_client_id, tenant_id=settings.ms_tenant_id
-    )
+async def get_microsoft_auth_service(
+    app_container: AppContainerDep,
+) -> MicrosoftAuthService:
+    return app_container.microsoft_auth_service
 
 
-def get_auth_service(user_repository: UserRepoDep) -> AuthService:
-    return AuthService(user_repository=user_repository)
+async def get_auth_service(container: RequestContainerDep) -> AuthService:
+    return container.auth_service
 
 
-def get_user_service(user_repository: UserRepoDep) -> UserService:
-    return UserService(user_repository=user_repository)
+async def get_user_service(container: RequestContainerDep) -> UserService:
+    return container.user_service
 
 
-def get_module_service(
-    module_repository: ModuleRepoDep, module_role_repository: ModuleRoleRepoDep
-) -> ModuleService:
-    return ModuleService(
-        module_repository=module_repository,
-        module_role_repository=module_role_repository,
-    )
+async def get_module_service(container: RequestContainerDep) -> ModuleService:
+    return container.module_service
 
 
-def get_role_service(role_repository: RoleRepoDeb) -> RoleService:
-    return RoleService(role_repository=role_repository)
+async def get_role_service(container: RequestContainerDep) -> RoleService:
+    return container.role_service
 
 
-def get_user_role_service(user_role_repository: UserRoleRepoDep) -> UserRoleService:
-    return UserRoleService(user_role_repository=user_role_repository)
+async def get_user_role_service(container: RequestContainerDep) -> UserRoleService:
+    return container.user_role_service
 
 
-def get_module_role_service(
-    module_role_repository: ModuleRoleRepoDep,
+async def get_module_role_service(
+    container: RequestContainerDep,
 ) -> ModuleRoleService:
-    return ModuleRoleService(module_role_repository=module_role_repository)
+    return container.module_role_service
 
 
-def get_email_service() -> EmailService:
-    return EmailService(ConnectionConfig(**email_settings.model_dump()))
+async def get_email_service(app_container: AppContainerDep) -> EmailService:
+    return app_container.email_service
 
 
-def get_geo_info_service() -> GeoInfoService:
-    return GeoInfoService(
-        base_url=settings.geo_info_service_url,
-        api_key=settings.geo_info_service_api_key,
-    )
+async def get_geo_info_service(app_container: AppContainerDep) -> GeoInfoService:
+    return app_container.geo_info_service
 
 
 AuthServiceDep = Annotated[AuthService, Depends(get_auth_service)]
@@ -154,60 +265,75 @@ MicrosoftAuthServiceDep = Annotated[
 EmailServiceDep = Annotated[EmailService, Depends(get_email_service)]
 GeoInfoServiceDep = Annotated[GeoInfoService, Depends(get_geo_info_service)]
 
+# --- Async services
+
+
+async def get_async_user_service(container: ReadContainerDep) -> AsyncUserService:
+    return container.user_service
+
+
+async def get_async_module_service(
+    container: ReadContainerDep,
+) -> AsyncModuleService:
+    return container.module_service
+
+
+async def get_async_role_service(container: ReadContainerDep) -> AsyncRoleService:
+    return container.role_service
+
+
+AsyncUserServiceDep = Annotated[AsyncUserService, Depends(get_async_user_service)]
+AsyncModuleServiceDep = Annotated[AsyncModuleService, Depends(get_async_module_service)]
+AsyncRoleServiceDep = Annotated[AsyncRoleService, Depends(get_async_role_service)]
+
 
 # --- Usecases
-def get_get_user_with_modules_use_case(
-    user_service: UserServiceDep,
-    module_service: ModuleServiceDep,
-    role_service: RoleServiceDep,
+async def get_get_user_with_modules_use_case(
+    container: PrimaryReadContainerDep,
 ) -> GetUserWithModulesUseCase:
-    return GetUserWithModulesUseCase(user_service, module_service, role_service)
+    return container.get_user_with_modules_use_case
 
 
-def get_get_users_with_roles_use_case(
-    user_service: UserServiceDep,
-    role_service: RoleServiceDep,
+async def get_get_users_with_roles_use_case(
+    container: ReadContainerDep,
 ) -> GetUsersWithRolesUseCase:
-    return GetUsersWithRolesUseCase(user_service, role_service)
+    return container.get_users_with_roles_use_case
 
 
-def get_create_user_use_case(
-    user_service: UserServiceDep,
-    role_service: RoleServiceDep,
-    user_role_service: UserRoleServiceDep,
+async def get_create_user_use_case(
+    container: RequestContainerDep,
 ) -> CreateUserUseCase:
-    return CreateUserUseCase(user_service, role_service, user_role_service)
+    return container.create_user_use_case
 
 
-def get_update_user_use_case(
-    user_service: UserServiceDep,
-    role_service: RoleServiceDep,
-    user_role_service: UserRoleServiceDep,
+async def get_update_user_use_case(
+    container: RequestContainerDep,
 ) -> UpdateUserUseCase:
-    return UpdateUserUseCase(user_service, role_service, user_role_service)
+    return container.update_user_use_case
+
 
+async def get_import_users_use_case(
+    container: RequestContainerDep,
+) -> ImportUsersUseCase:
+    return container.import_users_use_case
 
-def get_create_role_use_case(
-    role_service: RoleServiceDep,
-    module_service: ModuleServiceDep,
-    module_role_service: ModuleRoleServiceDep,
+
+async def get_create_role_use_case(
+    container: RequestContainerDep,
 ) -> CreateRoleUseCase:
-    return CreateRoleUseCase(role_service, module_service, module_role_service)
+    return container.create_role_use_case
 
 
-def get_update_role_use_case(
-    role_service: RoleServiceDep,
-    module_service: ModuleServiceDep,
-    module_role_service: ModuleRoleServiceDep,
+async def get_update_role_use_case(
+    container: RequestContainerDep,
 ) -> UpdateRoleUseCase:
-    return UpdateRoleUseCase(role_service, module_service, module_role_service)
+    return container.update_role_use_case
 
 
-def get_get_roles_with_modules_use_case(
-    role_service: RoleServiceDep,
-    module_service: ModuleServiceDep,
+async def get_get_roles_with_modules_use_case(
+    container: ReadContainerDep,
 ) -> GetRolesWithModulesUseCase:
-    return GetRolesWithModulesUseCase(role_service, module_service)
+    return container.get_roles_with_modules_use_case
 
 
 GetModulesWithUseCaseDep = Annotated[
@@ -221,44 +347,175 @@ GetRolesWithModulesUseCaseDep = Annotated[
 ]
 CreateUserUseCaseDep = Annotated[CreateUserUseCase, Depends(get_create_user_use_case)]
 UpdateUserUseCaseDep = Annotated[UpdateUserUseCase, Depends(get_update_user_use_case)]
+ImportUsersUseCaseDep = Annotated[
+    ImportUsersUseCase, Depends(get_import_users_use_case)
+]
 CreateRoleUseCaseDep = Annotated[CreateRoleUseCase, Depends(get_create_role_use_case)]
 UpdateRoleUseCaseDep = Annotated[UpdateRoleUseCase, Depends(get_update_role_use_case)]
 
 # --- Security
 
 
-def validate_token(token: Annotated[str, Depends(oauth2_scheme)]) -> dict[str, Any]:
+def decode_access_token(token: str) -> dict[str, Any]:
+    digest, payload = _decode_cached(token)
+
+    # Los tokens emitidos antes de los refresh tokens no tienen `jti`
+    jti: str | None = payload.get("jti")
+    if jti is not None and revocation_store.is_revoked(jti):
+        token_cache.revoke(digest, payload)
+        raise get_credentials_exception("Token revocado")
+
+    return payload
+
+
+async def decode_access_token_async(token: str) -> dict[str, Any]:
+    """
+    Igual que `decode_access_token`, pero consulta la revocación con el
+    cliente asíncrono de Redis para no bloquear el event loop.
+    """
+    digest, payload = _decode_cached(token)
+
+    jti: str | None = payload.get("jti")
+    if jti is not None and await revocation_store.is_revoked_async(jti):
+        token_cache.revoke(digest, payload)
+        raise get_credentials_exception("Token revocado")
+
+    return payload
+
+
+def _decode_cached(token: str) -> tuple[str, dict[str, Any]]:
+    digest = token_digest(token)
+    if token_cache.is_revoked(digest):
+        raise get_credentials_exception("Token invalido")
+
+    payload = token_cache.get(digest)
+    if payload is None:
+        payload = _verify_access_token(token)
+        token_cache.set(digest, payload)
+
+    return digest, payload
+
+
+def _verify_access_token(token: str) -> dict[str, Any]:
     try:
+        start = time.perf_counter()
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
+        JWT_DECODE_DURATION.observe(time.perf_counter() - start)
+
         username: str | None = payload.get("sub")
         if username is None:
             raise get_credentials_exception()
 
+        if payload.get("type", ACCESS_TOKEN_TYPE) != ACCESS_TOKEN_TYPE:
+            raise get_credentials_exception("Token invalido")
+
         return payload
     except InvalidTokenError:
         print(traceback.format_exc())
         raise get_credentials_exception("Token invalido")
 
 
+async def validate_token(
+    token: Annotated[str, Depends(oauth2_scheme)],
+) -> dict[str, Any]:
+    # Decodificar el JWT toma microsegundos; como dependencia `async` se evita
+    # ocupar un hilo del threadpool en cada petición autenticada.
+    return await decode_access_token_async(token)
+
+
 ValidTokenDep = Annotated[dict[str, Any], Depends(validate_token)]
 
 
-def get_current_user(payload: ValidTokenDep, user_repository: UserRepoDep) -> DbUser:
+async def get_current_user(
+    payload: ValidTokenDep, user_repository: PrimaryUserRepoDep
+) -> UserBase:
     username: str | None = payload.get("sub")
     if username is None:
         raise get_credentials_exception()
 
-    user = user_repository.get_user_by_email(username)
+    user = await user_cache.get(username)
+    if user is not None:
+        return user
+
+    # Desde la primaria: tras una invalidación, una réplica atrasada volvería a
+    # llenar la caché con el usuario anterior al cambio
+    user = await user_cache.load(username, user_repository.get_user_by_email)
     if user is None:
         raise get_credentials_exception()
 
     return user
 
 
-CurrentUserDep = Annotated[DbUser, Depends(get_current_user)]
+CurrentUserDep = Annotated[UserBase, Depends(get_current_user)]
 
 
-def get_current_active_user(current_user: CurrentUserDep) -> DbUser:
+def get_current_active_user(current_user: CurrentUserDep) -> UserBase:
     if not current_user.active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+
+def require_module(module_path: str) -> Any:
+    """
+    Dependencia que exige que los roles del usuario otorguen el módulo con el
+    `path` indicado. La decisión se toma con el índice en memoria de
+    `module_index`, sin consultar la base de datos mientras los claims del token
+    estén vigentes.
+    """
+
+    async def check_module_access(
+        payload: ValidTokenDep,
+        user_repository: PrimaryUserRepoDep,
+        role_repository: PrimaryRoleRepoDep,
+    ) -> None:
+        if not settings.module_authorization_enabled:
+            return
+
+        token_version = payload.get("pv")
+        if not module_index.is_current(token_version):
+            await run_in_threadpool(module_index.ensure_current, token_version)
+            module_index.start_listener()
+
+        role_ids = await _resolve_role_ids(payload, user_repository, role_repository)
+        if not module_index.allows(role_ids, module_path):
+            MODULE_AUTHORIZATION_DECISIONS.inc(module_path, "deny")
+            raise get_forbidden_exception(
+                "No tiene permisos para acceder a este módulo"
+            )
+
+        MODULE_AUTHORIZATION_DECISIONS.inc(module_path, "allow")
+
+    return Depends(check_module_access)
+
+
+async def _resolve_role_ids(
+    payload: dict[str, Any],
+    user_repository: AsyncUserRepository,
+    role_repository: AsyncRoleRepository,
+) -> list[int]:
+    version = module_index.version
+    if version is not None and payload.get("pv") == version:
+        role_ids: list[int] | None = payload.get("roles")
+        if role_ids is not None:
+            return role_ids
+
+    # Token anterior al último cambio de permisos (o sin claims). Los roles se
+    # leen de la primaria: una réplica atrasada guardaría los roles viejos bajo
+    # la versión nueva hasta que expire la clave.
+    user = await get_current_user(payload, user_repository)
+    if user.id is None:
+        raise get_credentials_exception()
+
+    if version is not None:
+        role_ids = await permission_cache.get_user_role_ids(version, user.id)
+        if role_ids is not None:
+            return role_ids
+
+    roles = await role_repository.get_roles_by_user_id(user.id)
+    role_ids = [role.id for role in roles if role.id is not None]
+    if version is not None:
+        await permission_cache.set_user_role_ids(version, user.id, role_ids)
+    return role_ids
+
+
+ListQueryDep = Annotated[ListQuery, Query()]
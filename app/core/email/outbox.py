@@ -0,0 +1,146 @@
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+import redis
+import redis.asyncio
+from pydantic import BaseModel, Field, ValidationError
+
+from app.core.database.redis import get_async_redis_client
+from app.core.settings import settings
+
+OUTBOX_DUE_KEY = "email:outbox:due"
+OUTBOX_MESSAGES_KEY = "email:outbox:messages"
+OUTBOX_DEAD_KEY = "email:outbox:dead"
+
+
+class OutboxMessage(BaseModel):
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    template: str
+    subject: str
+    recipients: list[str]
+    context: dict[str, Any] = {}
+    attempts: int = 0
+    last_error: str | None = None
+
+
+class EmailOutbox:
+    """
+    Cola de correos pendientes en Redis.
+
+    Cada mensaje se guarda en `OUTBOX_MESSAGES_KEY` y su id en el sorted set
+    `OUTBOX_DUE_KEY` con el momento en que debe enviarse. Al reclamarlo el
+    worker mueve ese momento `lease` segundos al futuro: si el proceso muere
+    antes de confirmar el envío, el mensaje vuelve a quedar disponible para
+    cualquier worker. Los que agotan sus intentos pasan a `OUTBOX_DEAD_KEY`.
+    """
+
+    def __init__(
+        self,
+        lease: float,
+        async_redis_factory: Callable[[], redis.asyncio.Redis] = get_async_redis_client,
+    ):
+        self.lease = lease
+        self.async_redis_factory = async_redis_factory
+
+    async def enqueue(
+        self,
+        template: str,
+        subject: str,
+        recipients: list[str],
+        context: dict[str, Any],
+    ) -> OutboxMessage:
+        message = OutboxMessage(
+            template=template, subject=subject, recipients=recipients, context=context
+        )
+        await self.enqueue_many([message])
+        return message
+
+    async def enqueue_many(self, messages: list[OutboxMessage]) -> None:
+        if not messages:
+            return
+
+        now = time.time()
+        pipeline = self.async_redis_factory().pipeline(transaction=True)
+        pipeline.hset(
+            OUTBOX_MESSAGES_KEY,
+            mapping={message.id: message.model_dump_json() for message in messages},
+        )
+        pipeline.zadd(OUTBOX_DUE_KEY, {message.id: now for message in messages})
+        await pipeline.execute()
+
+    async def claim(self, limit: int) -> list[OutboxMessage]:
+        client = self.async_redis_factory()
+        async with client.pipeline(transaction=True) as pipeline:
+            while True:
+                try:
+                    await pipeline.watch(OUTBOX_DUE_KEY)
+                    now = time.time()
+                    ids: list[str] = await pipeline.zrangebyscore(
+                        OUTBOX_DUE_KEY, "-inf", now, start=0, num=limit
+                    )
+                    if not ids:
+                        await pipeline.unwatch()
+                        return []
+
+                    pipeline.multi()
+                    pipeline.zadd(
+                        OUTBOX_DUE_KEY, {id: now + self.lease for id in ids}, xx=True
+                    )
+                    pipeline.hmget(OUTBOX_MESSAGES_KEY, ids)
+                    _, data = await pipeline.execute()
+                    break
+                except redis.WatchError:
+                    # Otro worker reclamó o se encoló algo entre tanto
+                    continue
+
+        messages: list[OutboxMessage] = []
+        missing: list[str] = []
+        invalid: dict[str, str] = {}
+        for id, item in zip(ids, data):
+            if item is None:
+                # Ya confirmado por otro worker tras la lectura, o huérfano
+                missing.append(id)
+                continue
+            try:
+                messages.append(OutboxMessage.model_validate_json(item))
+            except ValidationError as e:
+                logging.error(
+                    f"Se descarta el correo {id} del outbox, no es válido: {e}"
+                )
+                invalid[id] = item
+
+        if missing or invalid:
+            # Sin esto quedarían en la cola y se reclamarían en cada lote
+            pipeline = client.pipeline(transaction=True)
+            pipeline.zrem(OUTBOX_DUE_KEY, *missing, *invalid)
+            if invalid:
+                pipeline.hdel(OUTBOX_MESSAGES_KEY, *invalid)
+                pipeline.rpush(OUTBOX_DEAD_KEY, *invalid.values())
+            await pipeline.execute()
+
+        return messages
+
+    async def ack(self, message: OutboxMessage) -> None:
+        pipeline = self.async_redis_factory().pipeline(transaction=True)
+        pipeline.zrem(OUTBOX_DUE_KEY, message.id)
+        pipeline.hdel(OUTBOX_MESSAGES_KEY, message.id)
+        await pipeline.execute()
+
+    async def retry(self, message: OutboxMessage, delay: float) -> None:
+        pipeline = self.async_redis_factory().pipeline(transaction=True)
+        pipeline.hset(OUTBOX_MESSAGES_KEY, message.id, message.model_dump_json())
+        pipeline.zadd(OUTBOX_DUE_KEY, {message.id: time.time() + delay})
+        await pipeline.execute()
+
+    async def dead_letter(self, message: OutboxMessage) -> None:
+        pipeline = self.async_redis_factory().pipeline(transaction=True)
+        pipeline.zrem(OUTBOX_DUE_KEY, message.id)
+        pipeline.hdel(OUTBOX_MESSAGES_KEY, message.id)
+        pipeline.rpush(OUTBOX_DEAD_KEY, message.model_dump_json())
+        await pipeline.execute()
+
+
+email_outbox = EmailOutbox(lease=settings.email_outbox_lease)
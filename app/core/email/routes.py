@@ -0,0 +1,34 @@
+import hmac
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header
+
+from app.core.dependencies import AppContainerDep
+from app.core.exceptions import get_forbidden_exception, get_unauthorized_exception
+from app.core.settings import settings
+
+
+def require_cron_secret(authorization: Annotated[str | None, Header()] = None) -> None:
+    # Vercel envía `Authorization: Bearer $CRON_SECRET` en cada ejecución del cron
+    if not settings.cron_secret:
+        raise get_forbidden_exception("El drenado del outbox no está habilitado")
+
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.encode(), settings.cron_secret.encode()
+    ):
+        raise get_unauthorized_exception()
+
+
+email_outbox_router = APIRouter(
+    prefix="/internal/email-outbox",
+    tags=["internal"],
+    include_in_schema=False,
+    dependencies=[Depends(require_cron_secret)],
+)
+
+
+# GET porque así llama el cron de Vercel; POST para cualquier otro disparador
+@email_outbox_router.api_route("/drain", methods=["GET", "POST"])
+async def drain_email_outbox(container: AppContainerDep) -> dict[str, int]:
+    return {"processed": await container.drain_email_outbox()}
@@ -1,58 +1,54 @@
-import traceback
+import logging
 
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
 from pydantic import EmailStr
 
+from app.core.email.outbox import EmailOutbox, OutboxMessage
+from app.core.models.user import UserBase
 from app.core.settings import settings
 
 
 class EmailService:
-    def __init__(self, email_settings: ConnectionConfig) -> None:
-        self.fm = FastMail(email_settings)
+    """
+    Encola los correos en el outbox; el envío lo hace `EmailOutboxWorker` en
+    segundo plano para que las rutas no esperen al servidor SMTP.
+    """
+
+    def __init__(self, outbox: EmailOutbox) -> None:
+        self.outbox = outbox
 
     async def send_welcome_email(
         self, recipient: EmailStr, full_name: str, token: str
     ) -> None:
         try:
-            email_body = f"""
-                <html>
-                <body style="font-family: 'Segoe UI', Roboto, sans-serif; background-color: #f4f4f7; padding: 30px; color: #333;">
-                    <table width="100%%" cellspacing="0" cellpadding="0" style="max-width: 600px; margin: auto; background-color: #fff; border-radius: 10px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
-                    <tr>
-                        <td style="padding: 30px; text-align: center;">
-                        <h2 style="color: #2E86C1;">👋 ¡Hola, {full_name}!</h2>
-                        <p style="font-size: 16px; line-height: 1.5;">
-                            Has sido invitado a formar parte del <strong>Sistema Inteligente de Gestión de Semáforos</strong>.
-                        </p>
-                        <p style="font-size: 16px; line-height: 1.5;">
-                            Para activar tu cuenta y establecer tu contraseña, haz clic en el siguiente botón:
-                        </p>
-                        <a href="{settings.change_password_url}/change-password?token={token}"
-                            style="display: inline-block; margin-top: 20px; padding: 12px 24px; background-color: #2E86C1; color: #fff; text-decoration: none; border-radius: 6px; font-weight: bold;">
-                            🔗 Activar mi cuenta
-                        </a>
-                        <p style="margin-top: 30px; font-size: 14px; color: #777;">
-                            Si no esperabas este correo, simplemente ignóralo.
-                        </p>
-                        </td>
-                    </tr>
-                    </table>
-                    <p style="text-align: center; margin-top: 20px; font-size: 12px; color: #aaa;">
-                    © 2025 Smart City Traffic System — Todos los derechos reservados
-                    </p>
-                </body>
-                </html>
-                """
-
-            # Mensaje HTML
-            message = MessageSchema(
-                subject="Bienvenido al Sistema de Gestión de Semáforos",
-                recipients=[recipient],  # type: ignore
-                body=email_body,
-                subtype=MessageType.html,  # ✅ Enviar como HTML
+            await self.outbox.enqueue_many(
+                [_welcome_message(recipient, full_name, token)]
             )
-
-            await self.fm.send_message(message)
-
-        except Exception:
-            print(traceback.print_exc())
+        except Exception as e:
+            logging.error(f"No se pudo encolar el correo de bienvenida: {e}")
+
+    async def send_welcome_emails(self, users: list[UserBase]) -> None:
+        """
+        Encola las invitaciones de varios usuarios en una sola escritura.
+        """
+        messages = [
+            _welcome_message(user.email, user.name, user.update_password_uuid)
+            for user in users
+            if user.update_password_uuid is not None
+        ]
+        try:
+            await self.outbox.enqueue_many(messages)
+        except Exception as e:
+            logging.error(f"No se pudieron encolar los correos de bienvenida: {e}")
+
+
+def _welcome_message(recipient: str, full_name: str, token: str) -> OutboxMessage:
+    return OutboxMessage(
+        template="welcome.html",
+        subject="Bienvenido al Sistema de Gestión de Semáforos",
+        recipients=[recipient],
+        context={
+            "full_name": full_name,
+            "change_password_url": settings.change_password_url,
+            "token": token,
+        },
+    )
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+
+import redis
+
+from app.core.email.outbox import EmailOutbox, OutboxMessage
+from app.core.email.services.smtp_sender import SmtpSender
+from app.core.email.templates import EmailTemplates
+from app.core.metrics.registry import registry
+
+EMAIL_OUTBOX_DELIVERIES = registry.counter(
+    "email_outbox_deliveries_total",
+    "Correos procesados por el outbox por resultado (sent, retry, dead)",
+    labels=("result",),
+)
+
+
+class EmailOutboxWorker:
+    """
+    Drena el outbox en lotes de `batch_size` por una sola conexión SMTP.
+
+    Un envío fallido se reintenta tras `retry_backoff * 2^intentos` segundos;
+    al llegar a `max_attempts` el mensaje pasa a la cola de descartados.
+    """
+
+    def __init__(
+        self,
+        outbox: EmailOutbox,
+        sender: SmtpSender,
+        templates: EmailTemplates,
+        batch_size: int = 20,
+        max_attempts: int = 5,
+        retry_backoff: float = 30,
+        poll_interval: float = 1.0,
+    ):
+        self.outbox = outbox
+        self.sender = sender
+        self.templates = templates
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.poll_interval = poll_interval
+        self._task: asyncio.Task | None = None
+        self._stopped = asyncio.Event()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopped.clear()
+            self._task = asyncio.create_task(self.run(), name="email-outbox")
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.sender.close()
+
+    async def run(self) -> None:
+        failing = False
+        while not self._stopped.is_set():
+            try:
+                processed = await self.drain_once()
+                failing = False
+            except redis.RedisError as e:
+                if not failing:
+                    logging.warning(f"No se pudo leer el outbox de correos: {e}")
+                failing = True
+                processed = 0
+            except Exception as e:
+                logging.error(f"Falló el worker del outbox de correos: {e}")
+                processed = 0
+
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(
+                        self._stopped.wait(), timeout=self.poll_interval
+                    )
+                except TimeoutError:
+                    pass
+
+    async def drain(self, max_batches: int) -> int:
+        """
+        Drena hasta `max_batches` lotes o hasta vaciar los mensajes vencidos.
+        """
+        total = 0
+        for _ in range(max_batches):
+            processed = await self.drain_once()
+            total += processed
+            if processed < self.batch_size:
+                break
+        return total
+
+    async def drain_once(self) -> int:
+        messages = await self.outbox.claim(self.batch_size)
+        for message in messages:
+            await self._deliver(message)
+        return len(messages)
+
+    async def _deliver(self, message: OutboxMessage) -> None:
+        try:
+            html = self.templates.render(message.template, message.context)
+            await self.sender.send(
+                self.sender.build_message(message.subject, message.recipients, html)
+            )
+        except Exception as e:
+            message.attempts += 1
+            message.last_error = str(e)
+            if message.attempts >= self.max_attempts:
+                logging.error(
+                    f"Se descarta el correo {message.id} a {message.recipients} "
+                    f"tras {message.attempts} intentos: {e}"
+                )
+                await self.outbox.dead_letter(message)
+                EMAIL_OUTBOX_DELIVERIES.inc("dead")
+            else:
+                delay = self.retry_backoff * 2 ** (message.attempts - 1)
+                logging.warning(
+                    f"No se pudo enviar el correo {message.id}, "
+                    f"se reintenta en {delay}s: {e}"
+                )
+                await self.outbox.retry(message, delay)
+                EMAIL_OUTBOX_DELIVERIES.inc("retry")
+            return
+
+        await self.outbox.ack(message)
+        EMAIL_OUTBOX_DELIVERIES.inc("sent")
@@ -0,0 +1,85 @@
+import time
+from email.message import EmailMessage
+from email.utils import formataddr
+
+import aiosmtplib
+
+from app.core.email.models.email import EmailSettings
+
+
+class SmtpSender:
+    """
+    Envía correos por una conexión SMTP que se mantiene abierta entre envíos.
+    Se reconecta si el servidor la cerró o si pasó `idle_timeout` sin usarla,
+    porque los servidores suelen cortar las conexiones ociosas sin avisar.
+    """
+
+    def __init__(self, email_settings: EmailSettings, idle_timeout: float = 60):
+        self.email_settings = email_settings
+        self.idle_timeout = idle_timeout
+        self.connections = 0
+        self._smtp: aiosmtplib.SMTP | None = None
+        self._last_used = 0.0
+
+    def build_message(
+        self, subject: str, recipients: list[str], html: str
+    ) -> EmailMessage:
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = formataddr(
+            (self.email_settings.MAIL_FROM_NAME, str(self.email_settings.MAIL_FROM))
+        )
+        message["To"] = ", ".join(recipients)
+        message.set_content(html, subtype="html")
+        return message
+
+    async def send(self, message: EmailMessage) -> None:
+        smtp = await self._get_connection()
+        try:
+            await smtp.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            # La conexión se cerró entre envíos: se reintenta con una nueva
+            await self.close()
+            smtp = await self._get_connection()
+            await smtp.send_message(message)
+        except (aiosmtplib.SMTPConnectError, OSError):
+            await self.close()
+            raise
+        self._last_used = time.monotonic()
+
+    async def close(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None and smtp.is_connected:
+            try:
+                await smtp.quit()
+            except aiosmtplib.SMTPException:
+                smtp.close()
+
+    async def _get_connection(self) -> aiosmtplib.SMTP:
+        if self._smtp is not None and (
+            not self._smtp.is_connected
+            or time.monotonic() - self._last_used > self.idle_timeout
+        ):
+            await self.close()
+
+        if self._smtp is None:
+            settings = self.email_settings
+            smtp = aiosmtplib.SMTP(
+                hostname=settings.MAIL_SERVER,
+                port=settings.MAIL_PORT,
+                use_tls=settings.MAIL_SSL_TLS,
+                start_tls=settings.MAIL_STARTTLS,
+                validate_certs=settings.VALIDATE_CERTS,
+            )
+            await smtp.connect()
+            if settings.USE_CREDENTIALS:
+                try:
+                    await smtp.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
+                except aiosmtplib.SMTPException:
+                    smtp.close()
+                    raise
+            self._smtp = smtp
+            self._last_used = time.monotonic()
+            self.connections += 1
+
+        return self._smtp
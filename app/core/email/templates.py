@@ -0,0 +1,28 @@
+from pathlib import Path
+from typing import Any
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+DEFAULT_TEMPLATE_FOLDER = Path(__file__).resolve().parents[2] / "templates" / "email"
+
+
+class EmailTemplates:
+    """
+    Plantillas Jinja de los correos, compiladas una sola vez al construirse.
+    Sin `folder` se usan las de `app/templates/email`.
+    """
+
+    def __init__(self, folder: str | Path = ""):
+        self.folder = Path(folder) if folder else DEFAULT_TEMPLATE_FOLDER
+        self.env = Environment(
+            loader=FileSystemLoader(self.folder),
+            autoescape=select_autoescape(["html"]),
+            # Las plantillas no cambian con la app corriendo
+            auto_reload=False,
+            cache_size=-1,
+        )
+        for name in self.env.list_templates(extensions=["html"]):
+            self.env.get_template(name)
+
+    def render(self, name: str, context: dict[str, Any]) -> str:
+        return self.env.get_template(name).render(context)
@@ -55,6 +55,16 @@ def get_internal_server_error_exception(
     )
 
 
+def get_service_unavailable_exception(
+    message: str = "Service unavailable", retry_after: int = 1
+) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=message,
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
 def get_credentials_exception(
     message: str = "Could not validate credentials",
 ) -> HTTPException:
@@ -0,0 +1,76 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Optional, Sequence
+
+from fastapi import Response
+from pydantic import BaseModel, Field, create_model, field_validator
+
+from app.core.exceptions import get_bad_request_exception
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class ListQuery(BaseModel):
+    """
+    Parámetros comunes de los listados: paginación por cursor (`after_id`),
+    proyección de columnas (`fields`) y filtros que se aplican en SQL.
+    """
+
+    after_id: int | None = None
+    limit: int = Field(default=100, ge=1, le=500)
+    fields: list[str] | None = None
+    active: bool | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    search: str | None = None
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def split_fields(cls, value: Any) -> Any:
+        # Acepta `fields=id,name` y `fields=id&fields=name`
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = [value]
+        return [
+            field.strip()
+            for item in value
+            for field in item.split(",")
+            if field.strip()
+        ]
+
+    def columns(self, model: type[BaseModel]) -> list[str]:
+        """
+        Columnas a seleccionar de `model`. `id` siempre se incluye porque es
+        el cursor de la siguiente página.
+        """
+        if not self.fields:
+            return list(model.model_fields)
+
+        unknown = [field for field in self.fields if field not in model.model_fields]
+        if unknown:
+            raise get_bad_request_exception(f"Campos no válidos: {', '.join(unknown)}")
+
+        return ["id", *(field for field in dict.fromkeys(self.fields) if field != "id")]
+
+
+@lru_cache
+def partial_model(model: type[BaseModel]) -> type[BaseModel]:
+    """
+    Copia de `model` con todos los campos opcionales. Con
+    `response_model_exclude_unset` la respuesta trae solo las columnas
+    seleccionadas.
+    """
+    return create_model(
+        f"{model.__name__}Fields",
+        **{
+            name: (Optional[info.annotation], None)
+            for name, info in model.model_fields.items()
+        },
+    )  # type: ignore
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int) -> None:
+    # Una página completa indica que puede haber más filas
+    if len(items) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(items[-1].id)
@@ -0,0 +1,145 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.database.instrumentation import QueryStats, track_queries
+from app.core.metrics.registry import registry
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Latencia de las peticiones HTTP por ruta",
+    labels=("method", "route"),
+)
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total",
+    "Peticiones HTTP por ruta y código de estado",
+    labels=("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress",
+    "Peticiones HTTP en curso",
+)
+DB_QUERIES_PER_REQUEST = registry.histogram(
+    "db_queries_per_request",
+    "Sentencias SQL ejecutadas por petición",
+    labels=("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_TIME_PER_REQUEST = registry.histogram(
+    "db_time_per_request_seconds",
+    "Tiempo total en base de datos por petición",
+    labels=("route",),
+)
+DB_REPEATED_STATEMENTS = registry.counter(
+    "db_repeated_statements_total",
+    "Peticiones con sentencias SQL repetidas (posible N+1)",
+    labels=("route",),
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _route_path(scope: Scope) -> str:
+    return getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """
+    Registra latencia y código de estado por plantilla de ruta
+    (`/api/iam/users/{user_id}`), nunca por la URL concreta.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+
+            route_path = _route_path(scope)
+            method = scope["method"]
+            HTTP_REQUEST_DURATION.observe(elapsed, method, route_path)
+            HTTP_REQUESTS.inc(method, route_path, str(status_code))
+
+
+class QueryStatsMiddleware:
+    """
+    Cuenta las sentencias SQL y el tiempo en base de datos de cada petición,
+    y los expone en el header `Server-Timing` y en las métricas.
+
+    Con `detect_repeated_statements` se registra un warning cuando una misma
+    sentencia se ejecuta varias veces en la misma petición (posible N+1).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        detect_repeated_statements: bool = False,
+        repeated_statement_threshold: int = 2,
+    ):
+        self.app = app
+        self.detect_repeated_statements = detect_repeated_statements
+        self.repeated_statement_threshold = repeated_statement_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"',
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self._record(scope, stats)
+
+    def _record(self, scope: Scope, stats: QueryStats) -> None:
+        route_path = _route_path(scope)
+        DB_QUERIES_PER_REQUEST.observe(stats.count, route_path)
+        if stats.count:
+            DB_TIME_PER_REQUEST.observe(stats.duration, route_path)
+
+        if not self.detect_repeated_statements:
+            return
+
+        repeated = stats.repeated_statements(self.repeated_statement_threshold)
+        if not repeated:
+            return
+
+        DB_REPEATED_STATEMENTS.inc(route_path)
+        for statement, times in repeated:
+            logging.warning(
+                "Posible N+1 en %s %s: sentencia ejecutada %d veces: %s",
+                scope["method"],
+                route_path,
+                times,
+                " ".join(statement.split()),
+            )
@@ -0,0 +1,223 @@
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+class _ThreadShards:
+    """
+    Per-thread storage for metric values.
+
+    Each thread only ever writes to its own shard, so recording never takes a
+    lock. Shards are summed when the metrics are rendered.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._shards: list[dict] = []
+
+    def current(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            self._local.shard = shard
+            self._shards.append(shard)
+        return shard
+
+    def snapshot(self) -> list[dict]:
+        return [dict(shard) for shard in list(self._shards)]
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [
+        f'{name}="{_escape(str(value))}"'
+        for name, value in zip(names, values, strict=True)
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        self._shards = _ThreadShards()
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        shard = self._shards.current()
+        shard[label_values] = shard.get(label_values, 0.0) + amount
+
+    def values(self) -> dict[LabelValues, float]:
+        totals: dict[LabelValues, float] = {}
+        for shard in self._shards.snapshot():
+            for label_values, value in shard.items():
+                totals[label_values] = totals.get(label_values, 0.0) + value
+        return totals
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for label_values, value in sorted(self.values().items()):
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """
+    Gauge built from per-thread increments, optionally completed with
+    callbacks that read the current value when the metrics are rendered.
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._callbacks: list[Callable[[], dict[LabelValues, float]]] = []
+
+    def dec(self, *label_values: str, amount: float = 1.0) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def set_function(self, callback: Callable[[], dict[LabelValues, float]]) -> None:
+        self._callbacks.append(callback)
+
+    def values(self) -> dict[LabelValues, float]:
+        totals = super().values()
+        for callback in self._callbacks:
+            for label_values, value in callback().items():
+                totals[label_values] = totals.get(label_values, 0.0) + value
+        return totals
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *label_values: str) -> None:
+        shard = self._shards.current()
+        state = shard.get(label_values)
+        if state is None:
+            # One slot per bucket plus +Inf, then sum and count.
+            state = [0.0] * (len(self.buckets) + 3)
+            shard[label_values] = state
+        state[bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def values(self) -> dict[LabelValues, list[float]]:
+        totals: dict[LabelValues, list[float]] = {}
+        for shard in self._shards.snapshot():
+            for label_values, state in shard.items():
+                current = totals.setdefault(label_values, [0.0] * len(state))
+                for index, value in enumerate(list(state)):
+                    current[index] += value
+        return totals
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        bounds = [*self.buckets, float("inf")]
+        for label_values, state in sorted(self.values().items()):
+            cumulative = 0.0
+            for bound, count in zip(bounds, state, strict=False):
+                cumulative += count
+                labels = _format_labels(
+                    (*self.label_names, "le"), (*label_values, _format_value(bound))
+                )
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(state[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labels: tuple[str, ...] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labels))  # type: ignore[return-value]
+
+    def gauge(
+        self, name: str, documentation: str, labels: tuple[str, ...] = ()
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, labels))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
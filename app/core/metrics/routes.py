@@ -0,0 +1,38 @@
+from anyio import to_thread
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics.registry import registry
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+THREADPOOL_THREADS = registry.gauge(
+    "threadpool_threads",
+    "Hilos del threadpool de Starlette por estado",
+    labels=("state",),
+)
+
+metrics_router = APIRouter(tags=["metrics"])
+
+
+def _threadpool_state() -> dict[tuple[str, ...], float]:
+    try:
+        limiter = to_thread.current_default_thread_limiter()
+    except RuntimeError:
+        # Rendered outside of the event loop (e.g. from a test); nothing to report.
+        return {}
+
+    statistics = limiter.statistics()
+    return {
+        ("busy",): statistics.borrowed_tokens,
+        ("limit",): statistics.total_tokens,
+        ("waiting",): statistics.tasks_waiting,
+    }
+
+
+THREADPOOL_THREADS.set_function(_threadpool_state)
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,47 @@
+import functools
+import inspect
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.core.metrics.registry import Histogram
+
+
+def timed(histogram: Histogram, *label_values: str) -> Callable:
+    """
+    Decorador que observa la duración de la función (síncrona o asíncrona)
+    en `histogram`, agregando la etiqueta `outcome` con `ok` o `error`.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                outcome = "error"
+                try:
+                    result = await fn(*args, **kwargs)
+                    outcome = "ok"
+                    return result
+                finally:
+                    histogram.observe(
+                        time.perf_counter() - start, *label_values, outcome
+                    )
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                result = fn(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                histogram.observe(time.perf_counter() - start, *label_values, outcome)
+
+        return wrapper
+
+    return decorator
@@ -1,3 +1,4 @@
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field
 
 from app.core.models.base import SmartCityBqBaseModel
@@ -10,3 +11,6 @@ class ModuleRoleBase(SmartCityBqBaseModel):
 
 class DbModuleRole(ModuleRoleBase, table=True):
     __tablename__ = "modules_roles"
+    __table_args__ = (
+        UniqueConstraint("role_id", "module_id", name="uq_modules_roles_role_module"),
+    )
@@ -1,3 +1,4 @@
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field
 
 from app.core.models.base import SmartCityBqBaseModel
@@ -10,3 +11,6 @@ class UserRoleBase(SmartCityBqBaseModel):
 
 class DbUserRole(UserRoleBase, table=True):
     __tablename__ = "users_roles"
+    __table_args__ = (
+        UniqueConstraint("user_id", "role_id", name="uq_users_roles_user_role"),
+    )
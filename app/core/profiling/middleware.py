@@ -0,0 +1,140 @@
+import logging
+import random
+import re
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qs
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.dependencies import decode_access_token_async
+from app.core.profiling.sampler import (
+    ProfileSession,
+    RouteProfiles,
+    SamplingProfiler,
+    current_profile_session,
+)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "__profile"
+PROFILE_REPORT_HEADER = "X-Profile-Report"
+UNMATCHED_ROUTE = "<unmatched>"
+
+_TRUTHY = {"1", "true", "yes"}
+
+
+class ProfilingMiddleware:
+    """
+    Perfila peticiones con un profiler de muestreo.
+
+    - Bajo demanda: un usuario autorizado envía `X-Profile: 1` o `?__profile=1`
+      junto con su token; el reporte (formato folded, compatible con
+      flamegraph.pl y speedscope) se guarda en `output_dir` y su nombre se
+      devuelve en el header `X-Profile-Report`.
+    - En segundo plano: una fracción `sample_rate` de las peticiones se perfila
+      y se acumula por ruta en `route_profiles`, solo con los stacks que
+      corren en nombre de esa petición.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        profiler: SamplingProfiler,
+        route_profiles: RouteProfiles,
+        output_dir: str,
+        allowed_users: list[str],
+        on_demand_enabled: bool = False,
+        sample_rate: float = 0.0,
+    ):
+        self.app = app
+        self.profiler = profiler
+        self.route_profiles = route_profiles
+        self.output_dir = Path(output_dir)
+        self.allowed_users = set(allowed_users)
+        self.on_demand_enabled = on_demand_enabled
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.on_demand_enabled and await self._on_demand_requested(scope):
+            await self._profile_request(scope, receive, send)
+        elif self.sample_rate > 0 and random.random() < self.sample_rate:
+            await self._sample_request(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    async def _on_demand_requested(self, scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        flag = headers.get(PROFILE_HEADER) or next(
+            iter(query.get(PROFILE_QUERY_PARAM, [])), None
+        )
+        if flag is None or flag.lower() not in _TRUTHY:
+            return False
+
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+
+        try:
+            payload = await decode_access_token_async(token)
+        except HTTPException:
+            return False
+
+        return payload.get("sub") in self.allowed_users
+
+    async def _profile_request(self, scope: Scope, receive: Receive, send: Send):
+        report_name = self._report_name(scope)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(PROFILE_REPORT_HEADER, report_name)
+            await send(message)
+
+        session = self.profiler.start_session()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.profiler.stop_session(session)
+            self._save_report(report_name, scope, session)
+
+    async def _sample_request(self, scope: Scope, receive: Receive, send: Send):
+        # Solo los stacks de esta petición: el contexto se hereda en las tareas
+        # y en las llamadas al threadpool que hace la ruta
+        session = self.profiler.start_session(request_only=True)
+        token = current_profile_session.set(session)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_profile_session.reset(token)
+            self.profiler.stop_session(session)
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            self.route_profiles.add(f"{scope['method']} {route}", session)
+
+    def _report_name(self, scope: Scope) -> str:
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        slug = re.sub(r"[^a-zA-Z0-9]+", "-", scope["path"]).strip("-") or "root"
+        return f"{timestamp}-{scope['method'].lower()}-{slug}-{uuid.uuid4().hex[:8]}.folded"
+
+    def _save_report(self, name: str, scope: Scope, session: ProfileSession) -> None:
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            (self.output_dir / name).write_text(session.folded(), encoding="utf-8")
+        except OSError:
+            logging.exception("No se pudo guardar el perfil %s", name)
+            return
+
+        logging.info(
+            "Perfil de %s %s guardado en %s (%d muestras, %.1f ms)",
+            scope["method"],
+            scope["path"],
+            name,
+            session.samples,
+            session.duration * 1000,
+        )
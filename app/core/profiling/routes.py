@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core.dependencies import ValidTokenDep
+from app.core.exceptions import get_entity_not_found_exception, get_forbidden_exception
+from app.core.profiling.sampler import route_profiles
+from app.core.settings import settings
+
+
+def require_profiler_access(payload: ValidTokenDep) -> None:
+    if payload.get("sub") not in settings.profiler_allowed_users:
+        raise get_forbidden_exception("No tiene permisos para consultar los perfiles")
+
+
+profiling_router = APIRouter(
+    prefix="/api/profiling",
+    tags=["profiling"],
+    dependencies=[Depends(require_profiler_access)],
+)
+
+
+@profiling_router.get("/reports", response_model=list[str])
+def get_reports():
+    output_dir = Path(settings.profiler_output_dir)
+    if not output_dir.is_dir():
+        return []
+
+    return sorted((path.name for path in output_dir.glob("*.folded")), reverse=True)
+
+
+@profiling_router.get("/reports/{report_name}", response_class=PlainTextResponse)
+def get_report(report_name: str):
+    path = Path(settings.profiler_output_dir) / Path(report_name).name
+    if path.suffix != ".folded" or not path.is_file():
+        raise get_entity_not_found_exception(f"Perfil {report_name} no encontrado")
+
+    return path.read_text(encoding="utf-8")
+
+
+@profiling_router.get("/routes", response_model=dict[str, int])
+def get_route_samples():
+    """
+    Muestras acumuladas por ruta en el modo de muestreo en segundo plano.
+    """
+    return route_profiles.summary()
+
+
+@profiling_router.get("/routes/folded", response_class=PlainTextResponse)
+def get_route_profile(route: str):
+    """
+    Stacks acumulados de una ruta, por ejemplo `GET /api/auth/me`.
+    """
+    folded = route_profiles.folded(route)
+    if folded is None:
+        raise get_entity_not_found_exception(f"No hay muestras para la ruta {route}")
+
+    return folded
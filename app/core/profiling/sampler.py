@@ -0,0 +1,203 @@
+import asyncio.events
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import Context, ContextVar
+from types import CodeType, FrameType
+
+from app.core.settings import settings
+
+# Un hilo cuyo frame más interno está en alguno de estos módulos está esperando
+# trabajo (event loop en select, workers del threadpool en una cola).
+IDLE_LEAF_FILES = ("threading.py", "selectors.py", "queue.py")
+
+MAX_STACK_DEPTH = 128
+
+
+def _worker_run_code() -> CodeType | None:
+    try:
+        from anyio._backends._asyncio import WorkerThread
+    except ImportError:
+        return None
+    return getattr(getattr(WorkerThread, "run", None), "__code__", None)
+
+
+# Frames que ejecutan trabajo dentro del contexto de una petición: cada paso de
+# una tarea en el event loop (`Handle._run` con `self._context`) y cada llamada
+# al threadpool de anyio (`WorkerThread.run` con la copia `context`). Si otra
+# versión de anyio cambia esa clase, el trabajo del threadpool no se atribuye.
+_HANDLE_RUN_CODE = asyncio.events.Handle._run.__code__
+_WORKER_RUN_CODE = _worker_run_code()
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+
+
+def fold_stack(frame: FrameType) -> str | None:
+    """
+    Convierte un stack en una línea del formato "folded" (raíz primero,
+    frames separados por `;`) o None si el hilo está ocioso.
+    """
+    if frame.f_code.co_filename.endswith(IDLE_LEAF_FILES):
+        return None
+
+    labels: list[str] = []
+    current: FrameType | None = frame
+    while current is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(current).replace(";", ":"))
+        current = current.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+class ProfileSession:
+    """
+    Muestras de una o varias peticiones. Con `request_only` solo se cuentan
+    los stacks que corren en el contexto donde la sesión es
+    `current_profile_session`: los de la petición en el event loop y en el
+    threadpool, sin los de otras peticiones concurrentes ni los de otros hilos.
+    """
+
+    def __init__(self, request_only: bool = False) -> None:
+        self.request_only = request_only
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.started_at = time.perf_counter()
+        self.duration = 0.0
+
+    def folded(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+current_profile_session: ContextVar[ProfileSession | None] = ContextVar(
+    "current_profile_session", default=None
+)
+
+
+def _frame_context(frame: FrameType) -> Context | None:
+    """
+    Contexto (`contextvars`) con el que corre el stack de `frame`, o None si no
+    corre dentro de un paso del event loop ni del threadpool de anyio.
+    """
+    current: FrameType | None = frame
+    while current is not None:
+        if current.f_code is _HANDLE_RUN_CODE:
+            return getattr(current.f_locals.get("self"), "_context", None)
+        if current.f_code is _WORKER_RUN_CODE:
+            return current.f_locals.get("context")
+        current = current.f_back
+    return None
+
+
+def _session_for(frame: FrameType) -> ProfileSession | None:
+    context = _frame_context(frame)
+    return context.get(current_profile_session) if context is not None else None
+
+
+class SamplingProfiler:
+    """
+    Muestrea periódicamente los stacks de todos los hilos del proceso mientras
+    haya al menos una sesión activa. Un único hilo de muestreo atiende a todas
+    las sesiones, así que perfilar varias peticiones a la vez no multiplica el
+    costo. En las sesiones sin `request_only` las muestras de peticiones
+    concurrentes pueden mezclarse.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._sessions: set[ProfileSession] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def start_session(self, request_only: bool = False) -> ProfileSession:
+        session = ProfileSession(request_only)
+        with self._lock:
+            self._sessions.add(session)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="sampling-profiler", daemon=True
+                )
+                self._thread.start()
+        return session
+
+    def stop_session(self, session: ProfileSession) -> ProfileSession:
+        with self._lock:
+            self._sessions.discard(session)
+        session.duration = time.perf_counter() - session.started_at
+        return session
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while True:
+            with self._lock:
+                sessions = list(self._sessions)
+                if not sessions:
+                    self._thread = None
+                    return
+
+            attribute = any(session.request_only for session in sessions)
+            stacks: list[tuple[str, ProfileSession | None]] = [
+                (
+                    folded,
+                    _session_for(frame) if attribute else None,
+                )
+                for ident, frame in sys._current_frames().items()
+                if ident != own_ident and (folded := fold_stack(frame)) is not None
+            ]
+            for session in sessions:
+                session.samples += 1
+                session.stacks.update(
+                    folded
+                    for folded, owner in stacks
+                    if not session.request_only or owner is session
+                )
+
+            time.sleep(self.interval)
+
+
+class RouteProfiles:
+    """
+    Stacks acumulados por ruta para el modo de muestreo en segundo plano.
+    """
+
+    def __init__(self, max_stacks_per_route: int = 5000):
+        self.max_stacks_per_route = max_stacks_per_route
+        self._routes: dict[str, ProfileSession] = {}
+        self._lock = threading.Lock()
+
+    def add(self, route: str, session: ProfileSession) -> None:
+        with self._lock:
+            aggregate = self._routes.setdefault(route, ProfileSession())
+            aggregate.samples += session.samples
+            aggregate.duration += session.duration
+            for stack, count in session.stacks.items():
+                if (
+                    stack in aggregate.stacks
+                    or len(aggregate.stacks) < self.max_stacks_per_route
+                ):
+                    aggregate.stacks[stack] += count
+
+    def summary(self) -> dict[str, int]:
+        with self._lock:
+            return {route: profile.samples for route, profile in self._routes.items()}
+
+    def folded(self, route: str) -> str | None:
+        with self._lock:
+            profile = self._routes.get(route)
+            return profile.folded() if profile is not None else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+profiler = SamplingProfiler(settings.profiler_interval_ms / 1000)
+route_profiles = RouteProfiles()
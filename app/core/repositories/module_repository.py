@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
+from typing import Sequence
 
+from sqlalchemy import Row
+
+from app.core.list_query import ListQuery
 from app.core.models.module import DbModule
 
 
@@ -38,3 +42,36 @@ class ModuleRepository(ABC):
         Retrieves a module by its ID.
         """
         pass
+
+
+class AsyncModuleRepository(ABC):
+    """
+    Consultas de solo lectura sobre `AsyncSession` para las rutas asíncronas.
+    """
+
+    @abstractmethod
+    async def get_modules_by_role_ids(self, role_ids: list[int]) -> list[DbModule]:
+        pass
+
+    @abstractmethod
+    async def get_modules_by_ids(self, module_ids: list[int]) -> list[DbModule]:
+        pass
+
+    @abstractmethod
+    async def get_all_modules(self) -> list[DbModule]:
+        pass
+
+    @abstractmethod
+    async def get_all_modules_by_active(self, active: bool) -> list[DbModule]:
+        pass
+
+    @abstractmethod
+    async def get_module_by_id(self, module_id: int) -> DbModule | None:
+        pass
+
+    @abstractmethod
+    async def list_modules(self, query: ListQuery, columns: list[str]) -> Sequence[Row]:
+        """
+        Página de módulos con solo `columns`, filtrada y ordenada por id.
+        """
+        pass
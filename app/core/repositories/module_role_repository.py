@@ -16,6 +16,13 @@ class ModuleRoleRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def sync_roles_modules(self, modules_by_role: dict[int, list[int]]) -> None:
+        """
+        Synchronizes the modules of several roles at once.
+        """
+        pass
+
     @abstractmethod
     def get_module_ids_map_by_role_ids(
         self, role_ids: list[int]
@@ -24,3 +31,14 @@ class ModuleRoleRepository(ABC):
         Returns a mapping from role_id to the list of module_ids associated to it.
         """
         pass
+
+
+class AsyncModuleRoleRepository(ABC):
+    @abstractmethod
+    async def get_module_ids_map_by_role_ids(
+        self, role_ids: list[int]
+    ) -> dict[int, list[int]]:
+        """
+        Returns a mapping from role_id to the list of module_ids associated to it.
+        """
+        pass
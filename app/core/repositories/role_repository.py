@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Sequence
 
+from sqlalchemy import Row
+
+from app.core.list_query import ListQuery
 from app.core.models.role import DbRole, RoleCreate, RoleUpdate
 
 
@@ -47,3 +50,38 @@ class RoleRepository(ABC):
         Users without roles should not appear in the map or map to an empty list.
         """
         pass
+
+
+class AsyncRoleRepository(ABC):
+    """
+    Consultas de solo lectura sobre `AsyncSession` para las rutas asíncronas.
+    """
+
+    @abstractmethod
+    async def get_roles_by_user_id(self, user_id: int) -> list[DbRole]:
+        pass
+
+    @abstractmethod
+    async def get_all_roles(self) -> list[DbRole]:
+        pass
+
+    @abstractmethod
+    async def get_all_roles_by_active(self, active: bool) -> list[DbRole]:
+        pass
+
+    @abstractmethod
+    async def get_role_by_id(self, role_id: int) -> Optional[DbRole]:
+        pass
+
+    @abstractmethod
+    async def get_roles_by_user_ids_map(
+        self, user_ids: list[int]
+    ) -> dict[int, list[DbRole]]:
+        pass
+
+    @abstractmethod
+    async def list_roles(self, query: ListQuery, columns: list[str]) -> Sequence[Row]:
+        """
+        Página de roles con solo `columns`, filtrada y ordenada por id.
+        """
+        pass
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Sequence
 
+from sqlalchemy import Row
+
+from app.core.list_query import ListQuery
 from app.core.models.user import DbUser, UserCreateWithPassword, UserUpdate
 
 
@@ -29,6 +32,20 @@ class UserRepository(ABC):
     def create_user(self, user: UserCreateWithPassword) -> DbUser:
         pass
 
+    @abstractmethod
+    def create_users(self, users: list[UserCreateWithPassword]) -> list[DbUser]:
+        """
+        Inserta los usuarios y sus roles con INSERT de varias filas, en una
+        sola transacción.
+        """
+        pass
+
+    @abstractmethod
+    def get_users_by_emails_or_identifications(
+        self, emails: list[str], identifications: list[str]
+    ) -> list[DbUser]:
+        pass
+
     @abstractmethod
     def update_user(self, user_id: int, user: UserUpdate) -> Optional[DbUser]:
         pass
@@ -42,3 +59,49 @@ class UserRepository(ABC):
     @abstractmethod
     def update_password(self, user_id: int, password: str) -> None:
         pass
+
+    @abstractmethod
+    def rehash_password(self, user_id: int, password: str) -> None:
+        """
+        Reemplaza el hash de la contraseña (mismo valor, otro costo de bcrypt).
+        """
+        pass
+
+
+class AsyncUserRepository(ABC):
+    """
+    Consultas de solo lectura sobre `AsyncSession` para las rutas asíncronas.
+    """
+
+    @abstractmethod
+    async def get_all_users(self) -> list[DbUser]:
+        pass
+
+    @abstractmethod
+    async def get_all_users_by_active(self, active: bool) -> list[DbUser]:
+        pass
+
+    @abstractmethod
+    async def get_user_by_id(self, user_id: int) -> Optional[DbUser]:
+        pass
+
+    @abstractmethod
+    async def get_user_by_email(self, email: str) -> Optional[DbUser]:
+        pass
+
+    @abstractmethod
+    async def get_users_with_roles(
+        self, query: ListQuery, role_id: int | None = None
+    ) -> Sequence[Row]:
+        """
+        Página de usuarios con los campos de `UserBase` y sus roles activos
+        en `roles` (arreglo JSON).
+        """
+        pass
+
+    @abstractmethod
+    async def list_users(self, query: ListQuery, columns: list[str]) -> Sequence[Row]:
+        """
+        Página de usuarios con solo `columns`, filtrada y ordenada por id.
+        """
+        pass
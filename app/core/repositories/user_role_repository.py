@@ -36,3 +36,10 @@ class UserRoleRepository(ABC):
         Synchronizes the roles of a user with the given list of role IDs.
         """
         pass
+
+    @abstractmethod
+    def sync_users_roles(self, roles_by_user: dict[int, list[int]]) -> None:
+        """
+        Synchronizes the roles of several users at once.
+        """
+        pass
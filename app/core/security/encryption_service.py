@@ -1,10 +1,189 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import bcrypt
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.metrics.registry import registry
+from app.core.settings import settings
+
+PASSWORD_HASH_DURATION = registry.histogram(
+    "password_hash_duration_seconds",
+    "Duración de hash/verificación de contraseñas, incluida la espera en cola",
+    labels=("operation",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+PASSWORD_HASH_REJECTIONS = registry.counter(
+    "password_hash_rejections_total",
+    "Operaciones de contraseña rechazadas por cola llena",
+    labels=("operation",),
+)
+PASSWORD_HASH_QUEUE_DEPTH = registry.gauge(
+    "password_hash_queue_depth",
+    "Operaciones de contraseña en cola o en ejecución",
+)
+
+
+class PasswordHasherBusyError(Exception):
+    """
+    La cola de hashing está llena; el cliente debe reintentar más tarde.
+    """
+
+
+def _hashpw(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+class PasswordHasher:
+    """
+    Ejecuta bcrypt en un pool de procesos propio para no ocupar el threadpool
+    compartido de las rutas síncronas con trabajo de CPU.
+
+    Como mucho `max_pending` operaciones esperan o corren a la vez; las demás
+    fallan de inmediato con `PasswordHasherBusyError`. Con `workers=0` bcrypt
+    corre en el hilo que llama (pruebas y serverless); lo mismo si el entorno
+    no permite crear el pool.
+
+    Las variantes `async` esperan al pool de procesos desde el event loop sin
+    ocupar un hilo del threadpool; sin pool, bcrypt corre en el threadpool.
+    """
+
+    def __init__(self, rounds: int, workers: int, max_pending: int):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    def hash(self, password: str) -> str:
+        hashed = self._run("hash", _hashpw, password.encode("utf-8"), self.rounds)
+        return hashed.decode("utf-8")
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self._run(
+            "verify", _checkpw, password.encode("utf-8"), hashed.encode("utf-8")
+        )
+
+    async def hash_async(self, password: str) -> str:
+        hashed = await self._run_async(
+            "hash", _hashpw, password.encode("utf-8"), self.rounds
+        )
+        return hashed.decode("utf-8")
+
+    async def verify_async(self, password: str, hashed: str) -> bool:
+        return await self._run_async(
+            "verify", _checkpw, password.encode("utf-8"), hashed.encode("utf-8")
+        )
+
+    def needs_rehash(self, hashed: str) -> bool:
+        # Formato modular crypt: $2b$<costo>$<salt+hash>
+        parts = hashed.split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return True
+        return int(parts[2]) != self.rounds
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def _run(self, operation: str, fn, *args):
+        start = self._acquire(operation)
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                return fn(*args)
+            return executor.submit(fn, *args).result()
+        except BrokenProcessPool:
+            self._discard_executor()
+            raise
+        finally:
+            self._release(operation, start)
+
+    async def _run_async(self, operation: str, fn, *args):
+        start = self._acquire(operation)
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                return await run_in_threadpool(fn, *args)
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            self._discard_executor()
+            raise
+        finally:
+            self._release(operation, start)
+
+    def _acquire(self, operation: str) -> float:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                PASSWORD_HASH_REJECTIONS.inc(operation)
+                raise PasswordHasherBusyError()
+            self.pending += 1
+        return time.perf_counter()
+
+    def _release(self, operation: str, start: float) -> None:
+        PASSWORD_HASH_DURATION.observe(time.perf_counter() - start, operation)
+        with self._lock:
+            self.pending -= 1
+
+    def _discard_executor(self) -> None:
+        # Un worker murió; el siguiente llamado crea un pool nuevo
+        with self._lock:
+            self._executor = None
+
+    def _get_executor(self) -> Executor | None:
+        with self._lock:
+            if self._executor is None and self.workers > 0:
+                try:
+                    # `spawn` evita heredar los hilos de la app (listeners de
+                    # Redis) en un proceso hecho con fork.
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                except (OSError, NotImplementedError) as e:
+                    # Sin /dev/shm ni semáforos (p. ej. AWS Lambda)
+                    logging.warning(
+                        f"No se pudo crear el pool de hashing, bcrypt corre en el hilo: {e}"
+                    )
+                    self.workers = 0
+            return self._executor
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.password_hash_rounds,
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+PASSWORD_HASH_QUEUE_DEPTH.set_function(lambda: {(): password_hasher.pending})
 
 
 def encrypt(data: str) -> str:
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(data.encode("utf-8"), salt).decode("utf-8")
+    return password_hasher.hash(data)
 
 
 def verify(raw: str, encrypted: str) -> bool:
-    return bcrypt.checkpw(raw.encode("utf-8"), encrypted.encode("utf-8"))
+    return password_hasher.verify(raw, encrypted)
+
+
+async def encrypt_async(data: str) -> str:
+    return await password_hasher.hash_async(data)
+
+
+async def verify_async(raw: str, encrypted: str) -> bool:
+    return await password_hasher.verify_async(raw, encrypted)
+
+
+def needs_rehash(encrypted: str) -> bool:
+    return password_hasher.needs_rehash(encrypted)
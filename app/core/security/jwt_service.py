@@ -1,3 +1,4 @@
+import uuid
 from datetime import datetime, timedelta, timezone
 
 import jwt
@@ -6,17 +7,18 @@ from app.core.settings import settings
 
 JWT_SECRET_KEY = settings.jwt_secret_key
 ALGORITHM = settings.jwt_algorithm
-ACCESS_TOKEN_EXPIRE_DAYS = settings.jwt_expiration_time
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.jwt_access_token_expiration_minutes
+ACCESS_TOKEN_TYPE = "access"
 
 
 def create_access_token(data: dict):
     to_encode = data.copy()
 
-    expiration_days = ACCESS_TOKEN_EXPIRE_DAYS
-    expires_delta = timedelta(days=expiration_days)
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    expire = datetime.now(timezone.utc) + expires_delta
-
-    to_encode.update({"exp": expire})
+    to_encode.update(
+        {"exp": expire, "iat": now, "jti": uuid.uuid4().hex, "type": ACCESS_TOKEN_TYPE}
+    )
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
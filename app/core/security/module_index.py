@@ -0,0 +1,160 @@
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+
+import redis
+from sqlmodel import Session
+
+from app.core.cache.permission_cache import (
+    PERMISSIONS_CHANNEL,
+    PermissionCache,
+    permission_cache,
+)
+from app.core.database.connection import engine
+from app.core.database.repositories.module_repository_impl import (
+    ModuleRepositoryImpl,
+)
+from app.core.database.repositories.module_role_repository_impl import (
+    ModuleRoleRepositoryImpl,
+)
+from app.core.database.repositories.role_repository_impl import RoleRepositoryImpl
+from app.core.metrics.registry import registry
+
+MODULE_AUTHORIZATION_DECISIONS = registry.counter(
+    "module_authorization_decisions_total",
+    "Decisiones de autorización por módulo (allow, deny)",
+    labels=("module", "result"),
+)
+MODULE_INDEX_REFRESHES = registry.counter(
+    "module_index_refreshes_total",
+    "Reconstrucciones del índice rol → módulos",
+)
+
+
+class ModuleIndex:
+    """
+    Índice en memoria de los módulos que otorga cada rol, como máscaras de bits
+    donde el bit `n` es el módulo con id `n`.
+
+    Se construye desde `modules_roles` y se reconstruye cuando llega un cambio
+    por `PERMISSIONS_CHANNEL`. `version` es la versión de permisos con la que se
+    construyó, para saber si los claims `roles` de un token siguen vigentes.
+    """
+
+    def __init__(
+        self,
+        permission_cache: PermissionCache,
+        session_factory: Callable[[], Session] = lambda: Session(engine),
+    ):
+        self.permission_cache = permission_cache
+        self.session_factory = session_factory
+        self.version: int | None = None
+        self.loaded = False
+        self._module_bits: dict[str, int] = {}
+        self._role_masks: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._listener: threading.Thread | None = None
+        self._listener_lock = threading.Lock()
+
+    def is_current(self, min_version: int | None = None) -> bool:
+        """
+        Indica si el índice está cargado y no es más viejo que `min_version`
+        (la versión de permisos con la que se emitió un token).
+        """
+        return self.loaded and (
+            min_version is None or self.version is None or self.version >= min_version
+        )
+
+    def ensure_current(self, min_version: int | None = None) -> None:
+        """
+        Reconstruye el índice solo si `is_current` es falso. Las peticiones
+        concurrentes esperan en el lock a la primera y no repiten la carga.
+        """
+        if self.is_current(min_version):
+            return
+        with self._lock:
+            if not self.is_current(min_version):
+                self._reload()
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._reload()
+
+    def _reload(self) -> None:
+        # La versión se lee antes que las tablas: si cambian en medio, el
+        # índice queda con la versión vieja y se vuelve a construir.
+        version = self.permission_cache.version()
+        with self.session_factory() as session:
+            modules = ModuleRepositoryImpl(session).get_all_modules_by_active(True)
+            roles = RoleRepositoryImpl(session).get_all_roles_by_active(True)
+            module_ids_map = ModuleRoleRepositoryImpl(
+                session
+            ).get_module_ids_map_by_role_ids(
+                [role.id for role in roles if role.id is not None]
+            )
+
+        active_module_ids = {module.id for module in modules if module.id}
+        module_bits = {module.path: 1 << module.id for module in modules if module.id}
+        role_masks: dict[int, int] = {}
+        for role_id, module_ids in module_ids_map.items():
+            mask = 0
+            for module_id in module_ids:
+                if module_id in active_module_ids:
+                    mask |= 1 << module_id
+            role_masks[role_id] = mask
+
+        self._module_bits = module_bits
+        self._role_masks = role_masks
+        self.version = version
+        self.loaded = True
+        MODULE_INDEX_REFRESHES.inc()
+
+    def mask_for(self, role_ids: Iterable[int]) -> int:
+        mask = 0
+        for role_id in role_ids:
+            mask |= self._role_masks.get(role_id, 0)
+        return mask
+
+    def allows(self, role_ids: Iterable[int], module_path: str) -> bool:
+        return self.mask_for(role_ids) & self._module_bits.get(module_path, 0) != 0
+
+    def start_listener(self) -> None:
+        if self._listener is not None:
+            return
+
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="module-index-refresh", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self) -> None:
+        failing = False
+        while True:
+            try:
+                pubsub = self.permission_cache.redis_factory().pubsub(
+                    ignore_subscribe_messages=True
+                )
+                pubsub.subscribe(PERMISSIONS_CHANNEL)
+                # Pudo haber cambios mientras no se escuchaba el canal
+                if failing or self.permission_cache.version() != self.version:
+                    self.refresh()
+                failing = False
+
+                for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.refresh()
+            except redis.RedisError as e:
+                if not failing:
+                    logging.warning(f"Se perdió el canal de cambios de permisos: {e}")
+                failing = True
+                time.sleep(1)
+            except Exception as e:
+                logging.error(f"No se pudo reconstruir el índice de módulos: {e}")
+                failing = True
+                time.sleep(1)
+
+
+module_index = ModuleIndex(permission_cache=permission_cache)
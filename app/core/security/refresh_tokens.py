@@ -0,0 +1,123 @@
+import hashlib
+import json
+import secrets
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import redis
+
+from app.core.database.redis import get_redis_client
+from app.core.settings import settings
+
+REFRESH_TOKEN_KEY = "refresh-token:{digest}"
+REFRESH_FAMILY_KEY = "refresh-family:{family}"
+
+
+@dataclass
+class RefreshTokenGrant:
+    subject: str
+    family: str
+
+
+class RefreshTokenReuseError(Exception):
+    pass
+
+
+class RefreshTokenStore:
+    """
+    Refresh tokens opacos y rotativos guardados en Redis.
+
+    Cada login abre una familia; cada rotación invalida el token usado y emite
+    uno nuevo de la misma familia. Si se presenta un token que ya fue rotado
+    se asume robo y se revoca la familia completa.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        redis_factory: Callable[[], redis.Redis] = get_redis_client,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.redis_factory = redis_factory
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def issue(self, subject: str, family: str | None = None) -> str:
+        token = secrets.token_urlsafe(32)
+        digest = self._digest(token)
+        family = family or uuid.uuid4().hex
+
+        pipeline = self.redis_factory().pipeline(transaction=True)
+        pipeline.set(
+            REFRESH_TOKEN_KEY.format(digest=digest),
+            json.dumps({"sub": subject, "family": family}),
+            ex=self.ttl_seconds,
+        )
+        pipeline.set(
+            REFRESH_FAMILY_KEY.format(family=family), digest, ex=self.ttl_seconds
+        )
+        pipeline.execute()
+        return token
+
+    def consume(self, token: str) -> RefreshTokenGrant | None:
+        """
+        Valida el token para rotarlo. Devuelve None si no existe, expiró o su
+        familia fue revocada, y lanza `RefreshTokenReuseError` si ya había sido
+        usado.
+        """
+        digest = self._digest(token)
+        client = self.redis_factory()
+        data = client.get(REFRESH_TOKEN_KEY.format(digest=digest))
+        if data is None:
+            return None
+
+        grant = RefreshTokenGrant(**_parse_grant(data))
+        family_key = REFRESH_FAMILY_KEY.format(family=grant.family)
+
+        with client.pipeline(transaction=True) as pipeline:
+            try:
+                pipeline.watch(family_key)
+                current = pipeline.get(family_key)
+                if current is None:
+                    # Familia revocada (logout o reutilización previa)
+                    pipeline.unwatch()
+                    return None
+                if current != digest:
+                    pipeline.unwatch()
+                    self.revoke_family(grant.family)
+                    raise RefreshTokenReuseError(grant.family)
+
+                # El token queda registrado pero deja de ser el vigente de la
+                # familia, así que un segundo uso se detecta como reutilización.
+                pipeline.multi()
+                pipeline.delete(family_key)
+                pipeline.execute()
+            except redis.WatchError:
+                # Otra petición rotó el mismo token al mismo tiempo
+                self.revoke_family(grant.family)
+                raise RefreshTokenReuseError(grant.family)
+
+        return grant
+
+    def revoke(self, token: str) -> None:
+        data = self.redis_factory().get(
+            REFRESH_TOKEN_KEY.format(digest=self._digest(token))
+        )
+        if data is not None:
+            self.revoke_family(_parse_grant(data)["family"])
+
+    def revoke_family(self, family: str) -> None:
+        self.redis_factory().delete(REFRESH_FAMILY_KEY.format(family=family))
+
+
+def _parse_grant(data: str) -> dict[str, str]:
+    parsed = json.loads(data)
+    return {"subject": parsed["sub"], "family": parsed["family"]}
+
+
+refresh_token_store = RefreshTokenStore(
+    ttl_seconds=settings.jwt_expiration_time * 24 * 60 * 60,
+)
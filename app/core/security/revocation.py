@@ -0,0 +1,154 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+import redis
+import redis.asyncio
+
+from app.core.cache.bloom import BloomFilter
+from app.core.database.redis import get_async_redis_client, get_redis_client
+from app.core.metrics.registry import registry
+from app.core.settings import settings
+
+REVOKED_JTI_KEY = "revoked-jti:{jti}"
+REVOKED_JTI_CHANNEL = "revoked-jti"
+
+REVOCATION_CHECKS = registry.counter(
+    "jwt_revocation_checks_total",
+    "Consultas de revocación por resultado (bloom_negative, redis_hit, redis_miss, redis_error)",
+    labels=("result",),
+)
+
+
+class RevocationStore:
+    """
+    `jti` revocados en Redis, con un filtro de Bloom local delante.
+
+    Si el filtro dice que un `jti` no está revocado no se consulta Redis, que
+    es el caso de casi todas las peticiones. El filtro se llena con un SCAN al
+    iniciar y con las revocaciones publicadas en `REVOKED_JTI_CHANNEL`, y se
+    reconstruye cada `rebuild_interval` segundos para descartar las entradas
+    expiradas. Mientras no está sincronizado se consulta Redis directamente;
+    desde el event loop se usa `is_revoked_async` para no bloquearlo.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        rebuild_interval: float,
+        redis_factory: Callable[[], redis.Redis] = get_redis_client,
+        async_redis_factory: Callable[[], redis.asyncio.Redis] = get_async_redis_client,
+    ):
+        self.capacity = capacity
+        self.rebuild_interval = rebuild_interval
+        self.redis_factory = redis_factory
+        self.async_redis_factory = async_redis_factory
+        self._bloom = BloomFilter(capacity)
+        self._ready = False
+        self._listener: threading.Thread | None = None
+        self._listener_lock = threading.Lock()
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        ttl = max(int(expires_at - time.time()), 1)
+        self._bloom.add(jti)
+        client = self.redis_factory()
+        pipeline = client.pipeline(transaction=False)
+        pipeline.set(REVOKED_JTI_KEY.format(jti=jti), 1, ex=ttl)
+        pipeline.publish(REVOKED_JTI_CHANNEL, jti)
+        pipeline.execute()
+
+    def is_revoked(self, jti: str) -> bool:
+        if self._bloom_excludes(jti):
+            return False
+
+        try:
+            revoked = bool(self.redis_factory().exists(REVOKED_JTI_KEY.format(jti=jti)))
+        except redis.RedisError as e:
+            return self._on_redis_error(e)
+
+        return self._on_redis_result(revoked)
+
+    async def is_revoked_async(self, jti: str) -> bool:
+        if self._bloom_excludes(jti):
+            return False
+
+        try:
+            revoked = bool(
+                await self.async_redis_factory().exists(REVOKED_JTI_KEY.format(jti=jti))
+            )
+        except redis.RedisError as e:
+            return self._on_redis_error(e)
+
+        return self._on_redis_result(revoked)
+
+    def _bloom_excludes(self, jti: str) -> bool:
+        self.start_listener()
+        if self._ready and not self._bloom.might_contain(jti):
+            REVOCATION_CHECKS.inc("bloom_negative")
+            return True
+        return False
+
+    @staticmethod
+    def _on_redis_error(error: redis.RedisError) -> bool:
+        # Se prefiere la disponibilidad: los access tokens duran minutos
+        REVOCATION_CHECKS.inc("redis_error")
+        logging.warning(f"No se pudo consultar la revocación del token: {error}")
+        return False
+
+    @staticmethod
+    def _on_redis_result(revoked: bool) -> bool:
+        REVOCATION_CHECKS.inc("redis_hit" if revoked else "redis_miss")
+        return revoked
+
+    def start_listener(self) -> None:
+        if self._listener is not None:
+            return
+
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="jwt-revocation", daemon=True
+                )
+                self._listener.start()
+
+    def _rebuild(self, client: redis.Redis) -> None:
+        bloom = BloomFilter(self.capacity)
+        prefix = REVOKED_JTI_KEY.format(jti="")
+        for key in client.scan_iter(match=f"{prefix}*", count=1000):
+            bloom.add(key[len(prefix) :])
+        self._bloom = bloom
+
+    def _listen(self) -> None:
+        failing = False
+        while True:
+            try:
+                client = self.redis_factory()
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                # Suscribirse antes del SCAN para no perder revocaciones
+                pubsub.subscribe(REVOKED_JTI_CHANNEL)
+                self._rebuild(client)
+                self._ready = True
+                failing = False
+                rebuilt_at = time.monotonic()
+
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        self._bloom.add(message["data"])
+
+                    if time.monotonic() - rebuilt_at >= self.rebuild_interval:
+                        self._rebuild(client)
+                        rebuilt_at = time.monotonic()
+            except redis.RedisError as e:
+                self._ready = False
+                if not failing:
+                    logging.warning(f"Se perdió el canal de revocación de tokens: {e}")
+                failing = True
+                time.sleep(1)
+
+
+revocation_store = RevocationStore(
+    capacity=settings.jwt_revocation_bloom_capacity,
+    rebuild_interval=settings.jwt_revocation_bloom_rebuild_interval,
+)
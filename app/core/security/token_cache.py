@@ -0,0 +1,75 @@
+import hashlib
+import time
+from typing import Any
+
+from app.core.cache.ttl_cache import TTLCache
+from app.core.metrics.registry import registry
+from app.core.settings import settings
+
+# Tokens sin `exp` se guardan como máximo este tiempo
+DEFAULT_TOKEN_TTL = 300
+
+JWT_CACHE_LOOKUPS = registry.counter(
+    "jwt_cache_lookups_total",
+    "Validaciones de JWT por resultado de la caché (hit, miss, revoked)",
+    labels=("result",),
+)
+JWT_DECODE_DURATION = registry.histogram(
+    "jwt_decode_duration_seconds",
+    "Duración de la decodificación y verificación de firma de un JWT",
+)
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenCache:
+    """
+    Payloads de JWT ya verificados, indexados por el SHA-256 del token y
+    válidos hasta su `exp`. Los tokens revocados se consultan antes que la
+    caché y nunca se devuelven.
+    """
+
+    def __init__(self, max_entries: int):
+        self._payloads = TTLCache[str, dict[str, Any]](
+            max_entries=max_entries, ttl=DEFAULT_TOKEN_TTL
+        )
+        self._revoked = TTLCache[str, bool](
+            max_entries=max_entries, ttl=DEFAULT_TOKEN_TTL
+        )
+
+    def get(self, digest: str) -> dict[str, Any] | None:
+        payload = self._payloads.get(digest)
+        JWT_CACHE_LOOKUPS.inc("miss" if payload is None else "hit")
+        return None if payload is None else dict(payload)
+
+    def set(self, digest: str, payload: dict[str, Any]) -> None:
+        ttl = _seconds_until_exp(payload)
+        if ttl > 0:
+            self._payloads.set(digest, dict(payload), ttl=ttl)
+
+    def is_revoked(self, digest: str) -> bool:
+        if self._revoked.get(digest) is None:
+            return False
+        JWT_CACHE_LOOKUPS.inc("revoked")
+        return True
+
+    def revoke(self, digest: str, payload: dict[str, Any] | None = None) -> None:
+        """
+        Marca el token como revocado hasta su expiración (o `DEFAULT_TOKEN_TTL`
+        si no se conoce).
+        """
+        ttl = _seconds_until_exp(payload) if payload else DEFAULT_TOKEN_TTL
+        self._revoked.set(digest, True, ttl=max(ttl, 1))
+        self._payloads.delete(digest)
+
+
+def _seconds_until_exp(payload: dict[str, Any]) -> float:
+    exp = payload.get("exp")
+    if exp is None:
+        return DEFAULT_TOKEN_TTL
+    return float(exp) - time.time()
+
+
+token_cache = TokenCache(max_entries=settings.jwt_cache_max_entries)
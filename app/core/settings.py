@@ -1,8 +1,11 @@
 # src/app/core/settings.py
 
+import json
+from typing import Annotated, Literal
+
 from dotenv import load_dotenv
-from pydantic import field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import field_validator, model_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 from app.core.email.models.email import EmailSettings
 
@@ -20,13 +23,62 @@ class Settings(BaseSettings):
     env: str = "production"
     jwt_secret_key: str = "secret"
     jwt_algorithm: str = "HS256"
-    jwt_expiration_time: int = 1  # tiempo en dias
+    jwt_expiration_time: int = 1  # tiempo en dias (refresh tokens)
+    jwt_access_token_expiration_minutes: int = 15
+    jwt_revocation_bloom_capacity: int = 100000
+    jwt_revocation_bloom_rebuild_interval: int = 600  # segundos
+    jwt_cache_max_entries: int = 10000
+    # bcrypt en un pool de procesos propio; al superar `max_pending` las
+    # peticiones de login reciben 503. Con `db_pool_mode="null"` (serverless)
+    # el valor por defecto es 0: bcrypt corre en el hilo de la petición
+    password_hash_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 16
     db_url: str = ""
+    # Pool de conexiones: "queue" mantiene conexiones abiertas, "null" abre una
+    # por checkout (Vercel o pooler externo)
+    db_pool_mode: Literal["queue", "null"] = "queue"
+    db_pool_size: int = 10
+    db_pool_max_overflow: int = 10
+    db_pool_timeout: int = 10  # segundos
+    # Menor que el wait_timeout de MySQL para no reutilizar conexiones cerradas
+    db_pool_recycle: int = 1800  # segundos
+    db_pool_pre_ping: bool = True
+    # Réplicas de lectura para las rutas GET, separadas por comas. `NoDecode`
+    # deja el texto sin interpretar como JSON para que lo separe el validador
+    db_replica_urls: Annotated[list[str], NoDecode] = []
+    db_replica_cooldown: int = 30  # segundos fuera de rotación tras un fallo
     redis_url: str = "redis://localhost:6379/0"
+    # Timeouts cortos: si Redis no responde se prefiere fallar rápido
+    redis_socket_timeout: float = 1.0  # segundos
+    redis_socket_connect_timeout: float = 0.5  # segundos
+    # Caché del usuario autenticado: LRU local por worker y Redis compartido
+    user_cache_local_ttl: int = 30  # segundos
+    user_cache_redis_ttl: int = 300  # segundos
+    user_cache_max_entries: int = 10000
+    # Snapshots de permisos versionados para /api/auth/me
+    permission_cache_ttl: int = 3600  # segundos
+    permission_cache_max_entries: int = 1000
+    # Filas máximas por petición de importación masiva de usuarios
+    user_import_max_rows: int = 1000
+    # Exige que los roles del usuario otorguen el módulo de cada router
+    module_authorization_enabled: bool = False
+    # Sentencias idénticas por petición a partir de las cuales se reporta un N+1
+    # (solo en ENV=development)
+    sql_repeated_statement_threshold: int = 2
+
+    # Profiler de muestreo: bajo demanda para los usuarios autorizados y en
+    # segundo plano para una fracción de las peticiones (0 lo desactiva)
+    profiler_enabled: bool = False
+    profiler_allowed_users: Annotated[list[str], NoDecode] = []  # separados por comas
+    profiler_sample_rate: float = 0.0
+    profiler_interval_ms: int = 5
+    profiler_output_dir: str = "profiles"
 
     allowed_hosts: list[str] = []
 
     google_client_id: str = ""
+    google_certs_url: str = "https://www.googleapis.com/oauth2/v3/certs"
 
     mail_username: str = ""
     mail_password: str = ""
@@ -35,16 +87,40 @@ class Settings(BaseSettings):
     mail_server: str = ""
     template_folder: str = ""
     mail_port: int = 587
+    mail_starttls: bool = True
+    mail_use_credentials: bool = True
     change_password_url: str = ""
+    # Outbox de correos en Redis drenado por un worker en segundo plano
+    email_outbox_worker_enabled: bool = True
+    email_outbox_batch_size: int = 20
+    email_outbox_max_attempts: int = 5
+    email_outbox_retry_backoff: int = 30  # segundos, se duplica en cada intento
+    # Tiempo tras el cual un correo reclamado y no confirmado se reintenta
+    email_outbox_lease: int = 300  # segundos
+    email_outbox_poll_interval: float = 1.0  # segundos
+    # Lotes máximos por llamada a /internal/email-outbox/drain (cron serverless)
+    email_outbox_drain_max_batches: int = 5
+    # Secreto del cron de Vercel; sin él el endpoint de drenado está deshabilitado
+    cron_secret: str = ""
+    # Tiempo sin uso tras el cual se descarta la conexión SMTP abierta
+    smtp_idle_timeout: int = 60  # segundos
 
     geo_info_service_url: str = ""
     geo_info_service_api_key: str = ""
     ms_tenant_id: str = ""
     ms_client_id: str = ""
+    # Por defecto el endpoint de llaves del tenant en login.microsoftonline.com
+    ms_jwks_url: str = ""
+    ms_jwks_refresh_interval: int = 3600  # segundos
 
-    @field_validator("allowed_hosts", mode="before")
+    @field_validator(
+        "allowed_hosts", "profiler_allowed_users", "db_replica_urls", mode="before"
+    )
     @classmethod
     def build_allowed_hosts(cls, value: str | list[str]) -> str | list[str]:
+        if isinstance(value, str) and value.lstrip().startswith("["):
+            # Los campos con `NoDecode` también aceptan una lista JSON
+            return json.loads(value)
         if isinstance(value, str) and value:
             return [host.strip() for host in value.split(",")]
 
@@ -53,6 +129,16 @@ class Settings(BaseSettings):
             return value
         return []  # Devuelve lista vacía si no hay nada
 
+    @model_validator(mode="after")
+    def serverless_password_hashing(self) -> "Settings":
+        # En Vercel/Lambda crear procesos falla o cuesta más que el hash
+        if (
+            self.db_pool_mode == "null"
+            and "password_hash_workers" not in self.model_fields_set
+        ):
+            self.password_hash_workers = 0
+        return self
+
 
 settings = Settings()
 email_settings = EmailSettings(
@@ -63,4 +149,6 @@ email_settings = EmailSettings(
     MAIL_SERVER=settings.mail_server,
     MAIL_FROM_NAME=settings.mail_from_name,
     TEMPLATE_FOLDER=settings.template_folder,
+    MAIL_STARTTLS=settings.mail_starttls,
+    USE_CREDENTIALS=settings.mail_use_credentials,
 )
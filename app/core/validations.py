@@ -4,3 +4,22 @@ import re
 def is_valid_email(email: str) -> bool:
     pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
     return re.match(pattern, email) is not None
+
+
+def get_user_create_error(
+    email: str | None, name: str | None, identification: str | None
+) -> str | None:
+    """
+    Mensaje del primer problema de los datos de un usuario nuevo, o None si
+    son válidos.
+    """
+    if not email or not name or not identification:
+        return "Todos los campos son obligatorios."
+
+    if not is_valid_email(email):
+        return "El correo electrónico no tiene un formato válido."
+
+    if not identification.isdigit():
+        return "La identificación debe contener solo números."
+
+    return None
@@ -1,4 +1,5 @@
 import httpx
+from pydantic import TypeAdapter
 
 from app.core.exceptions import (
     get_bad_request_exception,
@@ -7,6 +8,8 @@ from app.core.exceptions import (
     get_forbidden_exception,
     get_internal_server_error_exception,
 )
+from app.core.metrics.registry import registry
+from app.core.metrics.timing import timed
 from app.geo.models.geo_info_service_models import (
     CreateIntersectionDTO,
     CreateTrafficLightDTO,
@@ -15,11 +18,26 @@ from app.geo.models.geo_info_service_models import (
     TrafficLight,
 )
 
+INTERSECTION_LIST_ADAPTER = TypeAdapter(list[Intersection])
+TRAFFIC_LIGHT_LIST_ADAPTER = TypeAdapter(list[TrafficLight])
+
+GEO_INFO_REQUEST_DURATION = registry.histogram(
+    "geo_info_request_duration_seconds",
+    "Duración de las llamadas al servicio geo-info por operación",
+    labels=("operation", "outcome"),
+)
+
 
 class GeoInfoService:
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
         self.base_url = base_url
         self.api_key = api_key
+        self.transport = transport
 
     def _handle_error_response(self, response: httpx.Response) -> None:
         """
@@ -53,6 +71,7 @@ class GeoInfoService:
                 f"Error inesperado de la API externa: {error_message}"
             )
 
+    @timed(GEO_INFO_REQUEST_DURATION, "get_neighborhood_by_point")
     async def get_neighborhood_by_point(
         self, latitude: float, longitude: float
     ) -> NeighborhoodInfo:
@@ -64,17 +83,18 @@ class GeoInfoService:
         else:
             self._handle_error_response(response)
 
+    @timed(GEO_INFO_REQUEST_DURATION, "get_intersection_by_point")
     async def get_intersection_by_point(
         self, latitude: float, longitude: float, radius: int
     ) -> list[Intersection]:
         url = f"{self.base_url}/api/v1/intersections/coordinates?latitude={latitude}&longitude={longitude}&radius={radius}&limit=10"
         response = await self.send_request(url)
         if response.status_code == 200:
-            data: list = response.json()
-            return [Intersection(**item) for item in data]
+            return INTERSECTION_LIST_ADAPTER.validate_json(response.content)
         else:
             self._handle_error_response(response)
 
+    @timed(GEO_INFO_REQUEST_DURATION, "get_traffic_lights")
     async def get_traffic_lights(
         self,
         name: str | None = None,
@@ -94,11 +114,11 @@ class GeoInfoService:
 
         response = await self.send_request(url, params=params)
         if response.status_code == 200:
-            data: list = response.json()
-            return [TrafficLight(**item) for item in data]
+            return TRAFFIC_LIGHT_LIST_ADAPTER.validate_json(response.content)
         else:
             self._handle_error_response(response)
 
+    @timed(GEO_INFO_REQUEST_DURATION, "get_traffic_light_by_id")
     async def get_traffic_light_by_id(
         self, traffic_light_id: int
     ) -> TrafficLight | None:
@@ -110,6 +130,7 @@ class GeoInfoService:
         else:
             self._handle_error_response(response)
 
+    @timed(GEO_INFO_REQUEST_DURATION, "create_intersection")
     async def create_intersection(
         self, intersection_dto: CreateIntersectionDTO
     ) -> Intersection:
@@ -121,15 +142,16 @@ class GeoInfoService:
         else:
             self._handle_error_response(response)
 
+    @timed(GEO_INFO_REQUEST_DURATION, "get_intersections")
     async def get_intersections(self) -> list[Intersection]:
         url = f"{self.base_url}/api/v1/intersections"
         response = await self.send_request(url)
         if response.status_code == 200:
-            data: list = response.json()
-            return [Intersection(**item) for item in data]
+            return INTERSECTION_LIST_ADAPTER.validate_json(response.content)
         else:
             self._handle_error_response(response)
 
+    @timed(GEO_INFO_REQUEST_DURATION, "create_traffic_light")
     async def create_traffic_light(
         self, traffic_light_dto: CreateTrafficLightDTO
     ) -> TrafficLight:
@@ -144,7 +166,7 @@ class GeoInfoService:
     async def send_request(
         self, url: str, params: dict | None = None
     ) -> httpx.Response:
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(transport=self.transport) as client:
             response = await client.get(
                 url, params=params, headers={"x-api-key": self.api_key}
             )
@@ -153,7 +175,7 @@ class GeoInfoService:
     async def send_post_request(
         self, url: str, body: dict | None = None
     ) -> httpx.Response:
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(transport=self.transport) as client:
             response = await client.post(
                 url, json=body, headers={"x-api-key": self.api_key}
             )
@@ -0,0 +1,14 @@
+from sqlmodel import SQLModel
+
+from app.core.models.user import UserBase
+
+
+class UserImportErrorDTO(SQLModel):
+    row: int
+    email: str | None = None
+    message: str
+
+
+class UserImportResultDTO(SQLModel):
+    created: list[UserBase]
+    errors: list[UserImportErrorDTO]
@@ -1,20 +1,29 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
-from app.core.dependencies import ModuleServiceDep
+from app.core.dependencies import AsyncModuleServiceDep, ListQueryDep
 from app.core.exceptions import get_entity_not_found_exception
+from app.core.list_query import partial_model, set_next_cursor
 from app.core.models.module import ModuleBase
 
 module_router = APIRouter(prefix="/api/iam/modules", tags=["modules"])
 
 
-@module_router.get("", response_model=list[ModuleBase])
-def get_all_modules(module_service: ModuleServiceDep, active: bool | None = None):
-    return module_service.get_all_modules(active=active)
+@module_router.get(
+    "",
+    response_model=list[partial_model(ModuleBase)],
+    response_model_exclude_unset=True,
+)
+async def get_all_modules(
+    response: Response, module_service: AsyncModuleServiceDep, query: ListQueryDep
+):
+    modules = await module_service.list_modules(query)
+    set_next_cursor(response, modules, query.limit)
+    return modules
 
 
 @module_router.get("/{module_id}", response_model=ModuleBase)
-def get_module_by_id(module_id: int, module_service: ModuleServiceDep):
-    module = module_service.get_module_by_id(module_id)
+async def get_module_by_id(module_id: int, module_service: AsyncModuleServiceDep):
+    module = await module_service.get_module_by_id(module_id)
     if module is None:
         raise get_entity_not_found_exception(f"Modulo con id {module_id} no encontrado")
 
@@ -5,8 +5,10 @@ from fastapi import APIRouter, HTTPException, Response, status
 from sqlalchemy.exc import IntegrityError
 
 from app.core.dependencies import (
+    AsyncRoleServiceDep,
     CreateRoleUseCaseDep,
     GetRolesWithModulesUseCaseDep,
+    ListQueryDep,
     RoleServiceDep,
     UpdateRoleUseCaseDep,
 )
@@ -16,20 +18,27 @@ from app.core.exceptions import (
     get_entity_not_found_exception,
     get_internal_server_error_exception,
 )
+from app.core.list_query import partial_model, set_next_cursor
 from app.core.models.role import RoleBase, RoleCreate, RoleUpdate
 from app.iam.dtos.role_with_modules import RoleWithModulesDTO
 
 role_router = APIRouter(prefix="/api/iam/roles", tags=["roles"])
 
 
-@role_router.get("", response_model=list[RoleBase])
-def get_all_roles(role_service: RoleServiceDep, active: bool | None = None):
-    return role_service.get_all_roles(active=active)
+@role_router.get(
+    "", response_model=list[partial_model(RoleBase)], response_model_exclude_unset=True
+)
+async def get_all_roles(
+    response: Response, role_service: AsyncRoleServiceDep, query: ListQueryDep
+):
+    roles = await role_service.list_roles(query)
+    set_next_cursor(response, roles, query.limit)
+    return roles
 
 
 @role_router.get("/{role_id:int}", response_model=RoleBase)
-def get_role_by_id(role_id: int, role_service: RoleServiceDep):
-    role = role_service.get_role_by_id(role_id)
+async def get_role_by_id(role_id: int, role_service: AsyncRoleServiceDep):
+    role = await role_service.get_role_by_id(role_id)
     if role is None:
         raise get_entity_not_found_exception(f"Rol con id {role_id} no encontrado")
 
@@ -89,13 +98,12 @@ def delete_role(role_id: int, role_service: RoleServiceDep):
 
 
 @role_router.get("/with-modules", response_model=list[RoleWithModulesDTO])
-def get_all_roles_with_modules(
+async def get_all_roles_with_modules(
     get_roles_with_modules_use_case: GetRolesWithModulesUseCaseDep,
     active: bool | None = None,
 ):
-    print("get_all_roles_with_modules")
     try:
-        return get_roles_with_modules_use_case.invoke(active=active)
+        return await get_roles_with_modules_use_case.invoke(active=active)
     except Exception as e:
         print(traceback.format_exc())
         logging.error(f"Error al obtener los roles con modulos: {e}")
@@ -1,14 +1,22 @@
+import csv
+import io
+import json
 import logging
 import traceback
 
-from fastapi import Response, status
+from fastapi import Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.routing import APIRouter
+from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError
 
 from app.core.dependencies import (
+    AsyncUserServiceDep,
     CreateUserUseCaseDep,
     EmailServiceDep,
     GetUsersWithRolesUseCaseDep,
+    ImportUsersUseCaseDep,
+    ListQueryDep,
     UpdateUserUseCaseDep,
     UserServiceDep,
 )
@@ -18,29 +26,55 @@ from app.core.exceptions import (
     get_entity_not_found_exception,
     get_internal_server_error_exception,
 )
+from app.core.list_query import partial_model, set_next_cursor
 from app.core.models.user import UserBase, UserCreate, UserUpdate
-from app.core.validations import is_valid_email
+from app.core.settings import settings
+from app.core.validations import get_user_create_error, is_valid_email
+from app.iam.dtos.user_import import UserImportErrorDTO, UserImportResultDTO
 from app.iam.dtos.user_with_roles import UserWithRolesDTO
 
 user_router = APIRouter(prefix="/api/iam/users", tags=["users"])
 
 
-@user_router.get("", response_model=list[UserBase])
-def get_all_users(user_service: UserServiceDep, active: bool | None = None):
-    return user_service.get_all_users(active=active)
+@user_router.get(
+    "", response_model=list[partial_model(UserBase)], response_model_exclude_unset=True
+)
+async def get_all_users(
+    response: Response, user_service: AsyncUserServiceDep, query: ListQueryDep
+):
+    users = await user_service.list_users(query)
+    set_next_cursor(response, users, query.limit)
+    return users
 
 
 @user_router.get("/with-roles", response_model=list[UserWithRolesDTO])
-def get_all_users_with_roles(
+async def get_all_users_with_roles(
+    response: Response,
     get_users_with_roles_use_case: GetUsersWithRolesUseCaseDep,
     active: bool | None = None,
+    after_id: int | None = None,
+    limit: int = Query(default=100, ge=1, le=500),
+    search: str | None = None,
+    role_id: int | None = None,
 ):
-    return get_users_with_roles_use_case.invoke(active=active)
+    """
+    Paginado por cursor: si hay más usuarios, `X-Next-Cursor` trae el
+    `after_id` de la siguiente página.
+    """
+    users = await get_users_with_roles_use_case.invoke(
+        active=active,
+        after_id=after_id,
+        limit=limit,
+        search=search,
+        role_id=role_id,
+    )
+    set_next_cursor(response, users, limit)
+    return users
 
 
 @user_router.get("/{user_id}", response_model=UserBase)
-def get_user_by_id(user_id: int, user_service: UserServiceDep):
-    user = user_service.get_user_by_id(user_id)
+async def get_user_by_id(user_id: int, user_service: AsyncUserServiceDep):
+    user = await user_service.get_user_by_id(user_id)
     if user is None:
         raise get_entity_not_found_exception(f"Usuario con id {user_id} no encontrado")
 
@@ -85,6 +119,38 @@ async def create_user(
         )
 
 
+@user_router.post("/import", response_model=UserImportResultDTO)
+async def import_users(
+    request: Request,
+    import_users_use_case: ImportUsersUseCaseDep,
+    email_service: EmailServiceDep,
+):
+    """
+    Crea varios usuarios desde un JSON (lista de `UserCreate`) o un CSV con las
+    columnas email, name, identification, roles (ids separados por `;`) y
+    external_login. El CSV puede enviarse como cuerpo `text/csv` o como el
+    archivo `file` de un formulario. Las filas con errores se reportan y se
+    omiten; las invitaciones se encolan después de crear los usuarios.
+    """
+    rows, parse_errors = await _parse_user_import(request)
+    if len(rows) + len(parse_errors) > settings.user_import_max_rows:
+        raise get_bad_request_exception(
+            f"Se admiten como máximo {settings.user_import_max_rows} filas por importación."
+        )
+
+    try:
+        result = await run_in_threadpool(import_users_use_case.invoke, rows)
+    except IntegrityError:
+        logging.exception("Conflicto de unicidad al importar usuarios")
+        raise get_conflict_exception(
+            "Otro proceso registró algunos de estos usuarios; intenta de nuevo."
+        )
+
+    await email_service.send_welcome_emails(result.created)
+    result.errors = sorted(parse_errors + result.errors, key=lambda error: error.row)
+    return result
+
+
 @user_router.put("/{user_id}", response_model=UserBase)
 def update_user(
     user_id: int, user: UserUpdate, update_user_use_case: UpdateUserUseCaseDep
@@ -117,16 +183,9 @@ def delete_user(user_id: int, user_service: UserServiceDep):
 
 
 def _validate_user_to_create(user: UserCreate):
-    if not user.email or not user.name or not user.identification:
-        raise get_bad_request_exception("Todos los campos son obligatorios.")
-
-    if not is_valid_email(user.email):
-        raise get_bad_request_exception(
-            "El correo electrónico no tiene un formato válido."
-        )
-
-    if not user.identification.isdigit():
-        raise get_bad_request_exception("La identificación debe contener solo números.")
+    error = get_user_create_error(user.email, user.name, user.identification)
+    if error is not None:
+        raise get_bad_request_exception(error)
 
     if not user.roles:
         user.roles = []
@@ -152,3 +211,105 @@ def _validate_user_to_update(user: "UserUpdate"):
         raise get_bad_request_exception("Roles debe ser una lista de números.")
 
     return True
+
+
+async def _parse_user_import(
+    request: Request,
+) -> tuple[list[tuple[int, UserCreate]], list[UserImportErrorDTO]]:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type == "multipart/form-data":
+        upload = (await request.form()).get("file")
+        if upload is None or isinstance(upload, str):
+            raise get_bad_request_exception("Debes adjuntar el archivo en 'file'.")
+        body = await upload.read()
+        is_csv = (upload.filename or "").lower().endswith(".csv") or (
+            upload.content_type == "text/csv"
+        )
+    else:
+        body = await request.body()
+        is_csv = content_type == "text/csv"
+        if not is_csv and content_type != "application/json":
+            raise get_bad_request_exception(
+                "Formato no soportado; usa application/json o text/csv."
+            )
+
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise get_bad_request_exception("El archivo debe estar codificado en UTF-8.")
+
+    if is_csv:
+        return _parse_users_csv(text)
+    return _parse_users_json(text)
+
+
+def _parse_users_json(
+    text: str,
+) -> tuple[list[tuple[int, UserCreate]], list[UserImportErrorDTO]]:
+    try:
+        items = json.loads(text)
+    except json.JSONDecodeError:
+        raise get_bad_request_exception("El cuerpo no es un JSON válido.")
+    if not isinstance(items, list):
+        raise get_bad_request_exception("Se esperaba una lista de usuarios.")
+
+    rows: list[tuple[int, UserCreate]] = []
+    errors: list[UserImportErrorDTO] = []
+    for row, item in enumerate(items, start=1):
+        try:
+            rows.append((row, UserCreate.model_validate(item)))
+        except ValidationError as e:
+            email = item.get("email") if isinstance(item, dict) else None
+            errors.append(
+                UserImportErrorDTO(row=row, email=email, message=_describe(e))
+            )
+    return rows, errors
+
+
+def _parse_users_csv(
+    text: str,
+) -> tuple[list[tuple[int, UserCreate]], list[UserImportErrorDTO]]:
+    reader = csv.DictReader(io.StringIO(text))
+    required = {"email", "name", "identification"}
+    if not required.issubset(reader.fieldnames or []):
+        raise get_bad_request_exception(
+            "El CSV debe tener las columnas email, name e identification."
+        )
+
+    rows: list[tuple[int, UserCreate]] = []
+    errors: list[UserImportErrorDTO] = []
+    for record in reader:
+        # Número de línea en el archivo, contando el encabezado
+        row = reader.line_num
+        roles = (record.get("roles") or "").strip()
+        external_login = (record.get("external_login") or "").strip().lower()
+        try:
+            user = UserCreate.model_validate(
+                {
+                    "email": (record.get("email") or "").strip(),
+                    "name": (record.get("name") or "").strip(),
+                    "identification": (record.get("identification") or "").strip(),
+                    "roles": [int(role) for role in roles.split(";") if role.strip()],
+                    "external_login": external_login
+                    in ("1", "true", "si", "sí", "yes"),
+                }
+            )
+        except ValueError as e:
+            message = (
+                _describe(e)
+                if isinstance(e, ValidationError)
+                else "Los roles deben ser ids numéricos separados por ';'."
+            )
+            errors.append(
+                UserImportErrorDTO(row=row, email=record.get("email"), message=message)
+            )
+            continue
+        rows.append((row, user))
+    return rows, errors
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+        for detail in error.errors()
+    )
@@ -16,3 +16,9 @@ class ModuleRoleService:
         Synchronizes the modules of a role with the given list of module IDs.
         """
         self.module_role_repository.sync_modules_for_role(role_id, module_ids)
+
+    def sync_roles_modules(self, modules_by_role: dict[int, list[int]]) -> None:
+        """
+        Synchronizes the modules of several roles at once.
+        """
+        self.module_role_repository.sync_roles_modules(modules_by_role)
@@ -1,8 +1,17 @@
 from collections import defaultdict
 
-from app.core.models.module import DbModule
-from app.core.repositories.module_repository import ModuleRepository
-from app.core.repositories.module_role_repository import ModuleRoleRepository
+from pydantic import BaseModel
+
+from app.core.list_query import ListQuery, partial_model
+from app.core.models.module import DbModule, ModuleBase
+from app.core.repositories.module_repository import (
+    AsyncModuleRepository,
+    ModuleRepository,
+)
+from app.core.repositories.module_role_repository import (
+    AsyncModuleRoleRepository,
+    ModuleRoleRepository,
+)
 
 
 class ModuleService:
@@ -19,7 +28,6 @@ class ModuleService:
         Gets all modules associated with a list of role IDs.
         """
         modules = self.module_repository.get_modules_by_role_ids(role_ids)
-        print(modules)
         return modules
 
     def get_modules_by_ids(self, module_ids: list[int]) -> list[DbModule]:
@@ -57,17 +65,68 @@ class ModuleService:
             return {rid: [] for rid in role_ids}
 
         modules = self.get_modules_by_ids(list(all_module_ids))
-        modules = [
-            module for module in modules if module.id is not None and module.active
-        ]
-        module_by_id = {m.id: m for m in modules if m.id is not None}
+        return _build_modules_map(role_ids, role_to_module_ids, modules)
+
+
+class AsyncModuleService:
+    def __init__(
+        self,
+        module_repository: AsyncModuleRepository,
+        module_role_repository: AsyncModuleRoleRepository | None = None,
+    ):
+        self.module_repository = module_repository
+        self.module_role_repository = module_role_repository
+
+    async def get_modules_by_role_ids(self, role_ids: list[int]) -> list[DbModule]:
+        return await self.module_repository.get_modules_by_role_ids(role_ids)
+
+    async def get_all_modules(self, active: bool | None = None) -> list[DbModule]:
+        if active is None:
+            return await self.module_repository.get_all_modules()
+        else:
+            return await self.module_repository.get_all_modules_by_active(active=active)
+
+    async def list_modules(self, query: ListQuery) -> list[BaseModel]:
+        rows = await self.module_repository.list_modules(
+            query, query.columns(ModuleBase)
+        )
+        item = partial_model(ModuleBase)
+        return [item.model_validate(row._mapping) for row in rows]
+
+    async def get_module_by_id(self, module_id: int) -> DbModule | None:
+        return await self.module_repository.get_module_by_id(module_id)
+
+    async def get_modules_map_by_role_ids(
+        self, role_ids: list[int]
+    ) -> dict[int, list[DbModule]]:
+        if not role_ids or self.module_role_repository is None:
+            return {}
+
+        role_to_module_ids = (
+            await self.module_role_repository.get_module_ids_map_by_role_ids(role_ids)
+        )
+        all_module_ids = {mid for mids in role_to_module_ids.values() for mid in mids}
+        if not all_module_ids:
+            return {rid: [] for rid in role_ids}
+
+        modules = await self.module_repository.get_modules_by_ids(list(all_module_ids))
+        return _build_modules_map(role_ids, role_to_module_ids, modules)
+
+
+def _build_modules_map(
+    role_ids: list[int],
+    role_to_module_ids: dict[int, list[int]],
+    modules: list[DbModule],
+) -> dict[int, list[DbModule]]:
+    modules = [module for module in modules if module.id is not None and module.active]
+    module_by_id = {m.id: m for m in modules if m.id is not None}
 
-        result: dict[int, list[DbModule]] = defaultdict(list)
-        for role_id, mids in role_to_module_ids.items():
-            result[role_id] = [module_by_id[mid] for mid in mids if mid in module_by_id]
+    result: dict[int, list[DbModule]] = defaultdict(list)
+    for role_id, mids in role_to_module_ids.items():
+        result[role_id] = [module_by_id[mid] for mid in mids if mid in module_by_id]
 
-        # Ensure every requested role_id is present in the map
-        for rid in role_ids:
-            result.setdefault(rid, [])
+    # Ensure every requested role_id is present in the map
+    for rid in role_ids:
+        result.setdefault(rid, [])
 
-        return dict(result)
+    return dict(result)
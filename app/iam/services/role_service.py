@@ -1,7 +1,10 @@
 from typing import Optional
 
-from app.core.models.role import DbRole, RoleCreate, RoleUpdate
-from app.core.repositories.role_repository import RoleRepository
+from pydantic import BaseModel
+
+from app.core.list_query import ListQuery, partial_model
+from app.core.models.role import DbRole, RoleBase, RoleCreate, RoleUpdate
+from app.core.repositories.role_repository import AsyncRoleRepository, RoleRepository
 
 
 class RoleService:
@@ -37,3 +40,30 @@ class RoleService:
 
     def get_roles_map_by_user_ids(self, user_ids: list[int]) -> dict[int, list[DbRole]]:
         return self.role_repository.get_roles_by_user_ids_map(user_ids)
+
+
+class AsyncRoleService:
+    def __init__(self, role_repository: AsyncRoleRepository):
+        self.role_repository = role_repository
+
+    async def get_roles_by_user_id(self, user_id: int) -> list[DbRole]:
+        return await self.role_repository.get_roles_by_user_id(user_id)
+
+    async def get_all_roles(self, active: bool | None = None) -> list[DbRole]:
+        if active is None:
+            return await self.role_repository.get_all_roles()
+        else:
+            return await self.role_repository.get_all_roles_by_active(active=active)
+
+    async def list_roles(self, query: ListQuery) -> list[BaseModel]:
+        rows = await self.role_repository.list_roles(query, query.columns(RoleBase))
+        item = partial_model(RoleBase)
+        return [item.model_validate(row._mapping) for row in rows]
+
+    async def get_role_by_id(self, role_id: int) -> Optional[DbRole]:
+        return await self.role_repository.get_role_by_id(role_id)
+
+    async def get_roles_map_by_user_ids(
+        self, user_ids: list[int]
+    ) -> dict[int, list[DbRole]]:
+        return await self.role_repository.get_roles_by_user_ids_map(user_ids)
@@ -34,3 +34,9 @@ class UserRoleService:
         Synchronizes the roles of a user with the given list of role IDs.
         """
         self.user_role_repository.sync_user_roles(user_id, role_ids)
+
+    def sync_users_roles(self, roles_by_user: dict[int, list[int]]) -> None:
+        """
+        Synchronizes the roles of several users at once.
+        """
+        self.user_role_repository.sync_users_roles(roles_by_user)
@@ -1,10 +1,19 @@
+from typing import Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import Row
+
+from app.core.list_query import ListQuery, partial_model
 from app.core.models.user import (
     UserBase,
     UserCreate,
     UserCreateWithPassword,
     UserUpdate,
 )
-from app.core.repositories.user_repository import UserRepository
+from app.core.repositories.user_repository import (
+    AsyncUserRepository,
+    UserRepository,
+)
 
 
 class UserService:
@@ -29,6 +38,20 @@ class UserService:
         db_user = self.user_repository.create_user(user_with_password)
         return UserBase.map_from_db(db_user)
 
+    def create_users(self, users: list[UserCreate]) -> list[UserBase]:
+        db_users = self.user_repository.create_users(
+            [UserCreateWithPassword(**user.model_dump(), password="") for user in users]
+        )
+        return [UserBase.map_from_db(db_user) for db_user in db_users]
+
+    def get_users_by_emails_or_identifications(
+        self, emails: list[str], identifications: list[str]
+    ) -> list[UserBase]:
+        db_users = self.user_repository.get_users_by_emails_or_identifications(
+            emails, identifications
+        )
+        return [UserBase.map_from_db(db_user) for db_user in db_users]
+
     def update_user(self, user_id: int, user: UserUpdate) -> UserBase | None:
         db_user = self.user_repository.update_user(user_id, user)
         if db_user:
@@ -40,3 +63,31 @@ class UserService:
         if db_user:
             return UserBase.map_from_db(db_user)
         return None
+
+
+class AsyncUserService:
+    def __init__(self, user_repository: AsyncUserRepository):
+        self.user_repository = user_repository
+
+    async def get_all_users(self, active: bool | None = None) -> list[UserBase]:
+        if active is None:
+            db_users = await self.user_repository.get_all_users()
+        else:
+            db_users = await self.user_repository.get_all_users_by_active(active=active)
+        return [UserBase.map_from_db(db_user) for db_user in db_users]
+
+    async def get_user_by_id(self, user_id: int) -> UserBase | None:
+        db_user = await self.user_repository.get_user_by_id(user_id)
+        if db_user:
+            return UserBase.map_from_db(db_user)
+        return None
+
+    async def get_users_with_roles(
+        self, query: ListQuery, role_id: int | None = None
+    ) -> Sequence[Row]:
+        return await self.user_repository.get_users_with_roles(query, role_id=role_id)
+
+    async def list_users(self, query: ListQuery) -> list[BaseModel]:
+        rows = await self.user_repository.list_users(query, query.columns(UserBase))
+        item = partial_model(UserBase)
+        return [item.model_validate(row._mapping) for row in rows]
@@ -1,3 +1,4 @@
+from app.core.database.unit_of_work import UnitOfWork
 from app.core.exceptions import get_bad_request_exception
 from app.core.models.role import RoleBase, RoleCreate
 from app.iam.services.module_role_service import ModuleRoleService
@@ -11,10 +12,12 @@ class CreateRoleUseCase:
         role_service: RoleService,
         module_service: ModuleService,
         module_role_service: ModuleRoleService,
+        unit_of_work: UnitOfWork,
     ):
         self.role_service = role_service
         self.module_service = module_service
         self.module_role_service = module_role_service
+        self.unit_of_work = unit_of_work
 
     def invoke(self, role_to_create: RoleCreate) -> RoleBase:
         # Validate modules
@@ -25,15 +28,18 @@ class CreateRoleUseCase:
                     "Uno o mas de los modulos seleccionados son invalidos."
                 )
 
-        # Create role
-        created_role = self.role_service.create_role(role_to_create)
-        if not created_role or not created_role.id:
-            raise get_bad_request_exception("No se pudo crear el rol.")
+        # Rol y módulos en una sola transacción
+        with self.unit_of_work:
+            created_role = self.role_service.create_role(role_to_create)
+            if not created_role or not created_role.id:
+                raise get_bad_request_exception("No se pudo crear el rol.")
 
-        # Assign modules to role
-        if role_to_create.modules:
-            self.module_role_service.assign_modules_to_role(
-                created_role.id, role_to_create.modules
-            )
+            if role_to_create.modules:
+                self.module_role_service.assign_modules_to_role(
+                    created_role.id, role_to_create.modules
+                )
+
+            # Copia antes del commit, que expira la instancia
+            role = RoleBase.model_validate(created_role, from_attributes=True)
 
-        return created_role
+        return role
@@ -1,5 +1,6 @@
 import uuid
 
+from app.core.database.unit_of_work import UnitOfWork
 from app.core.exceptions import get_bad_request_exception
 from app.core.models.user import UserBase, UserCreate
 from app.iam.services.role_service import RoleService
@@ -13,10 +14,12 @@ class CreateUserUseCase:
         user_service: UserService,
         role_service: RoleService,
         user_role_service: UserRoleService,
+        unit_of_work: UnitOfWork,
     ):
         self.user_service = user_service
         self.role_service = role_service
         self.user_role_service = user_role_service
+        self.unit_of_work = unit_of_work
 
     def invoke(self, user_to_create: UserCreate) -> UserBase:
         # Validate roles
@@ -34,15 +37,14 @@ class CreateUserUseCase:
             user_to_create.update_password_uuid = None
             user_to_create.must_change_password = False
 
-        # Create user
-        created_user = self.user_service.create_user(user_to_create)
-        print(created_user)
-        # Assign roles to user
-        if not created_user or not created_user.id:
-            raise get_bad_request_exception("No se pudo crear el usuario.")
+        # Usuario y roles en una sola transacción
+        with self.unit_of_work:
+            created_user = self.user_service.create_user(user_to_create)
+            if not created_user or not created_user.id:
+                raise get_bad_request_exception("No se pudo crear el usuario.")
 
-        self.user_role_service.assign_roles_to_user(
-            created_user.id, user_to_create.roles
-        )
+            self.user_role_service.assign_roles_to_user(
+                created_user.id, user_to_create.roles
+            )
 
         return created_user
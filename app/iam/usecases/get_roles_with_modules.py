@@ -5,24 +5,27 @@ from app.core.exceptions import get_internal_server_error_exception
 from app.core.models.module import ModuleBase
 from app.core.models.role import RoleBase
 from app.iam.dtos.role_with_modules import RoleWithModulesDTO
-from app.iam.services.module_service import ModuleService
-from app.iam.services.role_service import RoleService
+from app.iam.services.module_service import AsyncModuleService
+from app.iam.services.role_service import AsyncRoleService
 
 
 class GetRolesWithModulesUseCase:
-    def __init__(self, role_service: RoleService, module_service: ModuleService):
+    def __init__(
+        self, role_service: AsyncRoleService, module_service: AsyncModuleService
+    ):
         self.role_service = role_service
         self.module_service = module_service
 
-    def invoke(self, active: bool | None = None) -> list[RoleWithModulesDTO]:
-        print("get_roles_with_modules_use_case")
+    async def invoke(self, active: bool | None = None) -> list[RoleWithModulesDTO]:
         try:
-            roles = self.role_service.get_all_roles(active=active)
+            roles = await self.role_service.get_all_roles(active=active)
             if not roles:
                 return []
 
             role_ids = [r.id for r in roles if r.id is not None]
-            modules_map = self.module_service.get_modules_map_by_role_ids(role_ids)
+            modules_map = await self.module_service.get_modules_map_by_role_ids(
+                role_ids
+            )
 
             result: list[RoleWithModulesDTO] = []
             for role in roles:
@@ -1,42 +1,85 @@
+from typing import Any
+
 from app.auth.models.dtos import UserWithModulesDTO
+from app.core.cache.permission_cache import PermissionCache, PermissionSnapshot
 from app.core.models.module import ModuleBase
 from app.core.models.role import RoleBase
 from app.core.models.user import UserBase
-from app.iam.services.module_service import ModuleService
-from app.iam.services.role_service import RoleService
-from app.iam.services.user_service import UserService
+from app.iam.services.module_service import AsyncModuleService
+from app.iam.services.role_service import AsyncRoleService
+from app.iam.services.user_service import AsyncUserService
 
 
 class GetUserWithModulesUseCase:
     """
     Use case to retrieve a user's details along with all the modules they have access to
     through their assigned roles.
+
+    With a permission cache the roles and modules are served from a snapshot of the
+    user's role set, and the database is only queried when the permissions version
+    changes.
     """
 
     def __init__(
         self,
-        user_service: UserService,
-        module_service: ModuleService,
-        role_service: RoleService,
+        user_service: AsyncUserService,
+        module_service: AsyncModuleService,
+        role_service: AsyncRoleService,
+        permission_cache: PermissionCache | None = None,
     ):
         self.user_service = user_service
         self.module_service = module_service
         self.role_service = role_service
+        self.permission_cache = permission_cache
 
-    def invoke(self, user: UserBase) -> UserWithModulesDTO:
+    async def invoke(
+        self, user: UserBase, claims: dict[str, Any] | None = None
+    ) -> UserWithModulesDTO:
         if user.id is None:
             raise ValueError("User ID cannot be None")
 
-        roles = self.role_service.get_roles_by_user_id(user.id)
-        if not roles:
-            return UserWithModulesDTO(modules=[], **user.model_dump())
+        version = None
+        if self.permission_cache is not None:
+            version = await self.permission_cache.get_version()
+
+        if version is None:
+            snapshot = await self._load_snapshot(user.id)
+            return self._to_dto(user, snapshot)
+
+        # Los claims `roles` y `pv` del token evitan buscar los roles del
+        # usuario mientras la versión de permisos no cambie.
+        role_ids: list[int] | None = None
+        if claims is not None and claims.get("pv") == version:
+            role_ids = claims.get("roles")
+        if role_ids is None:
+            role_ids = await self.permission_cache.get_user_role_ids(version, user.id)
+
+        snapshot = None
+        if role_ids is not None:
+            snapshot = await self.permission_cache.get_snapshot(version, role_ids)
+
+        if snapshot is None:
+            snapshot = await self._load_snapshot(user.id)
+            role_ids = [role.id for role in snapshot.roles if role.id is not None]
+            await self.permission_cache.set_user_role_ids(version, user.id, role_ids)
+            await self.permission_cache.set_snapshot(version, role_ids, snapshot)
+
+        return self._to_dto(user, snapshot)
 
+    async def _load_snapshot(self, user_id: int) -> PermissionSnapshot:
+        roles = await self.role_service.get_roles_by_user_id(user_id)
         role_ids = [role.id for role in roles if role.id is not None]
         if not role_ids:
-            return UserWithModulesDTO(modules=[], **user.model_dump())
+            return PermissionSnapshot(roles=[], modules=[])
 
-        modules = self.module_service.get_modules_by_role_ids(role_ids)
-        modules = [ModuleBase.model_validate(module) for module in modules]
-        roles = [RoleBase.model_validate(role) for role in roles]
+        modules = await self.module_service.get_modules_by_role_ids(role_ids)
+        return PermissionSnapshot(
+            roles=[RoleBase.model_validate(role) for role in roles],
+            modules=[ModuleBase.model_validate(module) for module in modules],
+        )
 
-        return UserWithModulesDTO(modules=modules, roles=roles, **user.model_dump())
+    @staticmethod
+    def _to_dto(user: UserBase, snapshot: PermissionSnapshot) -> UserWithModulesDTO:
+        return UserWithModulesDTO(
+            modules=snapshot.modules, roles=snapshot.roles, **user.model_dump()
+        )
@@ -1,27 +1,31 @@
-from app.core.models.role import RoleBase
+import json
+
+from app.core.list_query import ListQuery
 from app.iam.dtos.user_with_roles import UserWithRolesDTO
-from app.iam.services.role_service import RoleService
-from app.iam.services.user_service import UserService
+from app.iam.services.user_service import AsyncUserService
 
 
 class GetUsersWithRolesUseCase:
-    def __init__(self, user_service: UserService, role_service: RoleService):
+    def __init__(self, user_service: AsyncUserService):
         self.user_service = user_service
-        self.role_service = role_service
-
-    def invoke(self, active: bool | None = None) -> list[UserWithRolesDTO]:
-        users = self.user_service.get_all_users(active=active)
-        if not users:
-            return []
-
-        user_ids = [u.id for u in users if u.id is not None]
-        roles_map = self.role_service.get_roles_map_by_user_ids(user_ids)
-
-        result: list[UserWithRolesDTO] = []
-        for user in users:
-            roles = roles_map.get(user.id or -1, [])
-            roles = [RoleBase.model_validate(role) for role in roles]
-            dto: UserWithRolesDTO = UserWithRolesDTO(roles=roles, **user.model_dump())
-            result.append(dto)
 
-        return result
+    async def invoke(
+        self,
+        active: bool | None = None,
+        after_id: int | None = None,
+        limit: int = 100,
+        search: str | None = None,
+        role_id: int | None = None,
+    ) -> list[UserWithRolesDTO]:
+        """
+        Una página de usuarios con sus roles activos, en una sola consulta.
+        La siguiente página empieza después del id del último usuario.
+        """
+        query = ListQuery(after_id=after_id, limit=limit, active=active, search=search)
+        rows = await self.user_service.get_users_with_roles(query, role_id=role_id)
+        return [
+            UserWithRolesDTO.model_validate(
+                {**row._mapping, "roles": json.loads(row.roles or "[]")}
+            )
+            for row in rows
+        ]
@@ -0,0 +1,97 @@
+import uuid
+
+from app.core.models.user import UserCreate
+from app.core.validations import get_user_create_error
+from app.iam.dtos.user_import import UserImportErrorDTO, UserImportResultDTO
+from app.iam.services.role_service import RoleService
+from app.iam.services.user_service import UserService
+
+
+class ImportUsersUseCase:
+    """
+    Crea muchos usuarios a la vez. Las filas inválidas (datos, roles
+    inexistentes, email o identificación repetidos) se reportan y se omiten;
+    las demás se insertan juntas en una sola transacción.
+    """
+
+    def __init__(self, user_service: UserService, role_service: RoleService):
+        self.user_service = user_service
+        self.role_service = role_service
+
+    def invoke(self, rows: list[tuple[int, UserCreate]]) -> UserImportResultDTO:
+        errors: list[UserImportErrorDTO] = []
+
+        def reject(row: int, user: UserCreate, message: str) -> None:
+            errors.append(
+                UserImportErrorDTO(row=row, email=user.email, message=message)
+            )
+
+        valid: list[tuple[int, UserCreate]] = []
+        email_rows: dict[str, int] = {}
+        identification_rows: dict[str, int] = {}
+        for row, user in rows:
+            error = get_user_create_error(user.email, user.name, user.identification)
+            if error is not None:
+                reject(row, user, error)
+                continue
+
+            email = user.email.lower()
+            if email in email_rows:
+                reject(
+                    row, user, f"El email está repetido en la fila {email_rows[email]}."
+                )
+                continue
+            if user.identification in identification_rows:
+                reject(
+                    row,
+                    user,
+                    "La identificación está repetida en la fila "
+                    f"{identification_rows[user.identification]}.",
+                )
+                continue
+
+            email_rows[email] = row
+            identification_rows[user.identification] = row
+            valid.append((row, user))
+
+        # Roles y usuarios existentes se validan con una consulta cada uno
+        role_ids = sorted({role_id for _, user in valid for role_id in user.roles})
+        found_role_ids = {
+            role.id for role in self.role_service.get_roles_by_ids(role_ids)
+        }
+        existing = self.user_service.get_users_by_emails_or_identifications(
+            [user.email for _, user in valid],
+            [user.identification for _, user in valid],
+        )
+        taken_emails = {user.email.lower() for user in existing}
+        taken_identifications = {user.identification for user in existing}
+
+        to_create: list[UserCreate] = []
+        for row, user in valid:
+            missing = [
+                role_id for role_id in user.roles if role_id not in found_role_ids
+            ]
+            if missing:
+                reject(row, user, f"Roles inválidos: {missing}.")
+            elif user.email.lower() in taken_emails:
+                reject(row, user, f"Ya existe un usuario con el email '{user.email}'.")
+            elif user.identification in taken_identifications:
+                reject(
+                    row,
+                    user,
+                    "Ya existe un usuario con la identificación "
+                    f"'{user.identification}'.",
+                )
+            else:
+                if user.external_login:
+                    user.update_password_uuid = None
+                    user.must_change_password = False
+                else:
+                    user.update_password_uuid = str(uuid.uuid4())
+                    user.must_change_password = True
+                to_create.append(user)
+
+        created = self.user_service.create_users(to_create)
+        return UserImportResultDTO(
+            created=created, errors=sorted(errors, key=lambda error: error.row)
+        )
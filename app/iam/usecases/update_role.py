@@ -1,3 +1,4 @@
+from app.core.database.unit_of_work import UnitOfWork
 from app.core.exceptions import (
     get_bad_request_exception,
     get_entity_not_found_exception,
@@ -14,10 +15,12 @@ class UpdateRoleUseCase:
         role_service: RoleService,
         module_service: ModuleService,
         module_role_service: ModuleRoleService,
+        unit_of_work: UnitOfWork,
     ):
         self.role_service = role_service
         self.module_service = module_service
         self.module_role_service = module_role_service
+        self.unit_of_work = unit_of_work
 
     def invoke(self, role_id: int, role_to_update: RoleUpdate) -> RoleBase:
         # Validate role exists
@@ -33,21 +36,20 @@ class UpdateRoleUseCase:
                     "Uno o mas de los modulos seleccionados son invalidos."
                 )
 
-        # Update role
-        updated_role = self.role_service.update_role(role_id, role_to_update)
-        if not updated_role:
-            raise get_entity_not_found_exception(
-                f"No se pudo actualizar el rol con id {role_id}"
-            )
+        # Rol y módulos en una sola transacción
+        with self.unit_of_work:
+            updated_role = self.role_service.update_role(role_id, role_to_update)
+            if not updated_role:
+                raise get_entity_not_found_exception(
+                    f"No se pudo actualizar el rol con id {role_id}"
+                )
 
-        # Sync modules
-        if role_to_update.modules is not None:
-            self.module_role_service.sync_modules_for_role(
-                role_id, role_to_update.modules
-            )
+            if role_to_update.modules is not None:
+                self.module_role_service.sync_modules_for_role(
+                    role_id, role_to_update.modules
+                )
 
-        updated_role = self.role_service.get_role_by_id(role_id)
-        if not updated_role:
-            raise get_entity_not_found_exception(f"Rol con id {role_id} no encontrado")
+            # Copia antes del commit, que expira la instancia
+            role = RoleBase.model_validate(updated_role, from_attributes=True)
 
-        return updated_role
+        return role
@@ -1,3 +1,4 @@
+from app.core.database.unit_of_work import UnitOfWork
 from app.core.exceptions import (
     get_bad_request_exception,
     get_entity_not_found_exception,
@@ -14,10 +15,12 @@ class UpdateUserUseCase:
         user_service: UserService,
         role_service: RoleService,
         user_role_service: UserRoleService,
+        unit_of_work: UnitOfWork,
     ):
         self.user_service = user_service
         self.role_service = role_service
         self.user_role_service = user_role_service
+        self.unit_of_work = unit_of_work
 
     def invoke(self, user_id: int, user_to_update: UserUpdate) -> UserBase:
         # Validate user exists
@@ -35,22 +38,15 @@ class UpdateUserUseCase:
                     "Uno o mas de los roles seleccionados son invalidos."
                 )
 
-        # Update user
-        updated_user = self.user_service.update_user(user_id, user_to_update)
-        if not updated_user:
-            raise get_entity_not_found_exception(
-                f"No se pudo actualizar el usuario con id {user_id}"
-            )
-
-        # Sync roles
-        if user_to_update.roles is not None:
-            self.user_role_service.sync_user_roles(user_id, user_to_update.roles)
+        # Usuario y roles en una sola transacción
+        with self.unit_of_work:
+            updated_user = self.user_service.update_user(user_id, user_to_update)
+            if not updated_user:
+                raise get_entity_not_found_exception(
+                    f"No se pudo actualizar el usuario con id {user_id}"
+                )
 
-        # Return user with updated data
-        updated_user = self.user_service.get_user_by_id(user_id)
-        if not updated_user:
-            raise get_entity_not_found_exception(
-                f"Usuario con id {user_id} no encontrado"
-            )
+            if user_to_update.roles is not None:
+                self.user_role_service.sync_user_roles(user_id, user_to_update.roles)
 
         return updated_user
@@ -1,12 +1,20 @@
 import logging
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import APIRouter, Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.auth.routes.auth import auth_router
-from app.core.dependencies import validate_token
-from app.core.settings import settings
+from app.core.container import AppContainer
+from app.core.dependencies import require_module, validate_token
+from app.core.email.routes import email_outbox_router
+from app.core.metrics.middleware import MetricsMiddleware, QueryStatsMiddleware
+from app.core.metrics.routes import metrics_router
+from app.core.profiling.middleware import ProfilingMiddleware
+from app.core.profiling.routes import profiling_router
+from app.core.profiling.sampler import profiler, route_profiles
+from app.core.settings import email_settings, settings
 from app.geo.routes.geo import geo_router, public_geo_router
 from app.iam.routes.module import module_router
 from app.iam.routes.role import role_router
@@ -14,7 +22,19 @@ from app.iam.routes.user import user_router
 
 router = APIRouter(prefix="/api")
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    container = AppContainer(settings, email_settings)
+    app.state.container = container
+    container.start()
+
+    yield
+
+    await container.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 logging.basicConfig(level=logging.INFO)
 
@@ -25,15 +45,49 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
+)
+
+app.add_middleware(
+    # pyrefly: ignore
+    ProfilingMiddleware,
+    profiler=profiler,
+    route_profiles=route_profiles,
+    output_dir=settings.profiler_output_dir,
+    allowed_users=settings.profiler_allowed_users,
+    on_demand_enabled=settings.profiler_enabled,
+    sample_rate=settings.profiler_sample_rate,
+)
+app.add_middleware(
+    # pyrefly: ignore
+    QueryStatsMiddleware,
+    detect_repeated_statements=settings.env == "development",
+    repeated_statement_threshold=settings.sql_repeated_statement_threshold,
 )
+# Se agrega despues de CORS para que quede por fuera y mida la petición completa.
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(router)
+app.include_router(metrics_router)
+app.include_router(profiling_router)
+app.include_router(email_outbox_router)
 app.include_router(auth_router)
-app.include_router(user_router, dependencies=[Depends(validate_token)])
-app.include_router(role_router, dependencies=[Depends(validate_token)])
-app.include_router(module_router, dependencies=[Depends(validate_token)])
+# Cada router exige el módulo (por su `path` en la tabla `modules`) cuando
+# MODULE_AUTHORIZATION_ENABLED está activo.
+app.include_router(
+    user_router, dependencies=[Depends(validate_token), require_module("/users")]
+)
+app.include_router(
+    role_router, dependencies=[Depends(validate_token), require_module("/roles")]
+)
+app.include_router(
+    module_router, dependencies=[Depends(validate_token), require_module("/roles")]
+)
 app.include_router(public_geo_router)
-app.include_router(geo_router, dependencies=[Depends(validate_token)])
+app.include_router(
+    geo_router,
+    dependencies=[Depends(validate_token), require_module("/intersections")],
+)
 
 
 def start():
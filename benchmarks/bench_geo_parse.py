@@ -0,0 +1,109 @@
+"""
+Micro-benchmark del parseo de respuestas del geo-info service.
+
+Compara el costo por fila de construir los modelos uno a uno a partir de
+`response.json()` contra `TypeAdapter.validate_json` sobre los bytes crudos.
+
+Uso: python -m benchmarks.bench_geo_parse --rows 1000 --repeat 20
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from functools import partial
+
+from app.geo.models.geo_info_service_models import Intersection, TrafficLight
+from app.geo.services.geo_info_service import (
+    INTERSECTION_LIST_ADAPTER,
+    TRAFFIC_LIGHT_LIST_ADAPTER,
+)
+
+
+def build_intersections_payload(rows: int) -> bytes:
+    return json.dumps(
+        [
+            {
+                "id": i,
+                "street_a_id": i * 2,
+                "street_a_name": f"Calle {i}",
+                "street_b_id": i * 2 + 1,
+                "street_b_name": f"Carrera {i}",
+                "distance_meters": 12.5,
+                "geojson": {
+                    "type": "Point",
+                    "coordinates": [-74.8 + i / 10000, 10.9 + i / 10000],
+                },
+            }
+            for i in range(rows)
+        ]
+    ).encode()
+
+
+def build_traffic_lights_payload(rows: int) -> bytes:
+    return json.dumps(
+        [
+            {
+                "id": i,
+                "name": f"semaforo-{i}",
+                "intersection_id": i // 2,
+                "latitude": 10.9 + i / 10000,
+                "longitude": -74.8 + i / 10000,
+                "key_hash": "x" * 64,
+                "active": True,
+                "created_at": "2025-01-01T00:00:00",
+                "updated_at": "2025-01-02T00:00:00",
+            }
+            for i in range(rows)
+        ]
+    ).encode()
+
+
+def parse_per_item(model: Callable[..., object], raw: bytes) -> list[object]:
+    return [model(**item) for item in json.loads(raw)]
+
+
+def measure(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    cases = [
+        (
+            "intersections",
+            build_intersections_payload(args.rows),
+            Intersection,
+            INTERSECTION_LIST_ADAPTER,
+        ),
+        (
+            "traffic-lights",
+            build_traffic_lights_payload(args.rows),
+            TrafficLight,
+            TRAFFIC_LIGHT_LIST_ADAPTER,
+        ),
+    ]
+
+    print(f"{'payload':<16}{'strategy':<28}{'us/row':>10}")
+    for name, raw, model, adapter in cases:
+        # `partial` fija los valores de esta iteración del loop
+        strategies: dict[str, Callable[[], object]] = {
+            "json() + Model(**item)": partial(parse_per_item, model, raw),
+            "TypeAdapter.validate_json": partial(adapter.validate_json, raw),
+        }
+        for strategy, fn in strategies.items():
+            elapsed = measure(fn, args.repeat)
+            print(f"{name:<16}{strategy:<28}{elapsed / args.rows * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
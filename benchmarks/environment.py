@@ -0,0 +1,280 @@
+"""
+Entorno in-process para los benchmarks: la app ASGI real con SQLite en un
+archivo temporal como base de datos (compartido por el engine síncrono y el
+asíncrono), fakeredis como Redis y el stand-in local del
+geo-info service.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from contextlib import ExitStack
+from unittest.mock import patch
+
+BENCHMARK_ENV = {
+    "ENV": "benchmark",
+    "DB_URL": "sqlite://",
+    "MAIL_FROM": "benchmark@example.com",
+    "JWT_SECRET_KEY": "benchmark-secret",
+}
+
+for key, value in BENCHMARK_ENV.items():
+    os.environ.setdefault(key, value)
+
+BENCHMARK_PASSWORD = "benchmark-password"
+
+
+class BenchmarkEnvironment:
+    def __init__(self, users: int = 200, roles: int = 10, modules: int = 15):
+        self.users = users
+        self.roles = roles
+        self.modules = modules
+        self._stack = ExitStack()
+        self._standins: dict[int, object] = {}
+
+    def __enter__(self) -> "BenchmarkEnvironment":
+        import fakeredis
+        from fastapi.testclient import TestClient
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlmodel import Session, SQLModel, create_engine
+        from sqlmodel.ext.asyncio.session import AsyncSession
+
+        from app.core.cache.permission_cache import permission_cache
+        from app.core.cache.user_cache import user_cache
+        from app.core.database.connection import (
+            get_async_session,
+            get_read_session,
+            get_session,
+        )
+        from app.core.database.instrumentation import instrument_engine
+        from app.core.email.outbox import email_outbox
+        from app.core.security.module_index import module_index
+        from app.core.security.refresh_tokens import refresh_token_store
+        from app.core.security.revocation import revocation_store
+        from app.core.settings import settings
+        from app.main import app
+
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+        self.app = app
+        database_dir = self._stack.enter_context(tempfile.TemporaryDirectory())
+        self.database_dir = database_dir
+        database_path = os.path.join(database_dir, "benchmark.db")
+        self.engine = instrument_engine(
+            create_engine(
+                f"sqlite:///{database_path}",
+                connect_args={"check_same_thread": False},
+            )
+        )
+        self._stack.callback(self.engine.dispose)
+        SQLModel.metadata.create_all(self.engine)
+        self._seed()
+
+        def get_benchmark_session():
+            with Session(self.engine) as session:
+                yield session
+
+        self.async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+        instrument_engine(self.async_engine.sync_engine)
+
+        async def get_benchmark_async_session():
+            async with AsyncSession(
+                self.async_engine, expire_on_commit=False
+            ) as session:
+                yield session
+
+        app.dependency_overrides[get_session] = get_benchmark_session
+        app.dependency_overrides[get_read_session] = get_benchmark_async_session
+        app.dependency_overrides[get_async_session] = get_benchmark_async_session
+        self._stack.callback(app.dependency_overrides.clear)
+
+        redis_server = fakeredis.FakeServer()
+        self.redis = fakeredis.FakeRedis(server=redis_server, decode_responses=True)
+        self.async_redis = fakeredis.FakeAsyncRedis(
+            server=redis_server, decode_responses=True
+        )
+        self._stack.enter_context(
+            patch("app.geo.routes.geo.get_redis_client", return_value=self.redis)
+        )
+        for cache in (user_cache, permission_cache):
+            self._stack.enter_context(
+                patch.multiple(
+                    cache,
+                    redis_factory=lambda: self.redis,
+                    async_redis_factory=lambda: self.async_redis,
+                )
+            )
+        self._stack.enter_context(
+            patch.object(email_outbox, "async_redis_factory", lambda: self.async_redis)
+        )
+        # Los correos quedan en el outbox; no hay servidor SMTP al que enviarlos
+        self._stack.enter_context(
+            patch.object(settings, "email_outbox_worker_enabled", False)
+        )
+        for store in (revocation_store, refresh_token_store):
+            self._stack.enter_context(
+                patch.object(store, "redis_factory", lambda: self.redis)
+            )
+        self._stack.enter_context(
+            patch.object(
+                revocation_store, "async_redis_factory", lambda: self.async_redis
+            )
+        )
+        self._stack.enter_context(
+            patch.multiple(
+                module_index,
+                session_factory=lambda: Session(self.engine),
+                loaded=False,
+                version=None,
+                _listener=None,
+            )
+        )
+        for cache in (user_cache, permission_cache):
+            cache.local.clear()
+            self._stack.callback(cache.local.clear)
+
+        self.client = self._stack.enter_context(TestClient(app))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stack.close()
+
+    def _seed(self) -> None:
+        import bcrypt
+        from sqlmodel import Session
+
+        from app.core.models.module import DbModule
+        from app.core.models.module_role import DbModuleRole
+        from app.core.models.role import DbRole
+        from app.core.models.user import DbUser
+        from app.core.models.user_role import DbUserRole
+
+        password = bcrypt.hashpw(BENCHMARK_PASSWORD.encode(), bcrypt.gensalt())
+
+        with Session(self.engine) as session:
+            session.add_all(
+                DbModule(
+                    id=i,
+                    name=f"module-{i}",
+                    description=f"Módulo {i}",
+                    path=f"/module-{i}",
+                    icon="icon",
+                )
+                for i in range(1, self.modules + 1)
+            )
+            session.add_all(
+                DbRole(id=i, name=f"role-{i}", description=f"Rol {i}")
+                for i in range(1, self.roles + 1)
+            )
+            session.add_all(
+                DbUser(
+                    id=i,
+                    email=self.email_for(i),
+                    name=f"Usuario {i}",
+                    identification=str(1_000_000 + i),
+                    password=password.decode(),
+                )
+                for i in range(1, self.users + 1)
+            )
+            session.add_all(
+                DbModuleRole(role_id=role_id, module_id=module_id)
+                for role_id in range(1, self.roles + 1)
+                for module_id in range(1, self.modules + 1)
+                if (role_id + module_id) % 3 == 0
+            )
+            # Con un solo rol los dos desplazamientos coinciden: el par es único
+            session.add_all(
+                DbUserRole(user_id=user_id, role_id=role_id)
+                for user_id in range(1, self.users + 1)
+                for role_id in dict.fromkeys(
+                    (user_id + offset) % self.roles + 1 for offset in (0, 1)
+                )
+            )
+            session.commit()
+
+    @staticmethod
+    def email_for(user_id: int) -> str:
+        return f"user{user_id}@example.com"
+
+    def token_for(self, user_id: int = 1) -> str:
+        from app.core.security.jwt_service import create_access_token
+
+        return create_access_token(data={"sub": self.email_for(user_id)})
+
+    def auth_headers(self, user_id: int = 1) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.token_for(user_id)}"}
+
+    def use_stale_replica(self) -> None:
+        """
+        Dirige las lecturas de réplica a una copia de la base en su estado
+        actual; los cambios posteriores solo llegan a la primaria, como una
+        réplica atrasada.
+        """
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlmodel.ext.asyncio.session import AsyncSession
+
+        from app.core.database.connection import get_read_session
+
+        replica_path = os.path.join(self.database_dir, "replica.db")
+        shutil.copyfile(os.path.join(self.database_dir, "benchmark.db"), replica_path)
+        replica_engine = create_async_engine(f"sqlite+aiosqlite:///{replica_path}")
+
+        async def get_replica_session():
+            async with AsyncSession(replica_engine, expire_on_commit=False) as session:
+                yield session
+
+        self.app.dependency_overrides[get_read_session] = get_replica_session
+
+    def use_intersections(self, count: int, reporting_fraction: float = 0.5) -> None:
+        """
+        Apunta `GeoInfoService` a un stand-in con `count` intersecciones y
+        registra heartbeats en Redis para una fracción de ellas.
+        """
+        import httpx
+
+        from app.core.dependencies import get_geo_info_service
+        from app.geo.services.geo_info_service import GeoInfoService
+        from tools.geo_info_standin.app import StandinConfig, create_standin_app
+
+        if count not in self._standins:
+            self._standins[count] = create_standin_app(
+                StandinConfig(intersections=count, traffic_lights=0)
+            )
+        transport = httpx.ASGITransport(app=self._standins[count])
+        self.app.dependency_overrides[get_geo_info_service] = lambda: GeoInfoService(
+            base_url="http://geo-standin", api_key="", transport=transport
+        )
+
+        self.redis.flushall()
+        now = int(time.time())
+        for intersection_id in range(1, int(count * reporting_fraction) + 1):
+            self.redis.set(
+                f"intersection:{intersection_id}:state",
+                json.dumps(
+                    {
+                        **heartbeat_payload(),
+                        "intersection_id": intersection_id,
+                        "last_seen": now,
+                    }
+                ),
+                ex=30,
+            )
+
+
+def heartbeat_payload() -> dict:
+    return {
+        "device_name": "esp32-semaforo-1",
+        "ip": "192.168.1.123",
+        "semaforo1_verde": 20,
+        "semaforo2_verde": 20,
+        "all_red_time": 2,
+        "estado_restante_s": 1,
+        "ciclo_restante_s": 41,
+        "next_semaforo1": 20,
+        "next_semaforo2": 20,
+        "next_fetched": False,
+        "estado": "S1_VERDE",
+    }
@@ -0,0 +1,117 @@
+import json
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+from pydantic import BaseModel
+
+
+class BenchmarkResult(BaseModel):
+    name: str
+    iterations: int
+    median_us: float
+    mean_us: float
+    p95_us: float
+    min_us: float
+    ops_per_s: float
+
+
+class BenchmarkRun(BaseModel):
+    created_at: datetime
+    python: str
+    machine: str
+    results: dict[str, BenchmarkResult]
+
+
+class Regression(BaseModel):
+    name: str
+    baseline_us: float
+    current_us: float
+    change: float
+
+
+def measure(
+    name: str, fn: Callable[[], object], iterations: int, warmup: int
+) -> BenchmarkResult:
+    for _ in range(warmup):
+        fn()
+
+    samples: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+
+    samples.sort()
+    median = statistics.median(samples)
+    return BenchmarkResult(
+        name=name,
+        iterations=iterations,
+        median_us=median,
+        mean_us=statistics.fmean(samples),
+        p95_us=samples[min(len(samples) - 1, int(0.95 * len(samples)))],
+        min_us=samples[0],
+        ops_per_s=1e6 / median if median else 0.0,
+    )
+
+
+def new_run(results: list[BenchmarkResult]) -> BenchmarkRun:
+    return BenchmarkRun(
+        created_at=datetime.now(timezone.utc),
+        python=platform.python_version(),
+        machine=f"{platform.system()}-{platform.machine()}",
+        results={result.name: result for result in results},
+    )
+
+
+def save_run(run: BenchmarkRun, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(run.model_dump_json(indent=2), encoding="utf-8")
+
+
+def load_run(path: Path) -> BenchmarkRun:
+    return BenchmarkRun.model_validate(json.loads(path.read_text(encoding="utf-8")))
+
+
+def find_regressions(
+    baseline: BenchmarkRun, current: BenchmarkRun, threshold: float
+) -> list[Regression]:
+    """
+    Compara medianas y devuelve los casos que empeoraron más que `threshold`
+    (fracción, 0.10 = 10%) respecto al baseline.
+    """
+    regressions: list[Regression] = []
+    for name, result in current.results.items():
+        previous = baseline.results.get(name)
+        if previous is None or previous.median_us == 0:
+            continue
+
+        change = result.median_us / previous.median_us - 1
+        if change > threshold:
+            regressions.append(
+                Regression(
+                    name=name,
+                    baseline_us=previous.median_us,
+                    current_us=result.median_us,
+                    change=change,
+                )
+            )
+    return regressions
+
+
+def render_comparison(baseline: BenchmarkRun | None, current: BenchmarkRun) -> str:
+    lines = [f"{'benchmark':<40}{'median':>12}{'p95':>12}{'ops/s':>10}{'vs base':>10}"]
+    for name, result in current.results.items():
+        delta = ""
+        if baseline is not None and name in baseline.results:
+            previous = baseline.results[name].median_us
+            if previous:
+                delta = f"{(result.median_us / previous - 1):+.1%}"
+        lines.append(
+            f"{name:<40}{result.median_us:>10.1f}us{result.p95_us:>10.1f}us"
+            f"{result.ops_per_s:>10.0f}{delta:>10}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,172 @@
+"""
+Suite de benchmarks de las rutas calientes de la API.
+
+Ejecuta la app ASGI real en proceso (SQLite en memoria, fakeredis y el
+stand-in del geo-info service), guarda los resultados como JSON y los compara
+contra un baseline.
+
+Ejemplos:
+    python -m benchmarks.run --save-baseline
+    python -m benchmarks.run --threshold 0.10
+    python -m benchmarks.run -k intersections
+"""
+
+import argparse
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+from benchmarks.environment import (
+    BENCHMARK_PASSWORD,
+    BenchmarkEnvironment,
+    heartbeat_payload,
+)
+from benchmarks.harness import (
+    BenchmarkResult,
+    find_regressions,
+    load_run,
+    measure,
+    new_run,
+    render_comparison,
+    save_run,
+)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_BASELINE = RESULTS_DIR / "baseline.json"
+DEFAULT_OUTPUT = RESULTS_DIR / "latest.json"
+
+
+def expect_ok(response) -> None:
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.url}: {response.status_code}")
+
+
+def build_cases(
+    env: BenchmarkEnvironment, scale: float
+) -> list[tuple[str, Callable[[], object], int, Callable[[], None] | None]]:
+    from app.core.dependencies import decode_access_token
+
+    client = env.client
+    headers = env.auth_headers()
+    token = env.token_for()
+    heartbeat = heartbeat_payload()
+
+    def iterations(base: int) -> int:
+        return max(1, int(base * scale))
+
+    cases: list[tuple[str, Callable[[], object], int, Callable[[], None] | None]] = [
+        (
+            "heartbeat",
+            lambda: expect_ok(
+                client.post("/api/geo/intersections/1/heartbeat", json=heartbeat)
+            ),
+            iterations(500),
+            None,
+        ),
+        ("validate_token", lambda: decode_access_token(token), iterations(5000), None),
+        (
+            "auth_me",
+            lambda: expect_ok(client.get("/api/auth/me", headers=headers)),
+            iterations(300),
+            None,
+        ),
+        (
+            "iam_users_with_roles",
+            lambda: expect_ok(client.get("/api/iam/users/with-roles", headers=headers)),
+            iterations(100),
+            None,
+        ),
+        (
+            "iam_roles",
+            lambda: expect_ok(client.get("/api/iam/roles", headers=headers)),
+            iterations(300),
+            None,
+        ),
+        (
+            "login",
+            lambda: expect_ok(
+                client.post(
+                    "/api/auth/login",
+                    data={
+                        "username": env.email_for(1),
+                        "password": BENCHMARK_PASSWORD,
+                    },
+                )
+            ),
+            iterations(10),
+            None,
+        ),
+    ]
+
+    for count, base_iterations in ((100, 200), (1_000, 50), (10_000, 10)):
+        cases.append(
+            (
+                f"get_all_intersections[{count}]",
+                lambda: expect_ok(
+                    client.get("/api/geo/intersections", headers=headers)
+                ),
+                iterations(base_iterations),
+                lambda count=count: env.use_intersections(count),
+            )
+        )
+
+    return cases
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-k", dest="pattern", default="", help="Filtra por nombre")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Regresión máxima tolerada sobre la mediana (0.10 = 10%%)",
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiplicador de iteraciones"
+    )
+    parser.add_argument("--users", type=int, default=200)
+    args = parser.parse_args()
+
+    results: list[BenchmarkResult] = []
+    with BenchmarkEnvironment(users=args.users) as env:
+        for name, fn, iterations, setup in build_cases(env, args.scale):
+            if args.pattern not in name:
+                continue
+            if setup is not None:
+                setup()
+            results.append(
+                measure(name, fn, iterations, warmup=max(1, iterations // 10))
+            )
+            print(f"  {name}: {results[-1].median_us:.1f}us", file=sys.stderr)
+
+    run = new_run(results)
+    save_run(run, args.output)
+
+    baseline = load_run(args.baseline) if args.baseline.exists() else None
+    print(render_comparison(baseline, run))
+
+    if args.save_baseline:
+        save_run(run, args.baseline)
+        print(f"\nBaseline guardado en {args.baseline}")
+        return 0
+
+    if baseline is None:
+        return 0
+
+    regressions = find_regressions(baseline, run, args.threshold)
+    for regression in regressions:
+        print(
+            f"REGRESIÓN {regression.name}: {regression.baseline_us:.1f}us -> "
+            f"{regression.current_us:.1f}us ({regression.change:+.1%})"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
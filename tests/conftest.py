@@ -0,0 +1,6 @@
+import os
+
+# Settings are read at import time; provide values that let the app load
+# without a real MySQL database or mail server.
+os.environ.setdefault("DB_URL", "sqlite://")
+os.environ.setdefault("MAIL_FROM", "tests@example.com")
@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+
+from benchmarks.harness import (
+    BenchmarkResult,
+    BenchmarkRun,
+    find_regressions,
+    load_run,
+    measure,
+    save_run,
+)
+
+
+def build_run(**medians: float) -> BenchmarkRun:
+    return BenchmarkRun(
+        created_at=datetime.now(timezone.utc),
+        python="3.13",
+        machine="test",
+        results={
+            name: BenchmarkResult(
+                name=name,
+                iterations=1,
+                median_us=median,
+                mean_us=median,
+                p95_us=median,
+                min_us=median,
+                ops_per_s=1e6 / median,
+            )
+            for name, median in medians.items()
+        },
+    )
+
+
+def test_find_regressions_flags_only_cases_over_threshold():
+    baseline = build_run(login=100.0, auth_me=100.0, heartbeat=100.0)
+    current = build_run(login=125.0, auth_me=105.0, heartbeat=80.0, new_case=1.0)
+
+    regressions = find_regressions(baseline, current, threshold=0.10)
+
+    assert [r.name for r in regressions] == ["login"]
+    assert round(regressions[0].change, 2) == 0.25
+
+
+def test_runs_round_trip_through_json(tmp_path):
+    run = build_run(heartbeat=12.5)
+    path = tmp_path / "baseline.json"
+
+    save_run(run, path)
+
+    assert load_run(path) == run
+
+
+def test_measure_collects_requested_iterations():
+    calls = []
+
+    result = measure("noop", lambda: calls.append(1), iterations=20, warmup=5)
+
+    assert len(calls) == 25
+    assert result.iterations == 20
+    assert result.min_us <= result.median_us <= result.p95_us
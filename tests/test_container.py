@@ -0,0 +1,50 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine
+
+from app.core.container import AppContainer, RequestContainer
+from app.core.database.connection import get_session
+from app.core.dependencies import (
+    AuthServiceDep,
+    CreateUserUseCaseDep,
+    GeoInfoServiceDep,
+    UserServiceDep,
+)
+from app.core.settings import email_settings, settings
+
+
+def test_app_services_are_shared_and_request_objects_are_not():
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.dependency_overrides[get_session] = lambda: Session(engine)
+    seen = []
+
+    @app.get("/probe")
+    async def probe(
+        geo_info_service: GeoInfoServiceDep,
+        auth_service: AuthServiceDep,
+        user_service: UserServiceDep,
+        create_user_use_case: CreateUserUseCaseDep,
+    ):
+        seen.append((geo_info_service, auth_service, user_service))
+        # Dentro de la petición se reutiliza el mismo servicio
+        assert create_user_use_case.user_service is user_service
+        assert auth_service.user_repository is user_service.user_repository
+
+    client = TestClient(app)
+    assert client.get("/probe").status_code == 200
+    assert client.get("/probe").status_code == 200
+
+    (geo_1, auth_1, users_1), (geo_2, auth_2, users_2) = seen
+    assert geo_1 is geo_2
+    assert geo_1 is app.state.container.geo_info_service
+    assert auth_1 is not auth_2
+    assert users_1 is not users_2
+
+
+def test_request_container_builds_only_what_is_used():
+    container = RequestContainer(
+        Session(create_engine("sqlite://")), AppContainer(settings, email_settings)
+    )
+    assert container.user_service is container.user_service
+    assert "role_repository" not in vars(container)
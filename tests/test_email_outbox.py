@@ -0,0 +1,154 @@
+import asyncio
+
+import fakeredis
+
+from app.core.email.models.email import EmailSettings
+from app.core.email.outbox import (
+    OUTBOX_DEAD_KEY,
+    OUTBOX_DUE_KEY,
+    OUTBOX_MESSAGES_KEY,
+    EmailOutbox,
+)
+from app.core.email.services.email_service import EmailService
+from app.core.email.services.outbox_worker import EmailOutboxWorker
+from app.core.email.services.smtp_sender import SmtpSender
+from app.core.email.templates import EmailTemplates
+from tools.smtp_sink.server import SmtpSink
+
+
+def build_worker(sink: SmtpSink, outbox: EmailOutbox, **kwargs) -> EmailOutboxWorker:
+    email_settings = EmailSettings(
+        MAIL_USERNAME="",
+        MAIL_PASSWORD="",
+        MAIL_FROM="noreply@example.com",
+        MAIL_PORT=sink.port,
+        MAIL_SERVER=sink.host,
+        MAIL_FROM_NAME="Semáforos",
+        TEMPLATE_FOLDER="",
+        MAIL_STARTTLS=False,
+        USE_CREDENTIALS=False,
+    )
+    return EmailOutboxWorker(
+        outbox, SmtpSender(email_settings), EmailTemplates(), **kwargs
+    )
+
+
+def test_worker_sends_queued_emails_over_one_connection():
+    async def scenario():
+        sink = SmtpSink()
+        await sink.start()
+        redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        outbox = EmailOutbox(lease=60, async_redis_factory=lambda: redis_client)
+        worker = build_worker(sink, outbox, batch_size=10)
+        service = EmailService(outbox)
+        try:
+            for i in range(3):
+                await service.send_welcome_email(
+                    f"user{i}@example.com", f"<Usuario {i}>", f"token-{i}"
+                )
+            # Encolar no envía nada
+            assert sink.messages == []
+
+            assert await worker.drain_once() == 3
+            assert await worker.drain_once() == 0
+        finally:
+            await worker.sender.close()
+            await sink.stop()
+        return sink, redis_client
+
+    sink, redis_client = asyncio.run(scenario())
+
+    assert sink.connections == 1
+    assert [message.recipients for message in sink.messages] == [
+        [f"user{i}@example.com"] for i in range(3)
+    ]
+    body = sink.messages[0].parse().get_payload(decode=True).decode()
+    assert "&lt;Usuario 0&gt;" in body
+    assert "token=token-0" in body
+
+
+def test_failed_emails_are_retried_then_dead_lettered():
+    async def scenario():
+        sink = SmtpSink()
+        await sink.start()
+        redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        outbox = EmailOutbox(lease=60, async_redis_factory=lambda: redis_client)
+        worker = build_worker(sink, outbox, max_attempts=2, retry_backoff=0)
+        try:
+            await outbox.enqueue("welcome.html", "Hola", ["a@example.com"], {})
+            sink.fail_next = 1
+            await worker.drain_once()
+            assert sink.messages == []
+
+            # El reintento sale en el siguiente ciclo
+            await worker.drain_once()
+            assert len(sink.messages) == 1
+
+            await outbox.enqueue("missing.html", "Hola", ["b@example.com"], {})
+            await worker.drain_once()
+            await worker.drain_once()
+            assert await worker.drain_once() == 0
+            return await redis_client.lrange(OUTBOX_DEAD_KEY, 0, -1)
+        finally:
+            await worker.sender.close()
+            await sink.stop()
+
+    dead = asyncio.run(scenario())
+    assert len(dead) == 1
+    assert "missing.html" in dead[0]
+
+
+def test_unacknowledged_claims_return_after_the_lease():
+    async def scenario():
+        redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        outbox = EmailOutbox(lease=60, async_redis_factory=lambda: redis_client)
+        message = await outbox.enqueue("welcome.html", "Hola", ["a@example.com"], {})
+
+        assert [claimed.id for claimed in await outbox.claim(10)] == [message.id]
+        assert await outbox.claim(10) == []
+
+        # El worker que lo reclamó murió sin confirmar
+        outbox.lease = 0
+        await redis_client.zadd("email:outbox:due", {message.id: 0})
+        assert [claimed.id for claimed in await outbox.claim(10)] == [message.id]
+
+    asyncio.run(scenario())
+
+
+def test_claim_drops_orphaned_ids_and_dead_letters_invalid_payloads():
+    async def scenario():
+        redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        outbox = EmailOutbox(lease=60, async_redis_factory=lambda: redis_client)
+        message = await outbox.enqueue("welcome.html", "Hola", ["a@example.com"], {})
+        await redis_client.zadd(OUTBOX_DUE_KEY, {"orphan": 0, "broken": 0})
+        await redis_client.hset(OUTBOX_MESSAGES_KEY, "broken", "{no es json")
+
+        claimed = await outbox.claim(10)
+        return redis_client, message, claimed
+
+    redis_client, message, claimed = asyncio.run(scenario())
+
+    assert [item.id for item in claimed] == [message.id]
+    remaining = asyncio.run(redis_client.zrange(OUTBOX_DUE_KEY, 0, -1))
+    assert remaining == [message.id]
+    assert asyncio.run(redis_client.lrange(OUTBOX_DEAD_KEY, 0, -1)) == ["{no es json"]
+
+
+def test_drain_endpoint_requires_the_cron_secret():
+    from unittest.mock import patch
+
+    from app.core.settings import settings
+    from benchmarks.environment import BenchmarkEnvironment
+
+    with BenchmarkEnvironment(users=1, roles=1) as env:
+        path = "/internal/email-outbox/drain"
+        assert env.client.get(path).status_code == 403
+
+        with patch.object(settings, "cron_secret", "s3cret"):
+            assert env.client.get(path).status_code == 401
+            wrong = {"Authorization": "Bearer otro"}
+            assert env.client.post(path, headers=wrong).status_code == 401
+
+            response = env.client.get(path, headers={"Authorization": "Bearer s3cret"})
+            assert response.status_code == 200
+            assert response.json() == {"processed": 0}
@@ -0,0 +1,56 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from app.geo.models.geo_info_service_models import Intersection, TrafficLight
+from app.geo.services.geo_info_service import GeoInfoService
+
+
+def build_service(status_code: int, payload: object) -> GeoInfoService:
+    service = GeoInfoService(base_url="http://geo.local", api_key="key")
+    service.send_request = AsyncMock(
+        return_value=httpx.Response(status_code, content=json.dumps(payload).encode())
+    )
+    return service
+
+
+def test_get_intersections_parses_raw_bytes():
+    service = build_service(
+        200,
+        [
+            {"id": 1, "street_a_name": "Calle 1", "geojson": {"type": "Point"}},
+            {"id": 2, "street_b_name": "Carrera 2", "extra": "ignored"},
+        ],
+    )
+
+    intersections = asyncio.run(service.get_intersections())
+
+    assert intersections == [
+        Intersection(id=1, street_a_name="Calle 1", geojson={"type": "Point"}),
+        Intersection(id=2, street_b_name="Carrera 2"),
+    ]
+
+
+def test_get_traffic_lights_parses_raw_bytes():
+    service = build_service(
+        200,
+        [{"id": 7, "name": "s-7", "active": True, "created_at": "2025-01-01T00:00:00"}],
+    )
+
+    traffic_lights = asyncio.run(service.get_traffic_lights(intersection_id=3))
+
+    assert len(traffic_lights) == 1
+    assert isinstance(traffic_lights[0], TrafficLight)
+    assert traffic_lights[0].created_at is not None
+    assert traffic_lights[0].created_at.year == 2025
+
+
+def test_get_intersection_by_point_rejects_invalid_rows():
+    service = build_service(200, [{"id": "not-a-number"}])
+
+    with pytest.raises(ValidationError):
+        asyncio.run(service.get_intersection_by_point(10.9, -74.8, 100))
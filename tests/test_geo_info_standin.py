@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.geo.services.geo_info_service import GeoInfoService
+from tools.geo_info_standin.app import StandinConfig, create_standin_app
+from tools.geo_info_standin.cassette import Cassette, RecordedResponse
+
+
+def build_service(config: StandinConfig) -> GeoInfoService:
+    return GeoInfoService(
+        base_url="http://geo-standin",
+        api_key=config.api_key or "",
+        transport=httpx.ASGITransport(app=create_standin_app(config)),
+    )
+
+
+def test_synthetic_city_serves_contracts():
+    service = build_service(StandinConfig(intersections=50, traffic_lights=120))
+
+    intersections = asyncio.run(service.get_intersections())
+    traffic_lights = asyncio.run(service.get_traffic_lights(intersection_id=1))
+    neighborhood = asyncio.run(service.get_neighborhood_by_point(10.96, -74.78))
+
+    assert len(intersections) == 50
+    assert {t.intersection_id for t in traffic_lights} == {1}
+    assert len(traffic_lights) == 3
+    assert neighborhood["city_name"] == "Barranquilla"
+
+
+def test_nearby_intersections_are_sorted_by_distance():
+    service = build_service(StandinConfig(intersections=400))
+    center = asyncio.run(service.get_intersections())[210]
+    longitude, latitude = center.geojson["coordinates"]
+
+    nearby = asyncio.run(service.get_intersection_by_point(latitude, longitude, 150))
+
+    assert nearby[0].id == center.id
+    distances = [item.distance_meters for item in nearby]
+    assert distances == sorted(distances)
+
+
+def test_error_injection_surfaces_as_http_exception():
+    service = build_service(StandinConfig(error_rate=1.0, error_status_code=503))
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(service.get_intersections())
+
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.detail == "Error inyectado"
+
+
+def test_replay_serves_recorded_responses(tmp_path):
+    cassette_path = tmp_path / "cassette.json"
+    cassette = Cassette(str(cassette_path))
+    cassette.put(
+        Cassette.build_key("GET", "/api/v1/intersections", []),
+        RecordedResponse(
+            status_code=200,
+            content_type="application/json",
+            body='[{"id": 99, "street_a_name": "Calle 72"}]',
+        ),
+    )
+
+    service = build_service(
+        StandinConfig(mode="replay", cassette_path=str(cassette_path))
+    )
+    intersections = asyncio.run(service.get_intersections())
+
+    assert [i.id for i in intersections] == [99]
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(service.get_traffic_lights())
+    assert exc_info.value.status_code == 404
@@ -0,0 +1,70 @@
+import asyncio
+import random
+
+import httpx
+from fastapi import FastAPI, Response
+
+from app.geo.models.geo_info_service_models import IntersectionHeartbeat
+from tools.heartbeat_loadgen.controller import AMBER_S, VirtualController
+from tools.heartbeat_loadgen.runner import HeartbeatLoadGenerator, LoadConfig
+
+
+def build_controller() -> VirtualController:
+    controller = VirtualController(7, random.Random(1), started_at=0.0)
+    controller.cycle_started_at = 0.0
+    return controller
+
+
+def test_controller_walks_the_full_cycle():
+    controller = build_controller()
+
+    states = [
+        controller.state_at(second + 0.5).estado
+        for second in range(controller.cycle_length)
+    ]
+
+    assert states[0] == "S1_VERDE"
+    assert states[20:23] == ["S1_AMARILLO"] * AMBER_S
+    assert states[23:27] == ["S1_ROJO", "ALL_RED", "ALL_RED", "S2_ROJO_AMARILLO"]
+    assert states[27] == "S2_VERDE"
+    assert states[-1] == "S1_ROJO_AMARILLO"
+
+
+def test_controller_fetches_and_adopts_next_plan():
+    controller = build_controller()
+    cycle_length = controller.cycle_length
+
+    mid_cycle = controller.state_at(cycle_length / 2 + 0.1)
+    next_cycle = controller.state_at(cycle_length + 0.1)
+
+    assert mid_cycle.next_fetched is True
+    assert next_cycle.next_fetched is False
+    assert next_cycle.estado == "S1_VERDE"
+    assert next_cycle.semaforo1_verde == mid_cycle.next_semaforo1
+    assert next_cycle.semaforo2_verde == mid_cycle.next_semaforo2
+
+
+def test_load_generator_reports_throughput_and_errors():
+    app = FastAPI()
+
+    @app.post("/api/geo/intersections/{intersection_id}/heartbeat")
+    async def heartbeat(intersection_id: int, data: IntersectionHeartbeat):
+        if intersection_id == 1:
+            return Response(status_code=500)
+        return {"status": "ok"}
+
+    config = LoadConfig(
+        target_url="http://traffic-api",
+        controllers=4,
+        duration_s=0.3,
+        interval_s=0.05,
+        jitter_s=0.01,
+    )
+    generator = HeartbeatLoadGenerator(config, transport=httpx.ASGITransport(app=app))
+
+    report = asyncio.run(generator.run())
+
+    assert report.requests > 4
+    assert 0 < report.errors < report.requests
+    assert report.p50_ms <= report.p99_ms <= report.max_ms
+    assert report.redis_ops_per_s is None
@@ -0,0 +1,81 @@
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.auth.services.google_auth_service import GoogleAuthService
+from app.auth.services.jwks_cache import JwksCache, parse_max_age
+from app.auth.services.microsoft_auth_service import MicrosoftAuthService
+from tools.jwks_standin.keys import SigningKeys
+
+CLIENT_ID = "client-id.apps.googleusercontent.com"
+
+
+def build_service(keys: SigningKeys, **options) -> GoogleAuthService:
+    jwks = JwksCache(
+        "https://jwks-standin/certs",
+        provider="google",
+        client=httpx.Client(transport=httpx.MockTransport(keys.handler)),
+        **options,
+    )
+    return GoogleAuthService(client_id=CLIENT_ID, jwks=jwks)
+
+
+def test_parse_max_age():
+    assert parse_max_age("public, max-age=19845, must-revalidate") == 19845
+    assert parse_max_age("no-cache") is None
+    assert parse_max_age(None) is None
+
+
+def test_certificates_are_downloaded_once_per_max_age():
+    keys = SigningKeys(issuer="https://accounts.google.com", audience=CLIENT_ID)
+    service = build_service(keys)
+
+    for _ in range(5):
+        user = service.get_user_info(keys.mint("ana@example.com", "Ana"))
+        assert user.email == "ana@example.com"
+
+    assert keys.fetches == 1
+
+
+def test_unknown_kid_refreshes_once_and_rejects_foreign_tokens():
+    keys = SigningKeys(issuer="https://accounts.google.com", audience=CLIENT_ID)
+    service = build_service(keys, min_refresh_interval=0)
+    service.get_user_info(keys.mint("ana@example.com"))
+
+    keys.rotate()
+    assert service.get_user_info(keys.mint("ana@example.com")).name == ""
+    assert keys.fetches == 2
+
+    other = SigningKeys(issuer="https://accounts.google.com", audience="otro")
+    with pytest.raises(HTTPException) as error:
+        service.get_user_info(other.mint("ana@example.com"))
+    assert error.value.status_code == 401
+
+
+def test_microsoft_keys_are_prefetched_and_refreshed_on_interval():
+    keys = SigningKeys(
+        issuer="https://login.microsoftonline.com/tenant/v2.0", audience=CLIENT_ID
+    )
+    jwks = JwksCache(
+        "https://jwks-standin/certs",
+        provider="microsoft",
+        client=httpx.Client(transport=httpx.MockTransport(keys.handler)),
+        refresh_interval=0.05,
+    )
+    service = MicrosoftAuthService(client_id=CLIENT_ID, tenant_id="tenant", jwks=jwks)
+
+    jwks.start()
+    try:
+        deadline = time.monotonic() + 2
+        while keys.fetches < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert keys.fetches >= 3
+    finally:
+        jwks.stop()
+
+    fetches = keys.fetches
+    user = service.get_user_info(keys.mint("luis@example.com", "Luis"))
+    assert user.email == "luis@example.com"
+    assert keys.fetches == fetches
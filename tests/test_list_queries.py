@@ -0,0 +1,89 @@
+import re
+from datetime import datetime, timedelta
+
+from sqlmodel import Session, select
+
+from app.core.models.role import DbRole
+from benchmarks.environment import BenchmarkEnvironment
+
+
+def query_count(response) -> int:
+    match = re.search(r"(\d+) queries", response.headers["server-timing"])
+    assert match is not None
+    return int(match.group(1))
+
+
+def fetch_all(env, path: str, params: dict) -> list[dict]:
+    items: list[dict] = []
+    after_id = None
+    while True:
+        response = env.client.get(
+            path,
+            params=params | ({"after_id": after_id} if after_id else {}),
+            headers=env.auth_headers(),
+        )
+        assert response.status_code == 200
+        items += response.json()
+        after_id = response.headers.get("x-next-cursor")
+        if after_id is None:
+            return items
+
+
+def test_lists_are_keyset_paginated_and_projected():
+    with BenchmarkEnvironment(users=30, roles=12, modules=7) as env:
+        users = fetch_all(env, "/api/iam/users", {"limit": 7, "fields": "name,email"})
+        assert [user["id"] for user in users] == list(range(1, 31))
+        # Solo las columnas pedidas, más el id que sirve de cursor
+        assert users[0] == {"id": 1, "name": "Usuario 1", "email": env.email_for(1)}
+
+        roles = fetch_all(env, "/api/iam/roles", {"limit": 5, "fields": ["name"]})
+        assert [role["name"] for role in roles] == [f"role-{i}" for i in range(1, 13)]
+
+        modules = fetch_all(env, "/api/iam/modules", {"limit": 3})
+        assert len(modules) == 7
+        assert set(modules[0]) >= {"id", "name", "path", "icon", "active"}
+
+        # La consulta no depende del tamaño de la tabla ni de la página
+        small = env.client.get(
+            "/api/iam/users", params={"limit": 1}, headers=env.auth_headers()
+        )
+        large = env.client.get(
+            "/api/iam/users",
+            params={"limit": 30, "after_id": 0},
+            headers=env.auth_headers(),
+        )
+        assert query_count(small) == query_count(large)
+
+
+def test_list_filters_are_applied_in_sql():
+    with BenchmarkEnvironment(users=5, roles=6) as env:
+        cutoff = datetime.now() + timedelta(days=1)
+        with Session(env.engine) as session:
+            for role in session.exec(select(DbRole).where(DbRole.id > 3)).all():
+                role.active = False
+                session.add(role)
+            role = session.get(DbRole, 6)
+            assert role is not None
+            role.creation_date = cutoff + timedelta(days=1)
+            session.add(role)
+            session.commit()
+
+        def role_ids(params: dict) -> list[int]:
+            response = env.client.get(
+                "/api/iam/roles", params=params, headers=env.auth_headers()
+            )
+            assert response.status_code == 200
+            return [role["id"] for role in response.json()]
+
+        assert role_ids({"active": "true"}) == [1, 2, 3]
+        assert role_ids({"active": "false", "created_to": cutoff.isoformat()}) == [4, 5]
+        assert role_ids({"created_from": cutoff.isoformat()}) == [6]
+        assert role_ids({"search": "role-2"}) == [2]
+        assert role_ids({"search": "Rol 5", "fields": "id"}) == [5]
+
+        response = env.client.get(
+            "/api/iam/users",
+            params={"fields": "name,password"},
+            headers=env.auth_headers(),
+        )
+        assert response.status_code == 400
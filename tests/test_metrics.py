@@ -0,0 +1,148 @@
+import logging
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from app.core.database.instrumentation import DB_QUERY_DURATION, instrument_engine
+from app.core.database.pool import (
+    DB_POOL_CHECKOUT_DURATION,
+    DB_POOL_CONNECTIONS,
+    InstrumentedQueuePool,
+    engine_options,
+    observe_pool,
+)
+from app.core.metrics.middleware import MetricsMiddleware, QueryStatsMiddleware
+from app.core.metrics.registry import MetricsRegistry
+from app.core.metrics.routes import metrics_router
+from app.core.settings import Settings
+
+
+def test_counter_sums_every_thread_shard():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs", labels=("kind",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc("a")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.values() == {("a",): 4000}
+    assert 'jobs_total{kind="a"} 4000' in registry.render()
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    output = registry.render()
+
+    assert 'latency_seconds_bucket{le="0.1"} 1' in output
+    assert 'latency_seconds_bucket{le="1"} 2' in output
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in output
+    assert "latency_seconds_count 3" in output
+
+
+def test_middleware_records_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    client.get("/items/1")
+    client.get("/items/2")
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'http_requests_total{method="GET",route="/items/{item_id}",status="200"} 2'
+        in response.text
+    )
+    assert "/items/1" not in response.text
+
+
+def test_instrumented_engine_times_queries():
+    engine = instrument_engine(create_engine("sqlite://"))
+    before = DB_QUERY_DURATION.values().get(("SELECT",), [0.0])[-1]
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert DB_QUERY_DURATION.values()[("SELECT",)][-1] == before + 1
+
+
+def test_query_stats_middleware_reports_server_timing_and_repeats(caplog):
+    engine = instrument_engine(create_engine("sqlite://"))
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, detect_repeated_statements=True)
+
+    @app.get("/roles")
+    def get_roles():
+        with engine.connect() as connection:
+            for role_id in range(3):
+                connection.execute(text("SELECT :id"), {"id": role_id})
+        return []
+
+    with caplog.at_level(logging.WARNING):
+        response = TestClient(app).get("/roles")
+
+    assert response.headers["server-timing"].endswith('desc="3 queries"')
+    assert "Posible N+1 en GET /roles" in caplog.text
+
+
+def test_engine_options_follow_pool_mode():
+    queue = engine_options(Settings(db_url="mysql+pymysql://u:p@db/app"))
+    null = engine_options(
+        Settings(db_url="mysql+pymysql://u:p@db/app", db_pool_mode="null")
+    )
+
+    assert queue["poolclass"] is InstrumentedQueuePool
+    assert queue["pool_pre_ping"] is True
+    assert null == {"poolclass": NullPool}
+
+
+def test_instrumented_pool_reports_checkouts_and_connections(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool
+    )
+    observe_pool(engine, "test")
+    before = DB_POOL_CHECKOUT_DURATION.values().get(("test",), [0.0])[-1]
+
+    with engine.connect():
+        assert DB_POOL_CONNECTIONS.values()[("test", "in_use")] == 1
+
+    assert DB_POOL_CONNECTIONS.values()[("test", "in_use")] == 0
+    assert DB_POOL_CHECKOUT_DURATION.values()[("test",)][-1] == before + 1
+
+
+def test_replica_pools_report_checkouts_under_their_own_label(tmp_path):
+    primary, replica = (
+        create_engine(
+            f"sqlite:///{tmp_path / name}.db", poolclass=InstrumentedQueuePool
+        )
+        for name in ("primary", "replica")
+    )
+    observe_pool(primary, "async")
+    observe_pool(replica, "replica-0")
+    before = DB_POOL_CHECKOUT_DURATION.values().get(("replica-0",), [0.0])[-1]
+
+    replica.dispose()
+    with replica.connect():
+        pass
+
+    assert DB_POOL_CHECKOUT_DURATION.values()[("replica-0",)][-1] == before + 1
+    assert primary.pool.metrics_label == "async"
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+from sqlmodel import Session
+
+from app.core.cache.permission_cache import permission_cache
+from app.core.database.repositories.module_role_repository_impl import (
+    ModuleRoleRepositoryImpl,
+)
+from app.core.database.repositories.user_role_repository_impl import (
+    UserRoleRepositoryImpl,
+)
+from app.core.models.module import DbModule
+from app.core.models.module_role import DbModuleRole
+from app.core.security.jwt_service import create_access_token
+from app.core.security.module_index import ModuleIndex, module_index
+from app.core.settings import settings
+from benchmarks.environment import BenchmarkEnvironment
+
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_routers_require_a_granted_module():
+    with (
+        BenchmarkEnvironment(users=5, roles=10) as env,
+        patch.object(settings, "module_authorization_enabled", True),
+    ):
+        # El usuario 1 tiene los roles 2 y 3; el usuario 3, los roles 4 y 5
+        with Session(env.engine) as session:
+            session.add(
+                DbModule(id=100, name="users", description="", path="/users", icon="")
+            )
+            session.add(DbModuleRole(role_id=2, module_id=100))
+            session.commit()
+
+        def headers(email: str, roles: list[int]) -> dict[str, str]:
+            token = create_access_token(data={"sub": email, "roles": roles, "pv": 0})
+            return {"Authorization": f"Bearer {token}"}
+
+        allowed = headers(env.email_for(1), [2, 3])
+        assert env.client.get("/api/iam/users", headers=allowed).status_code == 200
+        assert (
+            env.client.get(
+                "/api/iam/users", headers=headers(env.email_for(3), [4, 5])
+            ).status_code
+            == 403
+        )
+        # Sin claims los roles se resuelven desde la base de datos
+        assert (
+            env.client.get("/api/iam/users", headers=env.auth_headers(1)).status_code
+            == 200
+        )
+
+        with Session(env.engine) as session:
+            ModuleRoleRepositoryImpl(
+                session, permission_cache=permission_cache
+            ).sync_modules_for_role(2, [])
+
+        assert wait_until(lambda: module_index.version == 1)
+        assert env.client.get("/api/iam/users", headers=allowed).status_code == 403
+
+
+def test_concurrent_first_requests_load_the_index_once():
+    with BenchmarkEnvironment(users=5, roles=10) as env:
+        index = ModuleIndex(permission_cache, lambda: Session(env.engine))
+        reloads = 0
+        reload = index._reload
+
+        def slow_reload() -> None:
+            nonlocal reloads
+            reloads += 1
+            time.sleep(0.05)
+            reload()
+
+        with patch.object(index, "_reload", slow_reload):
+            threads = [
+                threading.Thread(target=index.ensure_current, args=(0,))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert reloads == 1
+        assert index.is_current(0)
+
+
+def test_stale_replica_roles_are_not_cached_under_a_new_version():
+    with (
+        BenchmarkEnvironment(users=5, roles=10) as env,
+        patch.object(settings, "module_authorization_enabled", True),
+    ):
+        # El usuario 1 tiene los roles 2 y 3; solo el 2 otorga /users
+        with Session(env.engine) as session:
+            session.add(
+                DbModule(id=100, name="users", description="", path="/users", icon="")
+            )
+            session.add(DbModuleRole(role_id=2, module_id=100))
+            session.commit()
+
+        env.use_stale_replica()
+        with Session(env.engine) as session:
+            UserRoleRepositoryImpl(
+                session, permission_cache=permission_cache
+            ).sync_user_roles(1, [3])
+
+        token = create_access_token(
+            data={"sub": env.email_for(1), "roles": [2, 3], "pv": 0}
+        )
+        response = env.client.get(
+            "/api/iam/users", headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 403
+        assert asyncio.run(permission_cache.get_user_role_ids(1, 1)) == [3]
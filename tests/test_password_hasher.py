@@ -0,0 +1,133 @@
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.auth.services.auth_service import AuthService
+from app.core.database.repositories.user_repository_impl import UserRepositoryImpl
+from app.core.models.user import DbUser
+from app.core.security import encryption_service
+from app.core.security.encryption_service import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+)
+from app.core.settings import Settings
+
+
+def test_pool_hashes_and_verifies_in_worker_processes():
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=4)
+    try:
+        hashed = hasher.hash("secreto")
+
+        assert hashed.startswith("$2b$04$")
+        assert hasher.verify("secreto", hashed)
+        assert not hasher.verify("otro", hashed)
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_full_queue_rejects_immediately():
+    hasher = PasswordHasher(rounds=4, workers=0, max_pending=0)
+
+    with pytest.raises(PasswordHasherBusyError):
+        hasher.verify("secreto", "$2b$04$invalid")
+
+
+def test_login_rehashes_passwords_with_a_different_cost(monkeypatch):
+    monkeypatch.setattr(
+        encryption_service,
+        "password_hasher",
+        PasswordHasher(rounds=5, workers=0, max_pending=4),
+    )
+    # Las consultas corren en el threadpool: una sola conexión compartida
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(
+            DbUser(
+                id=1,
+                email="ana@example.com",
+                name="Ana",
+                identification="1",
+                password=bcrypt.hashpw(b"secreto", bcrypt.gensalt(4)).decode(),
+            )
+        )
+        session.commit()
+
+        service = AuthService(UserRepositoryImpl(session))
+        assert (
+            asyncio.run(service.authenticate_user("ana@example.com", "secreto"))
+            is not None
+        )
+
+        user = session.get(DbUser, 1)
+        assert user is not None
+        assert user.password.startswith("$2b$05$")
+        assert (
+            asyncio.run(service.authenticate_user("ana@example.com", "secreto"))
+            is not None
+        )
+
+
+def test_falls_back_to_thread_when_the_pool_cannot_start(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise OSError("sin /dev/shm")
+
+    monkeypatch.setattr(encryption_service, "ProcessPoolExecutor", unavailable)
+    hasher = PasswordHasher(rounds=4, workers=2, max_pending=4)
+
+    hashed = hasher.hash("secreto")
+
+    assert hasher.verify("secreto", hashed)
+    assert hasher.workers == 0
+
+
+def test_serverless_pool_mode_hashes_in_thread_by_default():
+    assert Settings(db_pool_mode="null").password_hash_workers == 0
+    assert Settings(db_pool_mode="queue").password_hash_workers == 2
+    assert (
+        Settings(db_pool_mode="null", password_hash_workers=3).password_hash_workers
+        == 3
+    )
+
+
+def test_async_pool_waits_without_a_threadpool_thread(monkeypatch):
+    async def no_threadpool(*args, **kwargs):
+        raise AssertionError("el pool de procesos no debe usar el threadpool")
+
+    monkeypatch.setattr(encryption_service, "run_in_threadpool", no_threadpool)
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=4)
+    try:
+        hashed = asyncio.run(hasher.hash_async("secreto"))
+
+        assert asyncio.run(hasher.verify_async("secreto", hashed))
+        assert not asyncio.run(hasher.verify_async("otro", hashed))
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_async_without_pool_hashes_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def tracked_checkpw(password: bytes, hashed: bytes) -> bool:
+        threads.append(threading.get_ident())
+        return bcrypt.checkpw(password, hashed)
+
+    monkeypatch.setattr(encryption_service, "_checkpw", tracked_checkpw)
+    hasher = PasswordHasher(rounds=4, workers=0, max_pending=4)
+    hashed = bcrypt.hashpw(b"secreto", bcrypt.gensalt(4)).decode()
+
+    async def verify() -> tuple[bool, int]:
+        return await hasher.verify_async("secreto", hashed), threading.get_ident()
+
+    verified, loop_thread = asyncio.run(verify())
+
+    assert verified
+    assert threads and threads[0] != loop_thread
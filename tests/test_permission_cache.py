@@ -0,0 +1,128 @@
+import asyncio
+
+import fakeredis
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache.permission_cache import PermissionCache
+from app.core.database.connection import get_async_db_url
+from app.core.database.instrumentation import instrument_engine, track_queries
+from app.core.database.repositories.module_repository_impl import (
+    AsyncModuleRepositoryImpl,
+)
+from app.core.database.repositories.module_role_repository_impl import (
+    AsyncModuleRoleRepositoryImpl,
+    ModuleRoleRepositoryImpl,
+)
+from app.core.database.repositories.role_repository_impl import AsyncRoleRepositoryImpl
+from app.core.database.repositories.user_repository_impl import AsyncUserRepositoryImpl
+from app.core.models.module import DbModule
+from app.core.models.module_role import DbModuleRole
+from app.core.models.role import DbRole
+from app.core.models.user import DbUser, UserBase
+from app.core.models.user_role import DbUserRole
+from app.iam.services.module_service import AsyncModuleService
+from app.iam.services.role_service import AsyncRoleService
+from app.iam.services.user_service import AsyncUserService
+from app.iam.usecases.get_user_with_modules import GetUserWithModulesUseCase
+
+
+def build_cache() -> PermissionCache:
+    server = fakeredis.FakeServer()
+    sync_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    async_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    return PermissionCache(
+        ttl=300,
+        max_entries=100,
+        redis_factory=lambda: sync_client,
+        async_redis_factory=lambda: async_client,
+    )
+
+
+def seed(engine) -> UserBase:
+    with Session(engine) as session:
+        user = DbUser(
+            id=1, email="ana@example.com", name="Ana", identification="1", password=""
+        )
+        session.add_all(
+            [
+                DbRole(id=1, name="admin", description="Administrador"),
+                DbModule(id=1, name="users", description="", path="/users", icon=""),
+                DbModule(id=2, name="roles", description="", path="/roles", icon=""),
+                user,
+                DbUserRole(user_id=1, role_id=1),
+                DbModuleRole(role_id=1, module_id=1),
+            ]
+        )
+        session.commit()
+        session.refresh(user)
+        return UserBase.map_from_db(user)
+
+
+def test_me_is_served_from_snapshot_until_permissions_change(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'app.db'}"
+    engine = create_engine(database_url)
+    SQLModel.metadata.create_all(engine)
+    user = seed(engine)
+    cache = build_cache()
+
+    async def invoke(claims=None):
+        async_engine = create_async_engine(get_async_db_url(database_url))
+        instrument_engine(async_engine.sync_engine)
+        try:
+            async with AsyncSession(async_engine) as session:
+                use_case = GetUserWithModulesUseCase(
+                    AsyncUserService(AsyncUserRepositoryImpl(session)),
+                    AsyncModuleService(
+                        AsyncModuleRepositoryImpl(session),
+                        AsyncModuleRoleRepositoryImpl(session),
+                    ),
+                    AsyncRoleService(AsyncRoleRepositoryImpl(session)),
+                    permission_cache=cache,
+                )
+                with track_queries() as stats:
+                    result = await use_case.invoke(user, claims)
+                return result, stats.count
+        finally:
+            await async_engine.dispose()
+
+    first, first_queries = asyncio.run(invoke())
+    assert [module.name for module in first.modules] == ["users"]
+    assert first_queries > 0
+
+    cached, cached_queries = asyncio.run(invoke({"roles": [1], "pv": 0}))
+    assert cached == first
+    assert cached_queries == 0
+
+    with Session(engine) as session:
+        repository = ModuleRoleRepositoryImpl(session, permission_cache=cache)
+        repository.sync_modules_for_role(1, [1])
+        assert cache.version() == 0
+
+        repository.sync_modules_for_role(1, [1, 2])
+        assert cache.version() == 1
+
+    # El token con la versión vieja ya no sirve para resolver los permisos
+    updated, _ = asyncio.run(invoke({"roles": [1], "pv": 0}))
+    assert {module.name for module in updated.modules} == {"users", "roles"}
+
+
+def test_me_builds_snapshots_from_the_primary():
+    from app.core.database.connection import get_async_session
+    from benchmarks.environment import BenchmarkEnvironment
+
+    with BenchmarkEnvironment(users=2, roles=3) as env:
+        session_override = env.app.dependency_overrides[get_async_session]
+        primary_sessions = []
+
+        async def tracked_primary_session():
+            async for session in session_override():
+                primary_sessions.append(session)
+                yield session
+
+        env.app.dependency_overrides[get_async_session] = tracked_primary_session
+        response = env.client.get("/api/auth/me", headers=env.auth_headers())
+
+        assert response.status_code == 200
+        assert len(primary_sessions) == 1
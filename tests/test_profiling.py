@@ -0,0 +1,101 @@
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.profiling.middleware import PROFILE_REPORT_HEADER, ProfilingMiddleware
+from app.core.profiling.sampler import RouteProfiles, SamplingProfiler
+from app.core.security.jwt_service import create_access_token
+
+
+def busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def build_app(tmp_path, **options) -> tuple[FastAPI, RouteProfiles]:
+    route_profiles = RouteProfiles()
+    app = FastAPI()
+    app.add_middleware(
+        ProfilingMiddleware,
+        profiler=SamplingProfiler(interval=0.001),
+        route_profiles=route_profiles,
+        output_dir=str(tmp_path),
+        allowed_users=["admin@example.com"],
+        **options,
+    )
+
+    @app.get("/slow")
+    def slow():
+        busy_wait(0.05)
+        return {"ok": True}
+
+    @app.get("/slow-async")
+    async def slow_async():
+        busy_wait(0.05)
+        return {"ok": True}
+
+    return app, route_profiles
+
+
+def test_on_demand_profile_is_saved_for_allowed_user(tmp_path):
+    app, _ = build_app(tmp_path, on_demand_enabled=True)
+    client = TestClient(app)
+    token = create_access_token(data={"sub": "admin@example.com"})
+
+    response = client.get(
+        "/slow", headers={"Authorization": f"Bearer {token}", "X-Profile": "1"}
+    )
+
+    report = tmp_path / response.headers[PROFILE_REPORT_HEADER]
+    assert "busy_wait" in report.read_text()
+
+
+def test_on_demand_profile_ignored_for_other_users(tmp_path):
+    app, _ = build_app(tmp_path, on_demand_enabled=True)
+    client = TestClient(app)
+    token = create_access_token(data={"sub": "someone@example.com"})
+
+    response = client.get(
+        "/slow?__profile=1", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert PROFILE_REPORT_HEADER not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_background_sampling_aggregates_by_route(tmp_path):
+    app, route_profiles = build_app(tmp_path, sample_rate=1.0)
+    client = TestClient(app)
+
+    client.get("/slow")
+    client.get("/slow")
+
+    assert route_profiles.summary()["GET /slow"] > 0
+    assert "busy_wait" in route_profiles.folded("GET /slow")
+
+
+def unrelated_work(stop: threading.Event) -> None:
+    while not stop.is_set():
+        pass
+
+
+def test_background_sampling_keeps_only_the_request_stacks(tmp_path):
+    app, route_profiles = build_app(tmp_path, sample_rate=1.0)
+    client = TestClient(app)
+    stop = threading.Event()
+    other = threading.Thread(target=unrelated_work, args=(stop,))
+    other.start()
+    try:
+        client.get("/slow")
+        client.get("/slow-async")
+    finally:
+        stop.set()
+        other.join()
+
+    for route in ("GET /slow", "GET /slow-async"):
+        folded = route_profiles.folded(route)
+        assert folded is not None and "busy_wait" in folded
+        assert "unrelated_work" not in folded
@@ -0,0 +1,31 @@
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database.replicas import ReplicaSet
+
+
+def sqlite_engine(url: str = "sqlite+aiosqlite://"):
+    return lambda: create_async_engine(url)
+
+
+def test_replicas_are_chosen_round_robin():
+    replicas = ReplicaSet([sqlite_engine(), sqlite_engine()])
+
+    targets = [replicas.choose()[0] for _ in range(4)]
+
+    assert targets == ["replica-0", "replica-1", "replica-0", "replica-1"]
+
+
+def test_no_replicas_falls_back_to_primary():
+    assert ReplicaSet([]).choose() is None
+
+
+def test_unhealthy_replica_leaves_rotation_until_cooldown(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("app.core.database.replicas.time.monotonic", lambda: now)
+    replicas = ReplicaSet([sqlite_engine(), sqlite_engine()], cooldown=30)
+
+    replicas.mark_unhealthy(0)
+    assert {replicas.choose()[0] for _ in range(3)} == {"replica-1"}
+
+    now += 31
+    assert {replicas.choose()[0] for _ in range(3)} == {"replica-0", "replica-1"}
@@ -0,0 +1,130 @@
+import fakeredis
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, SQLModel, create_engine, insert, select
+
+from app.core.cache.permission_cache import PermissionCache
+from app.core.database.repositories.module_role_repository_impl import (
+    ModuleRoleRepositoryImpl,
+)
+from app.core.database.repositories.user_role_repository_impl import (
+    UserRoleRepositoryImpl,
+)
+from app.core.models.module import DbModule
+from app.core.models.module_role import DbModuleRole
+from app.core.models.role import DbRole
+from app.core.models.user import DbUser
+from app.core.models.user_role import DbUserRole
+
+USERS = 1_200
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(
+            [DbRole(id=i, name=f"rol {i}", description="") for i in (1, 2, 3)]
+        )
+        session.add_all(
+            [
+                DbModule(id=i, name=f"m{i}", description="", path=f"/m{i}", icon="")
+                for i in (1, 2, 3)
+            ]
+        )
+        session.exec(
+            insert(DbUser).values(
+                [
+                    {
+                        "id": i,
+                        "email": f"u{i}@example.com",
+                        "name": f"U{i}",
+                        "identification": str(i),
+                        "password": "x",
+                    }
+                    for i in range(1, USERS + 1)
+                ]
+            )
+        )
+        session.exec(
+            insert(DbUserRole).values(
+                [
+                    {"user_id": i, "role_id": role_id, "active": role_id == 1}
+                    for i in range(1, USERS + 1)
+                    for role_id in (1, 2)
+                ]
+            )
+        )
+        session.commit()
+    return engine
+
+
+def build_cache() -> PermissionCache:
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    return PermissionCache(
+        ttl=300,
+        max_entries=100,
+        redis_factory=lambda: redis_client,
+        async_redis_factory=lambda: fakeredis.FakeAsyncRedis(),
+    )
+
+
+def count_statements(engine) -> list[str]:
+    statements: list[str] = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+def test_sync_many_users_uses_a_handful_of_statements(engine):
+    cache = build_cache()
+    statements = count_statements(engine)
+    target = {user_id: [2, 3] for user_id in range(1, USERS + 1)}
+
+    with Session(engine) as session:
+        UserRoleRepositoryImpl(session, cache).sync_users_roles(target)
+
+        # Por lotes de 500, no por fila: 3 lecturas (1.200 usuarios),
+        # 5 upserts (2.400 pares) y 3 desactivaciones
+        assert len(statements) == 11
+        assert cache.version() == 1
+
+        links = session.exec(select(DbUserRole)).all()
+        assert len(links) == USERS * 3
+        active = {(link.user_id, link.role_id) for link in links if link.active}
+        assert active == {(u, r) for u in target for r in (2, 3)}
+
+        # Repetir la misma sincronización no escribe ni invalida permisos
+        statements.clear()
+        UserRoleRepositoryImpl(session, cache).sync_user_roles(1, [3, 2])
+        assert len(statements) == 1
+        assert cache.version() == 1
+
+
+def test_sync_modules_for_roles(engine):
+    cache = build_cache()
+    with Session(engine) as session:
+        repository = ModuleRoleRepositoryImpl(session, cache)
+        repository.assign_modules_to_role(1, [1, 2])
+        repository.sync_roles_modules({1: [2, 3], 2: [1]})
+        repository.sync_modules_for_role(2, [])
+
+        active = {
+            (link.role_id, link.module_id)
+            for link in session.exec(select(DbModuleRole)).all()
+            if link.active
+        }
+        assert active == {(1, 2), (1, 3)}
+        assert len(session.exec(select(DbModuleRole)).all()) == 4
+
+
+def test_links_are_unique(engine):
+    with Session(engine) as session:
+        session.add(DbUserRole(user_id=1, role_id=1))
+        with pytest.raises(IntegrityError):
+            session.commit()
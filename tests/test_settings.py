@@ -0,0 +1,24 @@
+from app.core.settings import Settings
+
+
+def test_replica_urls_accept_comma_separated_values(monkeypatch):
+    monkeypatch.setenv(
+        "DB_REPLICA_URLS", "mysql+pymysql://u:p@h1/db, mysql+pymysql://u:p@h2/db"
+    )
+
+    assert Settings().db_replica_urls == [
+        "mysql+pymysql://u:p@h1/db",
+        "mysql+pymysql://u:p@h2/db",
+    ]
+
+
+def test_replica_urls_accept_a_json_list(monkeypatch):
+    monkeypatch.setenv("DB_REPLICA_URLS", '["mysql+pymysql://u:p@h1/db"]')
+
+    assert Settings().db_replica_urls == ["mysql+pymysql://u:p@h1/db"]
+
+
+def test_profiler_allowed_users_accept_comma_separated_values(monkeypatch):
+    monkeypatch.setenv("PROFILER_ALLOWED_USERS", "a@x.com,b@y.com")
+
+    assert Settings().profiler_allowed_users == ["a@x.com", "b@y.com"]
@@ -0,0 +1,40 @@
+import time
+from unittest.mock import patch
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from app.core.dependencies import decode_access_token
+from app.core.security.jwt_service import create_access_token
+from app.core.security.token_cache import TokenCache, token_cache, token_digest
+
+
+def test_repeated_token_skips_signature_verification():
+    token = create_access_token(data={"sub": "cache@example.com"})
+
+    with patch("app.core.dependencies.jwt.decode", wraps=jwt.decode) as decode:
+        first = decode_access_token(token)
+        second = decode_access_token(token)
+
+    assert first == second
+    assert decode.call_count == 1
+
+
+def test_revoked_token_is_rejected_before_the_cache():
+    token = create_access_token(data={"sub": "revoked@example.com"})
+    payload = decode_access_token(token)
+
+    token_cache.revoke(token_digest(token), payload)
+
+    with pytest.raises(HTTPException):
+        decode_access_token(token)
+
+
+def test_entries_expire_at_token_exp():
+    cache = TokenCache(max_entries=10)
+    cache.set("expired", {"sub": "a", "exp": time.time() - 1})
+    cache.set("valid", {"sub": "b", "exp": time.time() + 60})
+
+    assert cache.get("expired") is None
+    assert cache.get("valid")["sub"] == "b"
@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import fakeredis
+import pytest
+
+from app.core.cache.bloom import BloomFilter
+from app.core.security.refresh_tokens import RefreshTokenReuseError, RefreshTokenStore
+from app.core.security.revocation import RevocationStore
+
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+
+    assert all(bloom.might_contain(f"jti-{i}") for i in range(1000))
+    false_positives = sum(bloom.might_contain(f"other-{i}") for i in range(10000))
+    assert false_positives < 300
+
+
+def test_revoked_jti_is_seen_by_other_workers():
+    server = fakeredis.FakeServer()
+    worker_a = RevocationStore(
+        capacity=1000,
+        rebuild_interval=600,
+        redis_factory=lambda: fakeredis.FakeRedis(server=server, decode_responses=True),
+    )
+    worker_b = RevocationStore(
+        capacity=1000,
+        rebuild_interval=600,
+        redis_factory=lambda: fakeredis.FakeRedis(server=server, decode_responses=True),
+    )
+    worker_b.start_listener()
+    assert wait_until(lambda: worker_b._ready)
+
+    worker_a.revoke("abc", expires_at=time.time() + 60)
+
+    assert wait_until(lambda: worker_b._bloom.might_contain("abc"))
+    assert worker_b.is_revoked("abc")
+    assert not worker_b.is_revoked("xyz")
+
+
+def test_async_check_queries_redis_until_the_filter_is_ready():
+    server = fakeredis.FakeServer()
+    redis_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    async_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    store = RevocationStore(
+        capacity=1000,
+        rebuild_interval=600,
+        redis_factory=lambda: redis_client,
+        async_redis_factory=lambda: async_client,
+    )
+    store._listener = object()  # type: ignore  # sin canal: filtro no listo
+    redis_client.set("revoked-jti:abc", 1)
+
+    assert asyncio.run(store.is_revoked_async("abc"))
+    assert not asyncio.run(store.is_revoked_async("xyz"))
+
+
+def test_refresh_token_rotation_detects_reuse():
+    client = fakeredis.FakeRedis(decode_responses=True)
+    store = RefreshTokenStore(ttl_seconds=60, redis_factory=lambda: client)
+    first = store.issue("ana@example.com")
+
+    grant = store.consume(first)
+    second = store.issue(grant.subject, family=grant.family)
+
+    with pytest.raises(RefreshTokenReuseError):
+        store.consume(first)
+    # Reusing a rotated token revokes the whole family
+    assert store.consume(second) is None
+    assert store.consume("unknown") is None
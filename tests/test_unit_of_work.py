@@ -0,0 +1,80 @@
+import fakeredis
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core.cache.permission_cache import PermissionCache
+from app.core.container import AppContainer, RequestContainer
+from app.core.models.module import DbModule
+from app.core.models.role import DbRole, RoleUpdate
+from app.core.models.user import DbUser, UserCreate
+from app.core.models.user_role import DbUserRole
+from app.core.settings import email_settings, settings
+
+
+@pytest.fixture
+def container():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(
+            [
+                DbRole(id=1, name="admin", description="Administrador"),
+                DbRole(id=2, name="operador", description="Operador"),
+                DbModule(id=1, name="users", description="", path="/users", icon=""),
+            ]
+        )
+        session.commit()
+
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    permission_cache = PermissionCache(
+        ttl=300,
+        max_entries=100,
+        redis_factory=lambda: redis_client,
+        async_redis_factory=lambda: fakeredis.FakeAsyncRedis(),
+    )
+    app_container = AppContainer(
+        settings, email_settings, permission_cache=permission_cache
+    )
+    with Session(engine) as session:
+        commits = []
+        event.listen(session, "after_commit", lambda _: commits.append(1))
+        request_container = RequestContainer(session, app_container)
+        request_container.commits = commits
+        yield request_container
+
+
+def test_use_cases_commit_once_and_invalidate_once(container):
+    user = container.create_user_use_case.invoke(
+        UserCreate(
+            email="ana@example.com", name="Ana", identification="1", roles=[1, 2]
+        )
+    )
+    assert user.id is not None
+    assert len(container.commits) == 1
+    assert container.app_container.permission_cache.version() == 1
+
+    role = container.update_role_use_case.invoke(
+        1, RoleUpdate(name="administrador", modules=[1])
+    )
+    assert role.name == "administrador"
+    assert len(container.commits) == 2
+    # Dos escrituras que invalidan permisos, un solo incremento de versión
+    assert container.app_container.permission_cache.version() == 2
+
+
+def test_failed_use_case_rolls_back_everything(container):
+    with pytest.raises(RuntimeError):
+        with container.unit_of_work:
+            container.user_service.create_user(
+                UserCreate(
+                    email="ana@example.com", name="Ana", identification="1", roles=[]
+                )
+            )
+            container.user_role_service.assign_roles_to_user(1, [1])
+            raise RuntimeError("falla a mitad del caso de uso")
+
+    assert container.commits == []
+    assert container.app_container.permission_cache.version() == 0
+    assert container.session.exec(select(DbUser)).all() == []
+    assert container.session.exec(select(DbUserRole)).all() == []
@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+import fakeredis
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.cache.ttl_cache import TTLCache
+from app.core.cache.user_cache import USER_CACHE_CHANNEL, UserCache
+from app.core.database.repositories.user_repository_impl import UserRepositoryImpl
+from app.core.models.user import DbUser, UserUpdate
+
+
+def build_cache(server: fakeredis.FakeServer) -> UserCache:
+    sync_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    async_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    return UserCache(
+        local_ttl=30,
+        redis_ttl=300,
+        max_entries=100,
+        redis_factory=lambda: sync_client,
+        async_redis_factory=lambda: async_client,
+    )
+
+
+def build_user(**fields) -> DbUser:
+    return DbUser(
+        id=1,
+        email="ana@example.com",
+        name="Ana",
+        identification="1",
+        password="hash",
+        **fields,
+    )
+
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used():
+    cache = TTLCache[str, int](max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    cache.set("a", 4, ttl=0)
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.get("a") is None
+
+
+def test_user_is_shared_through_redis_without_password():
+    server = fakeredis.FakeServer()
+    worker_a, worker_b = build_cache(server), build_cache(server)
+
+    asyncio.run(worker_a.set(build_user()))
+    user = asyncio.run(worker_b.get("ana@example.com"))
+
+    assert user is not None and user.name == "Ana"
+    assert "password" not in user.model_dump()
+
+
+def test_invalidation_is_broadcast_to_other_workers():
+    server = fakeredis.FakeServer()
+    worker_a, worker_b = build_cache(server), build_cache(server)
+    asyncio.run(worker_b.set(build_user()))
+    worker_b.start_listener()
+    assert wait_until(
+        lambda: worker_a.redis_factory().pubsub_numsub(USER_CACHE_CHANNEL)[0][1] > 0
+    )
+
+    worker_a.invalidate("ana@example.com")
+
+    assert wait_until(lambda: worker_b.local.get("ana@example.com") is None)
+    assert asyncio.run(worker_b.get("ana@example.com")) is None
+
+
+def test_repository_update_invalidates_old_and_new_email():
+    server = fakeredis.FakeServer()
+    cache = build_cache(server)
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(build_user())
+        session.commit()
+        asyncio.run(cache.set(build_user()))
+
+        UserRepositoryImpl(session, user_cache=cache).update_user(
+            1, UserUpdate(email="ana.maria@example.com")
+        )
+
+    assert cache.local.get("ana@example.com") is None
+    assert asyncio.run(cache.get("ana@example.com")) is None
+
+
+def test_load_skips_caching_when_invalidated_during_the_read():
+    server = fakeredis.FakeServer()
+    cache = build_cache(server)
+
+    async def load_while_updated(email: str) -> DbUser:
+        # Otro proceso actualiza al usuario mientras se lee la versión vieja
+        cache.invalidate(email)
+        return build_user(active=True)
+
+    user = asyncio.run(cache.load("ana@example.com", load_while_updated))
+
+    assert user is not None and user.active
+    assert cache.local.get("ana@example.com") is None
+    assert asyncio.run(cache.get("ana@example.com")) is None
+
+
+def test_load_caches_when_nothing_changed():
+    server = fakeredis.FakeServer()
+    cache, other_worker = build_cache(server), build_cache(server)
+
+    async def load(email: str) -> DbUser:
+        return build_user()
+
+    asyncio.run(cache.load("ana@example.com", load))
+
+    cached = asyncio.run(other_worker.get("ana@example.com"))
+    assert cached is not None and cached.name == "Ana"
+
+
+def test_current_user_is_filled_from_the_primary():
+    from app.core.cache.user_cache import user_cache
+    from benchmarks.environment import BenchmarkEnvironment
+
+    with BenchmarkEnvironment(users=2, roles=3) as env:
+        env.use_stale_replica()
+        with Session(env.engine) as session:
+            UserRepositoryImpl(session, user_cache=user_cache).update_user(
+                1, UserUpdate(active=False)
+            )
+
+        response = env.client.get("/api/auth/me", headers=env.auth_headers())
+
+        assert response.status_code == 200
+        assert response.json()["active"] is False
+        cached = asyncio.run(user_cache.get(env.email_for(1)))
+        assert cached is not None and cached.active is False
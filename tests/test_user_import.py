@@ -0,0 +1,88 @@
+import re
+
+from sqlmodel import Session, select
+
+from app.core.email.outbox import OUTBOX_MESSAGES_KEY
+from app.core.models.user import DbUser
+from app.core.models.user_role import DbUserRole
+from benchmarks.environment import BenchmarkEnvironment
+
+
+def query_count(response) -> int:
+    match = re.search(r"(\d+) queries", response.headers["server-timing"])
+    assert match is not None
+    return int(match.group(1))
+
+
+def test_import_reports_row_errors_and_inserts_the_rest_in_batches():
+    with BenchmarkEnvironment(users=5, roles=3) as env:
+        users = [
+            {
+                "email": f"nuevo{i}@example.com",
+                "name": f"Nuevo {i}",
+                "identification": str(5_000 + i),
+                "roles": [1, 2],
+            }
+            for i in range(30)
+        ]
+        users += [
+            # Repetido en el archivo, ya registrado, rol inexistente, inválido
+            {**users[0], "identification": "9999"},
+            {**users[1], "email": env.email_for(1), "identification": "9998"},
+            {
+                **users[2],
+                "email": "otro@example.com",
+                "identification": "9997",
+                "roles": [99],
+            },
+            {"email": "sin-arroba", "name": "X", "identification": "1", "roles": []},
+            {"email": "x@example.com"},
+        ]
+
+        response = env.client.post(
+            "/api/iam/users/import", json=users, headers=env.auth_headers()
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["created"]) == 30
+        assert [error["row"] for error in body["errors"]] == [31, 32, 33, 34, 35]
+        # Validación e inserción no crecen con el número de filas
+        assert query_count(response) <= 8
+
+        with Session(env.engine) as session:
+            created = session.exec(
+                select(DbUser).where(DbUser.email.like("nuevo%"))  # type: ignore
+            ).all()
+            assert all(user.must_change_password for user in created)
+            user_roles = session.exec(
+                select(DbUserRole).where(
+                    DbUserRole.user_id.in_([user.id for user in created])  # type: ignore
+                )
+            ).all()
+            assert len(user_roles) == 60
+
+        assert env.redis.hlen(OUTBOX_MESSAGES_KEY) == 30
+
+
+def test_import_accepts_csv():
+    with BenchmarkEnvironment(users=1, roles=3) as env:
+        csv = (
+            "email,name,identification,roles,external_login\n"
+            "ana@example.com,Ana,100,1;3,false\n"
+            "luis@example.com,Luis,101,x,false\n"
+            "eva@example.com,Eva,102,,true\n"
+        )
+        response = env.client.post(
+            "/api/iam/users/import",
+            content=csv,
+            headers={**env.auth_headers(), "Content-Type": "text/csv"},
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert [user["email"] for user in body["created"]] == [
+            "ana@example.com",
+            "eva@example.com",
+        ]
+        assert body["errors"][0]["row"] == 3
+        # Solo los usuarios sin login externo reciben invitación
+        assert env.redis.hlen(OUTBOX_MESSAGES_KEY) == 1
@@ -0,0 +1,81 @@
+import re
+
+from sqlmodel import Session, select
+
+from app.core.models.user_role import DbUserRole
+from benchmarks.environment import BenchmarkEnvironment
+
+
+def query_count(response) -> int:
+    match = re.search(r"(\d+) queries", response.headers["server-timing"])
+    assert match is not None
+    return int(match.group(1))
+
+
+def test_users_with_roles_is_keyset_paginated():
+    with BenchmarkEnvironment(users=25, roles=3) as env:
+        with Session(env.engine) as session:
+            user_role = session.exec(
+                select(DbUserRole).where(
+                    DbUserRole.user_id == 1, DbUserRole.role_id == 2
+                )
+            ).one()
+            user_role.active = False
+            session.add(user_role)
+            session.commit()
+
+        users = []
+        after_id = None
+        while True:
+            params = {"limit": 10} | ({"after_id": after_id} if after_id else {})
+            response = env.client.get(
+                "/api/iam/users/with-roles", params=params, headers=env.auth_headers()
+            )
+            assert response.status_code == 200
+            users += response.json()
+            after_id = response.headers.get("x-next-cursor")
+            if after_id is None:
+                break
+
+        assert [user["id"] for user in users] == list(range(1, 26))
+        # El enlace inactivo no aparece; el rol llega completo
+        assert [role["name"] for role in users[0]["roles"]] == ["role-3"]
+        assert {role["id"] for role in users[1]["roles"]} == {1, 3}
+        assert "password" not in users[0]
+
+        response = env.client.get(
+            "/api/iam/users/with-roles", headers=env.auth_headers()
+        )
+        # Una consulta para la página, sin importar cuántos usuarios trae
+        # (las demás son de la autenticación)
+        assert len(response.json()) == 25
+        assert "x-next-cursor" not in response.headers
+        page_queries = query_count(response)
+        small = env.client.get(
+            "/api/iam/users/with-roles",
+            params={"limit": 2},
+            headers=env.auth_headers(),
+        )
+        assert query_count(small) == page_queries
+
+
+def test_users_with_roles_filters():
+    with BenchmarkEnvironment(users=25, roles=3) as env:
+        response = env.client.get(
+            "/api/iam/users/with-roles",
+            params={"role_id": 1, "search": "Usuario 1"},
+            headers=env.auth_headers(),
+        )
+        assert response.status_code == 200
+        users = response.json()
+        assert users
+        for user in users:
+            assert "Usuario 1" in user["name"]
+            assert 1 in {role["id"] for role in user["roles"]}
+
+        response = env.client.get(
+            "/api/iam/users/with-roles",
+            params={"search": "100_"},
+            headers=env.auth_headers(),
+        )
+        assert response.json() == []
@@ -0,0 +1,38 @@
+"""
+Stand-in local del geo-info service.
+
+Ejemplos:
+    python -m tools.geo_info_standin --intersections 10000 --traffic-lights 20000
+    python -m tools.geo_info_standin --latency-ms 40 --latency-jitter-ms 20 --error-rate 0.01
+    python -m tools.geo_info_standin --mode record --upstream-url https://geo.example.com
+    python -m tools.geo_info_standin --mode replay --cassette-path cassette.json
+"""
+
+import argparse
+
+import uvicorn
+
+from tools.geo_info_standin.app import StandinConfig, create_standin_app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    for name, field in StandinConfig.model_fields.items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            dest=name,
+            default=field.default,
+            type=type(field.default) if field.default is not None else str,
+        )
+    args = vars(parser.parse_args())
+    host, port = args.pop("host"), args.pop("port")
+
+    uvicorn.run(create_standin_app(StandinConfig(**args)), host=host, port=port)
+
+
+if __name__ == "__main__":
+    main()
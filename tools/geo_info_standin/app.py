@@ -0,0 +1,176 @@
+import asyncio
+import random
+from typing import Literal
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.geo.models.geo_info_service_models import (
+    CreateIntersectionDTO,
+    CreateTrafficLightDTO,
+    Intersection,
+    NeighborhoodInfo,
+    TrafficLight,
+)
+from tools.geo_info_standin.cassette import Cassette, RecordedResponse
+from tools.geo_info_standin.city import SyntheticCity
+
+
+class StandinConfig(BaseModel):
+    mode: Literal["synthetic", "record", "replay"] = "synthetic"
+    intersections: int = 100
+    traffic_lights: int = 200
+    seed: int = 0
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status_code: int = 503
+    api_key: str | None = None
+    upstream_url: str = ""
+    upstream_api_key: str = ""
+    cassette_path: str = "geo_info_cassette.json"
+
+
+def error_response(status_code: int, error: str, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"message": message, "error": error, "statusCode": status_code},
+    )
+
+
+def create_standin_app(config: StandinConfig | None = None) -> FastAPI:
+    """
+    Construye un stand-in local del geo-info service que implementa los
+    contratos de `/api/v1` consumidos por `GeoInfoService`.
+    """
+    config = config or StandinConfig()
+    city = SyntheticCity(config.intersections, config.traffic_lights, config.seed)
+    cassette = Cassette(config.cassette_path) if config.mode != "synthetic" else None
+    rng = random.Random(config.seed)
+
+    app = FastAPI(title="geo-info-service stand-in")
+    app.state.config = config
+    app.state.city = city
+    app.state.cassette = cassette
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next) -> Response:
+        if config.api_key is not None:
+            if request.headers.get("x-api-key") != config.api_key:
+                return error_response(403, "Forbidden", "API key inválida")
+
+        delay_ms = config.latency_ms
+        if config.latency_jitter_ms:
+            delay_ms += rng.uniform(0, config.latency_jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+        if config.error_rate and rng.random() < config.error_rate:
+            return error_response(
+                config.error_status_code, "InjectedError", "Error inyectado"
+            )
+
+        if cassette is None:
+            return await call_next(request)
+
+        key = Cassette.build_key(
+            request.method, request.url.path, list(request.query_params.multi_items())
+        )
+        if config.mode == "replay":
+            recorded = cassette.get(key)
+            if recorded is None:
+                return error_response(404, "NotRecorded", f"Sin grabación: {key}")
+            return Response(
+                content=recorded.body,
+                status_code=recorded.status_code,
+                media_type=recorded.content_type,
+            )
+
+        async with httpx.AsyncClient(base_url=config.upstream_url) as client:
+            upstream = await client.request(
+                request.method,
+                request.url.path,
+                params=list(request.query_params.multi_items()),
+                content=await request.body(),
+                headers={
+                    "x-api-key": config.upstream_api_key,
+                    "content-type": request.headers.get(
+                        "content-type", "application/json"
+                    ),
+                },
+            )
+
+        recorded = RecordedResponse(
+            status_code=upstream.status_code,
+            content_type=upstream.headers.get("content-type", "application/json"),
+            body=upstream.text,
+        )
+        cassette.put(key, recorded)
+        return Response(
+            content=recorded.body,
+            status_code=recorded.status_code,
+            media_type=recorded.content_type,
+        )
+
+    @app.get("/api/v1/intersections")
+    async def get_intersections() -> list[Intersection]:
+        return city.intersections
+
+    @app.post("/api/v1/intersections", status_code=201)
+    async def create_intersection(dto: CreateIntersectionDTO) -> Intersection:
+        return city.add_intersection(dto.street_a_id, dto.street_b_id)
+
+    @app.get("/api/v1/intersections/coordinates")
+    async def get_intersections_by_point(
+        latitude: float, longitude: float, radius: int, limit: int = 10
+    ) -> list[Intersection]:
+        return city.intersections_near(latitude, longitude, radius, limit)
+
+    @app.get("/api/v1/traffic-lights")
+    async def get_traffic_lights(
+        name: str | None = None,
+        intersection_id: int | None = None,
+        longitude: float | None = None,
+        latitude: float | None = None,
+    ) -> list[TrafficLight]:
+        traffic_lights = city.traffic_lights
+        if name is not None:
+            traffic_lights = [t for t in traffic_lights if t.name == name]
+        if intersection_id is not None:
+            traffic_lights = [
+                t for t in traffic_lights if t.intersection_id == intersection_id
+            ]
+        if latitude is not None and longitude is not None:
+            traffic_lights = [
+                t
+                for t in traffic_lights
+                if abs((t.latitude or 0) - latitude) < 1e-3
+                and abs((t.longitude or 0) - longitude) < 1e-3
+            ]
+        return traffic_lights
+
+    @app.get("/api/v1/traffic-lights/{traffic_light_id}", response_model=None)
+    async def get_traffic_light_by_id(
+        traffic_light_id: int,
+    ) -> TrafficLight | JSONResponse:
+        if not 0 < traffic_light_id <= len(city.traffic_lights):
+            return error_response(
+                404, "NotFound", f"Semáforo {traffic_light_id} no encontrado"
+            )
+        return city.traffic_lights[traffic_light_id - 1]
+
+    @app.post("/api/v1/traffic-lights", status_code=201)
+    async def create_traffic_light(dto: CreateTrafficLightDTO) -> TrafficLight:
+        return city.add_traffic_light(
+            dto.name, dto.intersection_id, dto.latitude, dto.longitude
+        )
+
+    @app.get("/api/v1/neighborhoods/point")
+    async def get_neighborhood_by_point(
+        latitude: float, longitude: float
+    ) -> NeighborhoodInfo:
+        return city.neighborhood_at(latitude, longitude)
+
+    return app
@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+from urllib.parse import urlencode
+
+from pydantic import BaseModel
+
+
+class RecordedResponse(BaseModel):
+    status_code: int
+    content_type: str
+    body: str
+
+
+class Cassette:
+    """
+    Respuestas grabadas del geo-info service real, indexadas por método, ruta
+    y query string normalizada, persistidas como un único archivo JSON.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.responses: dict[str, RecordedResponse] = {}
+        if self.path.exists():
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            self.responses = {
+                key: RecordedResponse(**value) for key, value in raw.items()
+            }
+
+    @staticmethod
+    def build_key(method: str, path: str, query: list[tuple[str, str]]) -> str:
+        query_string = urlencode(sorted(query))
+        return f"{method.upper()} {path}?{query_string}"
+
+    def get(self, key: str) -> RecordedResponse | None:
+        return self.responses.get(key)
+
+    def put(self, key: str, response: RecordedResponse) -> None:
+        self.responses[key] = response
+        self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(
+                {key: value.model_dump() for key, value in self.responses.items()},
+                indent=2,
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
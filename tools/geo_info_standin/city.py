@@ -0,0 +1,165 @@
+import math
+import random
+from datetime import datetime, timedelta
+
+from app.geo.models.geo_info_service_models import (
+    Intersection,
+    NeighborhoodInfo,
+    TrafficLight,
+)
+
+CENTER_LATITUDE = 10.9685
+CENTER_LONGITUDE = -74.7813
+BLOCK_DEGREES = 0.0009
+EARTH_RADIUS_METERS = 6_371_000
+
+NEIGHBORHOOD_NAMES = [
+    "El Prado",
+    "Boston",
+    "Alto Prado",
+    "Riomar",
+    "Villa Country",
+    "Barrio Abajo",
+    "Las Delicias",
+    "San Vicente",
+]
+
+
+def distance_meters(lat_a: float, lon_a: float, lat_b: float, lon_b: float) -> float:
+    phi_a, phi_b = math.radians(lat_a), math.radians(lat_b)
+    d_phi = phi_b - phi_a
+    d_lambda = math.radians(lon_b - lon_a)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi_a) * math.cos(phi_b) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(a))
+
+
+class SyntheticCity:
+    """
+    Ciudad sintética y determinista: una grilla de calles y carreras cuyas
+    intersecciones tienen semáforos repartidos de forma uniforme.
+    """
+
+    def __init__(self, intersections: int, traffic_lights: int, seed: int = 0):
+        self.random = random.Random(seed)
+        self.intersections: list[Intersection] = []
+        self.traffic_lights: list[TrafficLight] = []
+        self.neighborhoods: list[NeighborhoodInfo] = [
+            NeighborhoodInfo(
+                neighborhood_id=index + 1,
+                neighborhood_name=name,
+                city_id=1,
+                city_name="Barranquilla",
+                city_dane_code="08001",
+                department_id=8,
+                department_name="Atlántico",
+                department_dane_code="08",
+                country_id=1,
+                country_name="Colombia",
+                locality_name="Norte - Centro Histórico",
+                urban_area_name="Barranquilla",
+            )
+            for index, name in enumerate(NEIGHBORHOOD_NAMES)
+        ]
+        self._generate_intersections(intersections)
+        self._generate_traffic_lights(traffic_lights)
+
+    def _generate_intersections(self, count: int) -> None:
+        side = max(1, math.ceil(math.sqrt(count)))
+        for index in range(count):
+            row, column = divmod(index, side)
+            latitude = CENTER_LATITUDE + (row - side / 2) * BLOCK_DEGREES
+            longitude = CENTER_LONGITUDE + (column - side / 2) * BLOCK_DEGREES
+            self.intersections.append(
+                Intersection(
+                    id=index + 1,
+                    street_a_id=row + 1,
+                    street_a_name=f"Calle {row + 30}",
+                    street_b_id=side + column + 1,
+                    street_b_name=f"Carrera {column + 40}",
+                    geojson={"type": "Point", "coordinates": [longitude, latitude]},
+                )
+            )
+
+    def _generate_traffic_lights(self, count: int) -> None:
+        if not self.intersections:
+            return
+
+        created_at = datetime(2025, 1, 1)
+        for index in range(count):
+            intersection = self.intersections[index % len(self.intersections)]
+            longitude, latitude = self.coordinates_of(intersection)
+            self.traffic_lights.append(
+                TrafficLight(
+                    id=index + 1,
+                    name=f"semaforo-{index + 1}",
+                    intersection_id=intersection.id,
+                    latitude=latitude + self.random.uniform(-1e-5, 1e-5),
+                    longitude=longitude + self.random.uniform(-1e-5, 1e-5),
+                    key_hash=f"{self.random.getrandbits(256):064x}",
+                    active=True,
+                    created_at=created_at,
+                    updated_at=created_at + timedelta(days=index % 30),
+                )
+            )
+
+    @staticmethod
+    def coordinates_of(intersection: Intersection) -> tuple[float, float]:
+        assert intersection.geojson is not None
+        longitude, latitude = intersection.geojson["coordinates"]
+        return longitude, latitude
+
+    def intersections_near(
+        self, latitude: float, longitude: float, radius: int, limit: int
+    ) -> list[Intersection]:
+        nearby: list[Intersection] = []
+        for intersection in self.intersections:
+            lon, lat = self.coordinates_of(intersection)
+            distance = distance_meters(latitude, longitude, lat, lon)
+            if distance <= radius:
+                nearby.append(
+                    intersection.model_copy(update={"distance_meters": distance})
+                )
+
+        nearby.sort(key=lambda item: item.distance_meters or 0)
+        return nearby[:limit]
+
+    def neighborhood_at(self, latitude: float, longitude: float) -> NeighborhoodInfo:
+        cell = int(abs(latitude * 1000) + abs(longitude * 1000))
+        return self.neighborhoods[cell % len(self.neighborhoods)]
+
+    def add_intersection(self, street_a_id: int, street_b_id: int) -> Intersection:
+        intersection = Intersection(
+            id=len(self.intersections) + 1,
+            street_a_id=street_a_id,
+            street_a_name=f"Calle {street_a_id}",
+            street_b_id=street_b_id,
+            street_b_name=f"Carrera {street_b_id}",
+            geojson={
+                "type": "Point",
+                "coordinates": [CENTER_LONGITUDE, CENTER_LATITUDE],
+            },
+        )
+        self.intersections.append(intersection)
+        return intersection
+
+    def add_traffic_light(
+        self, name: str, intersection_id: int, latitude: float, longitude: float
+    ) -> TrafficLight:
+        now = datetime.now()
+        traffic_light = TrafficLight(
+            id=len(self.traffic_lights) + 1,
+            name=name,
+            intersection_id=intersection_id,
+            latitude=latitude,
+            longitude=longitude,
+            key_hash=f"{self.random.getrandbits(256):064x}",
+            active=True,
+            created_at=now,
+            updated_at=now,
+            key=f"{self.random.getrandbits(128):032x}",
+        )
+        self.traffic_lights.append(traffic_light)
+        return traffic_light
@@ -0,0 +1,34 @@
+"""
+Generador de carga de heartbeats: simula N controladores ESP32 enviando su
+estado a `POST /api/geo/intersections/{id}/heartbeat`.
+
+Ejemplos:
+    python -m tools.heartbeat_loadgen --controllers 2000 --duration-s 120
+    python -m tools.heartbeat_loadgen --controllers 5000 --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import asyncio
+
+from tools.heartbeat_loadgen.runner import HeartbeatLoadGenerator, LoadConfig
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    for name, field in LoadConfig.model_fields.items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            dest=name,
+            default=field.default,
+            type=type(field.default) if field.default is not None else str,
+        )
+    config = LoadConfig(**vars(parser.parse_args()))
+
+    report = asyncio.run(HeartbeatLoadGenerator(config).run())
+    print(report.render())
+
+
+if __name__ == "__main__":
+    main()
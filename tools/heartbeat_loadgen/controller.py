@@ -0,0 +1,106 @@
+import math
+import random
+
+from app.geo.models.geo_info_service_models import IntersectionHeartbeat
+
+AMBER_S = 3
+RED_AMBER_S = 1
+RED_CLEARANCE_S = 1
+MIN_GREEN_S = 10
+MAX_GREEN_S = 60
+
+
+class VirtualController:
+    """
+    Controlador ESP32 simulado. Recorre el mismo ciclo de estados que reporta
+    el firmware en `IntersectionHeartbeat.estado` y adopta el siguiente plan
+    de verdes al terminar cada ciclo.
+    """
+
+    def __init__(
+        self,
+        intersection_id: int,
+        rng: random.Random,
+        started_at: float,
+        semaforo1_verde: int = 20,
+        semaforo2_verde: int = 20,
+        all_red_time: int = 2,
+    ):
+        self.intersection_id = intersection_id
+        self.device_name = f"esp32-semaforo-{intersection_id}"
+        self.ip = f"10.{intersection_id // 65536 % 256}.{intersection_id // 256 % 256}.{intersection_id % 256}"
+        self.rng = rng
+        self.semaforo1_verde = semaforo1_verde
+        self.semaforo2_verde = semaforo2_verde
+        self.all_red_time = all_red_time
+        self.next_semaforo1 = semaforo1_verde
+        self.next_semaforo2 = semaforo2_verde
+        self.next_fetched = False
+        # Offset the cycle so that controllers are not all in phase.
+        self.cycle_started_at = started_at - rng.uniform(0, self.cycle_length)
+
+    @property
+    def phases(self) -> list[tuple[str, int]]:
+        return [
+            ("S1_VERDE", self.semaforo1_verde),
+            ("S1_AMARILLO", AMBER_S),
+            ("S1_ROJO", RED_CLEARANCE_S),
+            ("ALL_RED", self.all_red_time),
+            ("S2_ROJO_AMARILLO", RED_AMBER_S),
+            ("S2_VERDE", self.semaforo2_verde),
+            ("S2_AMARILLO", AMBER_S),
+            ("S2_ROJO", RED_CLEARANCE_S),
+            ("ALL_RED", self.all_red_time),
+            ("S1_ROJO_AMARILLO", RED_AMBER_S),
+        ]
+
+    @property
+    def cycle_length(self) -> int:
+        return sum(duration for _, duration in self.phases)
+
+    def _fetch_next_plan(self) -> None:
+        self.next_semaforo1 = self._jitter_green(self.semaforo1_verde)
+        self.next_semaforo2 = self._jitter_green(self.semaforo2_verde)
+        self.next_fetched = True
+
+    def _jitter_green(self, green: int) -> int:
+        return max(MIN_GREEN_S, min(MAX_GREEN_S, green + self.rng.randint(-5, 5)))
+
+    def _start_next_cycle(self) -> None:
+        self.cycle_started_at += self.cycle_length
+        self.semaforo1_verde = self.next_semaforo1
+        self.semaforo2_verde = self.next_semaforo2
+        self.next_fetched = False
+
+    def state_at(self, now: float) -> IntersectionHeartbeat:
+        while now - self.cycle_started_at >= self.cycle_length:
+            if not self.next_fetched:
+                self._fetch_next_plan()
+            self._start_next_cycle()
+
+        elapsed = now - self.cycle_started_at
+        # The next plan is fetched from the decision service mid-cycle.
+        if not self.next_fetched and elapsed >= self.cycle_length / 2:
+            self._fetch_next_plan()
+
+        phase_end = 0
+        estado, phase_remaining = self.phases[-1][0], 0.0
+        for name, duration in self.phases:
+            phase_end += duration
+            if elapsed < phase_end:
+                estado, phase_remaining = name, phase_end - elapsed
+                break
+
+        return IntersectionHeartbeat(
+            device_name=self.device_name,
+            ip=self.ip,
+            semaforo1_verde=self.semaforo1_verde,
+            semaforo2_verde=self.semaforo2_verde,
+            all_red_time=self.all_red_time,
+            estado_restante_s=math.ceil(phase_remaining),
+            ciclo_restante_s=math.ceil(self.cycle_length - elapsed),
+            next_semaforo1=self.next_semaforo1,
+            next_semaforo2=self.next_semaforo2,
+            next_fetched=self.next_fetched,
+            estado=estado,  # type: ignore[arg-type]
+        )
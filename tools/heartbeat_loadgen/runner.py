@@ -0,0 +1,160 @@
+import asyncio
+import random
+import time
+
+import httpx
+import redis.asyncio as redis
+from pydantic import BaseModel
+
+from tools.heartbeat_loadgen.controller import VirtualController
+
+
+class LoadConfig(BaseModel):
+    target_url: str = "http://localhost:8080"
+    controllers: int = 1000
+    duration_s: float = 60.0
+    interval_s: float = 1.0
+    jitter_s: float = 0.2
+    first_intersection_id: int = 1
+    max_connections: int = 200
+    timeout_s: float = 5.0
+    time_scale: float = 1.0
+    redis_url: str | None = None
+    seed: int = 0
+
+
+class LoadReport(BaseModel):
+    controllers: int
+    duration_s: float
+    requests: int
+    errors: int
+    requests_per_s: float
+    error_rate: float
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+    redis_ops_per_s: float | None = None
+
+    def render(self) -> str:
+        lines = [
+            f"controllers       {self.controllers}",
+            f"duration          {self.duration_s:.1f} s",
+            f"requests          {self.requests}",
+            f"requests/s        {self.requests_per_s:.1f}",
+            f"error rate        {self.error_rate:.2%} ({self.errors})",
+            f"latency p50       {self.p50_ms:.2f} ms",
+            f"latency p99       {self.p99_ms:.2f} ms",
+            f"latency max       {self.max_ms:.2f} ms",
+        ]
+        if self.redis_ops_per_s is not None:
+            lines.append(f"redis ops/s       {self.redis_ops_per_s:.1f}")
+        return "\n".join(lines)
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class HeartbeatLoadGenerator:
+    def __init__(
+        self, config: LoadConfig, transport: httpx.AsyncBaseTransport | None = None
+    ):
+        self.config = config
+        self.transport = transport
+        self.rng = random.Random(config.seed)
+        self.latencies_ms: list[float] = []
+        self.errors = 0
+
+    def _simulated_now(self, started_at: float) -> float:
+        return started_at + (time.monotonic() - started_at) * self.config.time_scale
+
+    async def _run_controller(
+        self,
+        client: httpx.AsyncClient,
+        controller: VirtualController,
+        started_at: float,
+        deadline: float,
+    ) -> None:
+        config = self.config
+        url = f"/api/geo/intersections/{controller.intersection_id}/heartbeat"
+        await asyncio.sleep(self.rng.uniform(0, config.interval_s))
+
+        while time.monotonic() < deadline:
+            payload = controller.state_at(self._simulated_now(started_at))
+            request_started = time.perf_counter()
+            try:
+                response = await client.post(url, json=payload.model_dump())
+                if response.status_code != 200:
+                    self.errors += 1
+            except httpx.HTTPError:
+                self.errors += 1
+            self.latencies_ms.append((time.perf_counter() - request_started) * 1000)
+
+            delay = config.interval_s + self.rng.uniform(
+                -config.jitter_s, config.jitter_s
+            )
+            await asyncio.sleep(max(0.0, delay))
+
+    async def _redis_commands_processed(self, client: redis.Redis | None) -> int | None:
+        if client is None:
+            return None
+        stats = await client.info("stats")
+        return int(stats["total_commands_processed"])
+
+    async def run(self) -> LoadReport:
+        config = self.config
+        redis_client = redis.from_url(config.redis_url) if config.redis_url else None
+        limits = httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_connections,
+        )
+
+        started_at = time.monotonic()
+        controllers = [
+            VirtualController(
+                config.first_intersection_id + index, self.rng, started_at
+            )
+            for index in range(config.controllers)
+        ]
+
+        redis_before = await self._redis_commands_processed(redis_client)
+        async with httpx.AsyncClient(
+            base_url=config.target_url,
+            limits=limits,
+            timeout=config.timeout_s,
+            transport=self.transport,
+        ) as client:
+            deadline = started_at + config.duration_s
+            await asyncio.gather(
+                *(
+                    self._run_controller(client, controller, started_at, deadline)
+                    for controller in controllers
+                )
+            )
+        elapsed = time.monotonic() - started_at
+        redis_after = await self._redis_commands_processed(redis_client)
+        if redis_client is not None:
+            await redis_client.aclose()
+
+        latencies = sorted(self.latencies_ms)
+        requests = len(latencies)
+        redis_ops_per_s = None
+        if redis_before is not None and redis_after is not None:
+            # Discount the INFO command issued for the measurement itself.
+            redis_ops_per_s = max(0, redis_after - redis_before - 1) / elapsed
+
+        return LoadReport(
+            controllers=config.controllers,
+            duration_s=elapsed,
+            requests=requests,
+            errors=self.errors,
+            requests_per_s=requests / elapsed if elapsed else 0.0,
+            error_rate=self.errors / requests if requests else 0.0,
+            p50_ms=percentile(latencies, 0.50),
+            p99_ms=percentile(latencies, 0.99),
+            max_ms=latencies[-1] if latencies else 0.0,
+            redis_ops_per_s=redis_ops_per_s,
+        )
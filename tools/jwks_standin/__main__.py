@@ -0,0 +1,45 @@
+"""
+Stand-in local del endpoint de llaves (JWKS) de Google o Microsoft.
+
+Sirve las llaves en /certs con `Cache-Control: max-age`, emite ID tokens en
+POST /tokens ({"email": ...}) y rota la llave de firma con POST /rotate.
+
+Ejemplos:
+    python -m tools.jwks_standin --audience $GOOGLE_CLIENT_ID
+    python -m tools.jwks_standin --issuer https://login.microsoftonline.com/<tenant>/v2.0 \\
+        --audience $MS_CLIENT_ID --port 8092
+
+Luego apunta la API al stand-in con GOOGLE_CERTS_URL=http://127.0.0.1:8091/certs.
+"""
+
+import argparse
+
+import uvicorn
+
+from tools.jwks_standin.app import create_standin_app
+from tools.jwks_standin.keys import SigningKeys
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--issuer", default="https://accounts.google.com")
+    parser.add_argument("--audience", required=True)
+    parser.add_argument("--max-age", type=int, default=3600)
+    parser.add_argument("--key-count", type=int, default=1)
+    args = parser.parse_args()
+
+    keys = SigningKeys(
+        issuer=args.issuer,
+        audience=args.audience,
+        max_age=args.max_age,
+        key_count=args.key_count,
+    )
+    uvicorn.run(create_standin_app(keys), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
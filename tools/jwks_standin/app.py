@@ -0,0 +1,39 @@
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from tools.jwks_standin.keys import SigningKeys
+
+
+class TokenRequest(BaseModel):
+    email: str
+    name: str = ""
+    lifetime: int = 3600
+
+
+def create_standin_app(keys: SigningKeys) -> FastAPI:
+    """
+    Construye un stand-in local del endpoint de llaves de Google/Microsoft que
+    además emite ID tokens firmados con esas llaves.
+    """
+    app = FastAPI(title="JWKS stand-in")
+    app.state.keys = keys
+
+    @app.get("/certs")
+    async def get_certs() -> JSONResponse:
+        keys.fetches += 1
+        return JSONResponse(
+            keys.jwks(),
+            headers={"Cache-Control": f"public, max-age={keys.max_age}"},
+        )
+
+    @app.post("/tokens")
+    async def create_token(request: TokenRequest) -> dict:
+        token = keys.mint(request.email, request.name, request.lifetime)
+        return {"token": token}
+
+    @app.post("/rotate")
+    async def rotate_keys() -> dict:
+        return {"kid": keys.rotate()}
+
+    return app
@@ -0,0 +1,73 @@
+import time
+import uuid
+
+import httpx
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+
+class SigningKeys:
+    """
+    Llaves RSA en memoria que firman ID tokens como lo haría el proveedor
+    (Google o Microsoft) y las publican como JWKS.
+    """
+
+    def __init__(
+        self,
+        issuer: str,
+        audience: str,
+        max_age: int = 3600,
+        key_count: int = 1,
+    ):
+        self.issuer = issuer
+        self.audience = audience
+        self.max_age = max_age
+        self.fetches = 0
+        self._keys: list[tuple[str, rsa.RSAPrivateKey]] = []
+        for _ in range(key_count):
+            self.rotate()
+
+    def rotate(self) -> str:
+        """
+        Agrega una llave nueva como la de firma actual y devuelve su `kid`.
+        """
+        kid = uuid.uuid4().hex
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._keys.insert(0, (kid, key))
+        return kid
+
+    def jwks(self) -> dict:
+        keys = []
+        for kid, key in self._keys:
+            jwk = RSAAlgorithm.to_jwk(key.public_key(), as_dict=True)
+            keys.append({**jwk, "kid": kid, "alg": "RS256", "use": "sig"})
+        return {"keys": keys}
+
+    def mint(self, email: str, name: str = "", lifetime: int = 3600, **claims) -> str:
+        kid, key = self._keys[0]
+        now = int(time.time())
+        payload = {
+            "iss": self.issuer,
+            "aud": self.audience,
+            "sub": uuid.uuid5(uuid.NAMESPACE_URL, email).hex,
+            "email": email,
+            "preferred_username": email,
+            "name": name,
+            "iat": now,
+            "exp": now + lifetime,
+            **claims,
+        }
+        return jwt.encode(payload, key, algorithm="RS256", headers={"kid": kid})
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        """
+        Handler para `httpx.MockTransport`: sirve el JWKS sin levantar un
+        servidor.
+        """
+        self.fetches += 1
+        return httpx.Response(
+            200,
+            json=self.jwks(),
+            headers={"Cache-Control": f"public, max-age={self.max_age}"},
+        )
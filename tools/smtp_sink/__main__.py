@@ -0,0 +1,40 @@
+"""
+Servidor SMTP local que acepta todos los correos y muestra un resumen de cada
+uno, para probar el outbox de correos sin un servidor real.
+
+Ejemplo:
+    python -m tools.smtp_sink --port 8025
+
+Luego apunta la API al sink con MAIL_SERVER=127.0.0.1 MAIL_PORT=8025
+MAIL_STARTTLS=false MAIL_USE_CREDENTIALS=false.
+"""
+
+import argparse
+import asyncio
+
+from tools.smtp_sink.server import ReceivedMessage, SmtpSink
+
+
+def print_message(message: ReceivedMessage) -> None:
+    parsed = message.parse()
+    print(f"{', '.join(message.recipients)}: {parsed['Subject']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args()
+
+    sink = SmtpSink(host=args.host, port=args.port, on_message=print_message)
+    print(f"SMTP sink escuchando en {args.host}:{args.port}")
+    try:
+        asyncio.run(sink.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
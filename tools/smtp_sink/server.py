@@ -0,0 +1,122 @@
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from email import message_from_bytes
+from email.message import Message
+
+
+@dataclass
+class ReceivedMessage:
+    sender: str
+    recipients: list[str]
+    data: bytes
+
+    def parse(self) -> Message:
+        return message_from_bytes(self.data)
+
+
+@dataclass
+class SmtpSink:
+    """
+    Servidor SMTP mínimo que guarda en memoria los correos recibidos, para
+    probar el envío sin un servidor real. Acepta cualquier credencial y no
+    soporta TLS.
+
+    `fail_next` hace que los siguientes DATA respondan 451 (error temporal),
+    para probar los reintentos.
+    """
+
+    host: str = "127.0.0.1"
+    port: int = 0
+    messages: list[ReceivedMessage] = field(default_factory=list)
+    connections: int = 0
+    fail_next: int = 0
+    on_message: Callable[[ReceivedMessage], None] | None = None
+    _server: asyncio.Server | None = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+
+        async def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        sender = ""
+        recipients: list[str] = []
+        await reply("220 smtp-sink listo")
+        try:
+            while line := await reader.readline():
+                command = line.decode(errors="replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+                if verb == "EHLO":
+                    await reply("250-smtp-sink")
+                    await reply("250-AUTH PLAIN LOGIN")
+                    await reply("250 8BITMIME")
+                elif verb == "HELO":
+                    await reply("250 smtp-sink")
+                elif verb == "AUTH":
+                    await reply("235 autenticado")
+                elif verb == "MAIL":
+                    sender = _address(command)
+                    recipients = []
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    recipients.append(_address(command))
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 fin con <CRLF>.<CRLF>")
+                    data = await _read_data(reader)
+                    if self.fail_next > 0:
+                        self.fail_next -= 1
+                        await reply("451 error temporal")
+                    else:
+                        message = ReceivedMessage(sender, recipients, data)
+                        self.messages.append(message)
+                        if self.on_message is not None:
+                            self.on_message(message)
+                        await reply("250 OK")
+                elif verb in ("RSET", "NOOP"):
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 adiós")
+                    break
+                else:
+                    await reply("502 comando no soportado")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def _address(command: str) -> str:
+    _, _, value = command.partition(":")
+    return value.strip().split(" ", 1)[0].strip("<>")
+
+
+async def _read_data(reader: asyncio.StreamReader) -> bytes:
+    lines: list[bytes] = []
+    while line := await reader.readline():
+        if line in (b".\r\n", b".\n"):
+            break
+        # Dot-stuffing (RFC 5321 §4.5.2)
+        lines.append(line[1:] if line.startswith(b"..") else line)
+    return b"".join(lines)